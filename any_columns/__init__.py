@@ -1,6 +1,8 @@
 from .column import AmbigiousColumn, ColumnDefinition
 from .regex_column import RegexColumn
 from .string_column import StringColumn
+from .normalized_column import Normalization, NormalizedColumn
+from .fuzzy_column import FuzzyColumn
 from .schema import AmbigiousColumns, Schema
 from .matching import (
     AmbigiousMatch,
@@ -8,4 +10,37 @@ from .matching import (
     find_best_matching_schema,
     find_best_matching_schemas,
     find_matching_schemas,
+    find_top_k_matching_schemas,
+)
+from .schema_set import SchemaSet
+from .registry import SchemaRegistry
+from .bitmask import BitmaskSchemaSet
+from .cache import CacheInfo, MatchCache
+from .profiling import ColumnStats, MatchProfile, SchemaStats, profile_matching
+from .batch import BatchResult, match_headers_batch
+from .projection import MatchedRows, RowProjector, read_rows
+from .xlsx import read_xlsx_header
+from .scanning import FileReport, read_header, scan_files
+from .dataframes import read_arrow_table, read_dataframe
+from .content import (
+    Detector,
+    looks_like_date,
+    looks_like_email,
+    looks_like_number,
+    match_content,
+)
+from .aio import AsyncMatcher, read_header_async
+from .analysis import (
+    CatalogAnalysis,
+    ColumnCollision,
+    PrunedSchemaSet,
+    analyze_schemas,
+)
+from .sharding import ShardedMatcher
+from .catalog import (
+    CatalogSchemaSet,
+    dumps_catalog,
+    load_catalog,
+    loads_catalog,
+    save_catalog,
 )
@@ -0,0 +1,329 @@
+"""
+Find the best matching schema for every CSV file and .xlsx workbook in some directories, and write a JSON report
+
+The catalog is a file saved with `save_catalog`, a Python file, or an importable module. The schemas are taken from the
+`schemas` attribute of a Python file or module, or the attribute named after a ":" (like `myapp.catalogs:HR_SCHEMAS`),
+which can be a set of schemas, a SchemaSet, or a function returning one.
+
+```
+python -m any_columns myapp/catalog.py ./uploads --recursive --output report.json --stats
+```
+"""
+
+from argparse import ArgumentParser, RawDescriptionHelpFormatter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+import csv
+import importlib
+import importlib.util
+import json
+import os
+import sys
+
+from .batch import BatchResult, match_headers_batch
+from .catalog import load_catalog
+from .column import AmbigiousColumn
+from .matching import AmbigiousMatch
+from .profiling import MatchProfile, profile_matching
+from .scanning import (
+    XLSX_SUFFIXES,
+    FileReport,
+    _header_from_start,
+    _read_start,
+)
+from .schema import AmbigiousColumns
+from .schema_set import SchemaSet
+from .xlsx import read_xlsx_header
+
+# Suffixes of the files scanned in directories. Files named on the command line are scanned whatever their suffix.
+_SCANNED_SUFFIXES = (".csv",) + XLSX_SUFFIXES
+
+
+def _load_schemas(spec: str) -> SchemaSet:
+    """
+    Load schemas from a catalog file, a Python file or a module, as described in the module docstring
+
+    Raises ValueError if the schemas can't be found.
+    """
+    attribute = "schemas"
+    location = spec
+    if ":" in spec:
+        before, after = spec.rsplit(":", 1)
+        # Don't mistake Windows drive letters for attribute names
+        if after.isidentifier():
+            location, attribute = before, after
+
+    if location.endswith(".py"):
+        module_spec = importlib.util.spec_from_file_location(
+            "_any_columns_catalog", location
+        )
+        if module_spec is None or module_spec.loader is None:
+            raise ValueError(f"Can't load {location}")
+        module = importlib.util.module_from_spec(module_spec)
+        module_spec.loader.exec_module(module)
+    elif os.path.isfile(location):
+        return load_catalog(location)
+    else:
+        module = importlib.import_module(location)
+
+    try:
+        schemas = getattr(module, attribute)
+    except AttributeError:
+        raise ValueError(f"{location} doesn't have {attribute!r}") from None
+    if callable(schemas):
+        schemas = schemas()
+    return schemas if isinstance(schemas, SchemaSet) else SchemaSet(schemas)
+
+
+def _find_files(paths: Sequence[str], recursive: bool) -> List[str]:
+    """Find the files to scan: files named directly, and files with a scanned suffix in directories"""
+    files = []
+    for path in paths:
+        if not os.path.isdir(path):
+            files.append(path)
+            continue
+        found: List[str] = []
+        if recursive:
+            for directory, _, names in os.walk(path):
+                found.extend(os.path.join(directory, name) for name in names)
+        else:
+            found.extend(entry.path for entry in os.scandir(path) if entry.is_file())
+        files.extend(
+            sorted(file for file in found if file.lower().endswith(_SCANNED_SUFFIXES))
+        )
+    return files
+
+
+@dataclass(frozen=True)
+class _Header:
+    """The header read from a file, or the error reading it, and how long reading and parsing it took"""
+
+    path: str
+    header: Optional[Tuple[str, ...]]
+    error: Optional[Exception]
+    read_seconds: float
+    parse_seconds: float
+
+
+def _read_header(
+    path: str, max_bytes: int, encoding: Optional[str], delimiter: Optional[str]
+) -> _Header:
+    start = perf_counter()
+    read_seconds = 0.0
+    try:
+        if path.lower().endswith(XLSX_SUFFIXES):
+            # Workbooks are read and parsed in one go, so it all counts as parsing
+            header = read_xlsx_header(path)
+        else:
+            data, complete = _read_start(path, max_bytes)
+            read_seconds = perf_counter() - start
+            header = _header_from_start(data, complete, encoding, delimiter)
+    except (OSError, ValueError, csv.Error) as e:
+        return _Header(
+            path, None, e, read_seconds, perf_counter() - start - read_seconds
+        )
+    return _Header(
+        path, tuple(header), None, read_seconds, perf_counter() - start - read_seconds
+    )
+
+
+def _describe_error(error: Exception) -> str:
+    """Describe an error by the names of the schemas and columns involved, since their reprs aren't readable"""
+    if isinstance(error, AmbigiousMatch):
+        names = sorted(match.schema.name for match in error.matches)
+        detail = f"schemas {', '.join(names)} match equally well"
+    elif isinstance(error, AmbigiousColumn):
+        detail = (
+            f"column {error.column.name!r} matches {sorted(error.matching_columns)}"
+        )
+    elif isinstance(error, AmbigiousColumns):
+        names = sorted(column.name for column in error.column_matches)
+        detail = f"{error.column_name!r} matches columns {names} of schema {error.schema.name!r}"
+    else:
+        detail = str(error)
+    return f"{type(error).__name__}: {detail}"
+
+
+def _file_dict(report: FileReport) -> Dict[str, Any]:
+    file: Dict[str, Any] = {
+        "path": os.fspath(report.path),
+        "status": report.status,
+        "header": list(report.header) if report.header is not None else None,
+    }
+    if report.match is not None:
+        file["schema"] = report.match.schema.name
+        # Map each column name to the name of the column definition it matched
+        file["columns"] = {
+            column_name: column.name
+            for column_name, column in report.match.matching_columns.items()
+        }
+    if isinstance(report.error, AmbigiousMatch):
+        file["schemas"] = sorted(match.schema.name for match in report.error.matches)
+    if report.error is not None:
+        file["error"] = _describe_error(report.error)
+    return file
+
+
+def _print_profile(profile: Dict[str, Any]) -> None:
+    print("Slowest schemas:", file=sys.stderr)
+    for stats in profile["schemas"]:
+        print(
+            f"  {stats['seconds'] * 1e3:10.3f} ms {stats['evaluations']:8} evaluations  {stats['name']}",
+            file=sys.stderr,
+        )
+    print("Slowest column definitions:", file=sys.stderr)
+    for stats in profile["columns"]:
+        print(
+            f"  {stats['seconds'] * 1e3:10.3f} ms {stats['evaluations']:8} evaluations  "
+            f"{stats['type']} {stats['name']!r} {stats['pattern']!r}",
+            file=sys.stderr,
+        )
+    print(
+        f"Scanned {profile['regex_scans']} column names for every regex at once in "
+        f"{profile['regex_scan_seconds'] * 1e3:.3f} ms, and searched {profile['regex_searches']} column names "
+        "one regex at a time",
+        file=sys.stderr,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = ArgumentParser(
+        prog="python -m any_columns",
+        description=__doc__,
+        formatter_class=RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "catalog",
+        help="A catalog file, Python file or module, optionally followed by :attribute",
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="Files, and directories of files to scan"
+    )
+    parser.add_argument(
+        "--recursive", action="store_true", help="Scan directories recursively"
+    )
+    parser.add_argument("--output", help="Write the report here instead of stdout")
+    parser.add_argument("--workers", type=int, help="Number of threads reading headers")
+    parser.add_argument(
+        "--match-processes",
+        type=int,
+        default=0,
+        help="Match headers in this many processes instead of in this process",
+    )
+    parser.add_argument("--max-bytes", type=int, default=64 * 1024)
+    parser.add_argument("--encoding", help="Don't detect the encoding of CSV files")
+    parser.add_argument("--delimiter", help="Don't detect the delimiter of CSV files")
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Report time spent reading files, parsing headers and matching",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile matching and report the slowest schemas and column definitions",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Number of schemas and column definitions to report with --profile",
+    )
+
+    args = parser.parse_args(argv)
+    if args.profile and args.match_processes:
+        parser.error("--profile can only profile matching in this process")
+    if args.match_processes < 0:
+        parser.error("--match-processes must not be negative")
+    start = perf_counter()
+    try:
+        schema_set = _load_schemas(args.catalog)
+    except (ImportError, OSError, ValueError) as e:
+        parser.error(f"Can't load schemas from {args.catalog}: {e}")
+
+    files = _find_files(args.paths, args.recursive)
+    with ThreadPoolExecutor(args.workers) as executor:
+        headers = list(
+            executor.map(
+                lambda path: _read_header(
+                    path, args.max_bytes, args.encoding, args.delimiter
+                ),
+                files,
+            )
+        )
+
+    match_start = perf_counter()
+    to_match = [set(header.header) for header in headers if header.header is not None]
+    profile: Optional[MatchProfile] = None
+    if args.profile:
+        with profile_matching() as profile:
+            results = match_headers_batch(schema_set, to_match)
+    else:
+        results = match_headers_batch(
+            schema_set,
+            to_match,
+            pool="process" if args.match_processes else None,
+            max_workers=args.match_processes or None,
+        )
+    match_seconds = perf_counter() - match_start
+    by_columns: Dict[FrozenSet[str], BatchResult] = {
+        result.columns: result for result in results
+    }
+
+    reports = []
+    for header in headers:
+        if header.header is None:
+            reports.append(FileReport(header.path, error=header.error))
+            continue
+        result = by_columns[frozenset(header.header)]
+        reports.append(
+            FileReport(header.path, header.header, result.match, result.error)
+        )
+
+    summary: Dict[str, int] = {"matched": 0, "no match": 0, "ambiguous": 0, "error": 0}
+    for report in reports:
+        summary[report.status] += 1
+    output: Dict[str, Any] = {
+        "catalog": args.catalog,
+        "summary": summary,
+        "files": [_file_dict(report) for report in reports],
+    }
+    print(
+        f"Scanned {len(reports)} files: "
+        + ", ".join(f"{count} {status}" for status, count in summary.items()),
+        file=sys.stderr,
+    )
+    if args.stats:
+        # Reading and parsing are added up over every file, so with more than one worker they can add up to more than
+        # the total time
+        output["stats"] = {
+            "files": len(files),
+            "distinct_headers": len(by_columns),
+            "read_seconds": sum(header.read_seconds for header in headers),
+            "parse_seconds": sum(header.parse_seconds for header in headers),
+            "match_seconds": match_seconds,
+            "total_seconds": perf_counter() - start,
+        }
+        for stage, seconds in output["stats"].items():
+            if stage.endswith("_seconds"):
+                print(f"{stage:<16} {seconds * 1e3:12.3f} ms", file=sys.stderr)
+    if profile is not None:
+        profile_dict = profile.as_dict()
+        profile_dict["schemas"] = profile_dict["schemas"][: args.top]
+        profile_dict["columns"] = profile_dict["columns"][: args.top]
+        output["profile"] = profile_dict
+        _print_profile(profile_dict)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=2)
+    else:
+        json.dump(output, sys.stdout, indent=2)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class AhoCorasick:
+    """
+    An Aho-Corasick automaton for finding which of a set of keywords appear in a string
+
+    Finding every keyword takes a single pass over the string no matter how many keywords there are.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = frozenset(keywords)
+
+        # State 0 is the root, and each state is the prefix of one or more keywords
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[str, ...]] = [()]
+
+        for keyword in self.keywords:
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                state = next_state
+            self._output[state] += (keyword,)
+
+        # Breadth first search so the failure state for a state is always computed before the states under it. The
+        # failure state is the state for the longest proper suffix of this state's prefix which is also a prefix of
+        # some keyword.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fail
+                # Keywords ending at the failure state also end here
+                self._output[next_state] += self._output[fail]
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def search(self, text: str) -> Set[str]:
+        """Find every keyword which appears anywhere in the given text"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        found: Set[str] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
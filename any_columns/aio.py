@@ -0,0 +1,262 @@
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    FrozenSet,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Protocol,
+    Set,
+    TypeVar,
+    Union,
+)
+import asyncio
+
+from . import batch
+from .batch import BatchResult, _init_worker
+from .matching import SchemaMatch
+from .scanning import _parse_header
+from .schema import Schema
+from .schema_set import SchemaSet
+
+T = TypeVar("T")
+
+
+class AsyncReadable(Protocol):
+    """A stream with an async `read`, like `asyncio.StreamReader` or a file opened with aiofiles"""
+
+    def read(self, n: int = -1) -> Awaitable[bytes]: ...
+
+
+async def read_header_async(
+    stream: AsyncReadable,
+    max_bytes: int = 64 * 1024,
+    encoding: Optional[str] = None,
+    delimiter: Optional[str] = None,
+    chunk_size: int = 4096,
+) -> List[str]:
+    """
+    Read the column names from the first row of a CSV stream, without reading the rest of the stream
+
+    This is the same as `read_header` for CSV files, except it reads from an async stream in chunks of `chunk_size`
+    bytes and stops as soon as it has the whole first row. Whatever comes after the first row in the last chunk is
+    consumed too. Raises ValueError if the first row is longer than `max_bytes`.
+    """
+    if max_bytes < 1:
+        raise ValueError(f"max_bytes must be at least 1, got {max_bytes}")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    data = b""
+    while len(data) < max_bytes:
+        chunk = await stream.read(min(chunk_size, max_bytes - len(data)))
+        if not chunk:
+            header = _parse_header(data, True, encoding, delimiter)
+            assert header is not None
+            return header
+        data += chunk
+        header = _parse_header(data, False, encoding, delimiter)
+        if header is not None:
+            return header
+    # We've read max_bytes without finding the end of the first row, but it might be exactly max_bytes long
+    if not await stream.read(1):
+        header = _parse_header(data, True, encoding, delimiter)
+        assert header is not None
+        return header
+    raise ValueError("The header is longer than the number of bytes read")
+
+
+def _find_best_matching_schema_in_worker(
+    columns: FrozenSet[str],
+) -> Optional[SchemaMatch]:
+    assert batch._worker_schema_set is not None
+    return batch._worker_schema_set.find_best_matching_schema(set(columns))
+
+
+def _find_best_matching_schemas_in_worker(columns: FrozenSet[str]) -> List[SchemaMatch]:
+    assert batch._worker_schema_set is not None
+    return batch._worker_schema_set.find_best_matching_schemas(set(columns))
+
+
+class AsyncMatcher:
+    """
+    Matches column names against a SchemaSet in a pool of worker threads or processes, without blocking the event loop
+
+    The schemas are compiled into a SchemaSet once (unless they already are one) and shared by every worker. With
+    `pool="process"` each worker process gets its own copy of the SchemaSet when it starts, which is what you want if
+    matching is slow enough to matter, since threads hold the GIL while matching. The matches then contain copies of
+    the schemas which compare equal to the originals.
+
+    At most `max_pending` headers are waiting for or being matched at once. Once that many are in flight, callers wait
+    for a slot before their header is handed to the pool, so a burst of uploads queues up in the event loop (where it
+    can be cancelled) instead of in the executor's unbounded work queue, and `match_headers` stops pulling headers from
+    its source until results are consumed. Use each AsyncMatcher from a single event loop.
+
+    ```python
+    async with AsyncMatcher(schemas, max_workers=4, pool="process") as matcher:
+        match = await matcher.find_best_matching_schema({"name", "start date"})
+    ```
+    """
+
+    def __init__(
+        self,
+        schemas: Union[Set[Schema], SchemaSet],
+        max_workers: Optional[int] = None,
+        pool: Literal["thread", "process"] = "thread",
+        max_pending: int = 64,
+    ):
+        if max_pending < 1:
+            raise ValueError(f"max_pending must be at least 1, got {max_pending}")
+        self.schema_set = (
+            schemas if isinstance(schemas, SchemaSet) else SchemaSet(schemas)
+        )
+        self.max_pending = max_pending
+        self._executor: Executor
+        if pool == "thread":
+            self._executor = ThreadPoolExecutor(max_workers)
+        elif pool == "process":
+            self._executor = ProcessPoolExecutor(
+                max_workers, initializer=_init_worker, initargs=(self.schema_set,)
+            )
+        else:
+            raise ValueError(f'pool must be "thread" or "process", got {pool!r}')
+        self._pool = pool
+        self._slots = asyncio.Semaphore(max_pending)
+
+    async def _run(
+        self, function: Callable[[FrozenSet[str]], T], columns: FrozenSet[str]
+    ) -> T:
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, function, columns
+            )
+
+    async def find_best_matching_schema(
+        self, columns: Set[str]
+    ) -> Optional[SchemaMatch]:
+        """See `SchemaSet.find_best_matching_schema`"""
+        if self._pool == "process":
+            return await self._run(
+                _find_best_matching_schema_in_worker, frozenset(columns)
+            )
+        return await self._run(
+            lambda columns: self.schema_set.find_best_matching_schema(set(columns)),
+            frozenset(columns),
+        )
+
+    async def find_best_matching_schemas(self, columns: Set[str]) -> List[SchemaMatch]:
+        """See `SchemaSet.find_best_matching_schemas`"""
+        if self._pool == "process":
+            return await self._run(
+                _find_best_matching_schemas_in_worker, frozenset(columns)
+            )
+        return await self._run(
+            lambda columns: self.schema_set.find_best_matching_schemas(set(columns)),
+            frozenset(columns),
+        )
+
+    async def _match_one(self, columns: FrozenSet[str]) -> BatchResult:
+        try:
+            match = await self.find_best_matching_schema(set(columns))
+        except Exception as e:
+            return BatchResult(columns, error=e)
+        return BatchResult(columns, match)
+
+    async def match_headers(
+        self, headers: Union[AsyncIterable[Set[str]], Iterable[Set[str]]]
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Find the best matching schema for each set of column names from a (sync or async) iterable, in order
+
+        Up to `max_pending` headers are matched concurrently. The next header is only taken from `headers` once there's
+        room, so a fast source is slowed down to the pace results are consumed at. Each result is yielded as soon as it
+        and the results before it are ready, without waiting for the next header, so a slow source doesn't hold back
+        results. Like `match_headers_batch`, exceptions from matching are captured in `BatchResult.error` instead of
+        stopping the stream, but exceptions from `headers` itself are raised.
+
+        ```python
+        async for result in matcher.match_headers(upload_headers()):
+            print(result.match or result.error)
+        ```
+        """
+        pending: Deque["asyncio.Task[BatchResult]"] = deque()
+        source = _aiter(headers)
+        # The task getting the next header from the source, if we're waiting for one
+        next_header: "Optional[asyncio.Task[Set[str]]]" = None
+        exhausted = False
+        try:
+            while True:
+                if (
+                    not exhausted
+                    and next_header is None
+                    and len(pending) < self.max_pending
+                ):
+                    next_header = asyncio.ensure_future(source.__anext__())
+                if pending and pending[0].done():
+                    yield pending.popleft().result()
+                    continue
+                waiting: List["asyncio.Future[Any]"] = [pending[0]] if pending else []
+                if next_header is not None:
+                    waiting.append(next_header)
+                if not waiting:
+                    return
+                # Wait for whichever comes first, so a result is yielded as soon as it's ready even if the source is
+                # slow, and the next header is handed to the pool as soon as it arrives even if matching is slow
+                await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                if next_header is not None and next_header.done():
+                    try:
+                        columns = next_header.result()
+                    except StopAsyncIteration:
+                        exhausted = True
+                    else:
+                        pending.append(
+                            asyncio.ensure_future(self._match_one(frozenset(columns)))
+                        )
+                    next_header = None
+        finally:
+            # If the caller stops early, don't leave work in the pool for results nobody will read
+            for task in pending:
+                task.cancel()
+            if next_header is not None:
+                next_header.cancel()
+
+    async def match_stream(
+        self,
+        stream: AsyncReadable,
+        max_bytes: int = 64 * 1024,
+        encoding: Optional[str] = None,
+        delimiter: Optional[str] = None,
+    ) -> Optional[SchemaMatch]:
+        """
+        Read the header of a CSV stream with `read_header_async` and find the best matching schema for it
+
+        Errors reading the header or matching it are raised. Use `read_header_async` yourself if you need the header's
+        column order, for example to build a RowProjector.
+        """
+        header = await read_header_async(stream, max_bytes, encoding, delimiter)
+        return await self.find_best_matching_schema(set(header))
+
+    async def aclose(self) -> None:
+        """Shut down the worker pool, waiting for work in progress without blocking the event loop"""
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+
+    async def __aenter__(self) -> "AsyncMatcher":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+
+async def _aiter(items: Union[AsyncIterable[T], Iterable[T]]) -> AsyncIterator[T]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
@@ -0,0 +1,336 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from frozendict import frozendict  # type: ignore[attr-defined]
+
+from .column import ColumnDefinition
+from .fuzzy_column import FuzzyColumn
+from .matching import SchemaMatch, _best_match, _branch_and_bound
+from .normalized_column import NormalizedColumn
+from .regex_column import RegexColumn
+from .schema import Schema
+from .schema_set import SchemaSet, _by_upper_bound
+from .string_column import StringColumn
+
+
+def _match_key(column: ColumnDefinition) -> Hashable:
+    """
+    Get a key which is the same for column definitions which match the same column names
+
+    Definitions are compared by what they match and not by name or whether they're required, so for example a required
+    and an optional StringColumn with the same pattern have the same key. Different kinds of definitions which happen
+    to match the same names (like a StringColumn and an equivalent RegexColumn) have different keys.
+    """
+    if isinstance(column, StringColumn):
+        return ("string", column.pattern)
+    if isinstance(column, RegexColumn):
+        return ("regex", column._source, column._flags)
+    if isinstance(column, NormalizedColumn):
+        return ("normalized", column.normalization, column.normalized_pattern)
+    if isinstance(column, FuzzyColumn):
+        return (
+            "fuzzy",
+            column.normalization,
+            column.normalized_pattern,
+            column.max_distance,
+        )
+    return column
+
+
+def _example_names(column: ColumnDefinition) -> List[str]:
+    """Get column names we know a column definition matches, to check if other definitions match them too"""
+    if isinstance(column, (StringColumn, NormalizedColumn, FuzzyColumn)):
+        return [column.pattern]
+    if isinstance(column, RegexColumn) and isinstance(column._source, str):
+        if column._flags is None:
+            # A plain string pattern, which only matches itself
+            return [column._source]
+    return []
+
+
+@dataclass(frozen=True)
+class ColumnCollision:
+    """Two column definitions in the same schema which both match `column_name`, so matching raises AmbigiousColumns"""
+
+    schema: Schema
+    columns: FrozenSet[ColumnDefinition]
+    column_name: str
+
+
+@dataclass(frozen=True)
+class _SchemaKeys:
+    """The match keys of a schema's columns"""
+
+    all: FrozenSet[Hashable]
+    required: FrozenSet[Hashable]
+
+
+class CatalogAnalysis:
+    """
+    What can be known about how a set of schemas will match before matching any headers
+
+    Build one with `analyze_schemas`. The analysis finds:
+
+    - Which schemas dominate others: schema A dominates schema B if A has every column definition B has and any other
+      columns of A are optional. A then matches every header B matches, with at least as many matching columns, so B
+      can never be the one best match. At best it ties with A.
+    - Which pairs of schemas always tie: for any header matching both, they match the same number of columns, so
+      `find_best_matching_schema` raises AmbigiousMatch unless a third schema is a better match.
+    - Which pairs of columns in the same schema collide, because both match the same column name, so matching a header
+      with that name raises AmbigiousColumns.
+
+    Whether columns are present is treated as independent, so a pair of schemas can be reported as able to tie even if
+    no real header makes them tie (for example, if it would take two RegexColumns which can't match the same name).
+    Collisions are found by checking column names we know one column matches against the other column, so RegexColumns
+    which both match some name are only found if one of them is a plain string.
+    """
+
+    def __init__(
+        self,
+        schemas: Sequence[Schema],
+        dominated_by: Dict[Schema, FrozenSet[Schema]],
+        always_tie: List[Tuple[Schema, Schema]],
+        column_collisions: List[ColumnCollision],
+        keys: Dict[Schema, _SchemaKeys],
+    ):
+        self.schemas = schemas
+        # Map from each dominated schema to the schemas which dominate it
+        self.dominated_by = dominated_by
+        # Pairs of schemas which tie whenever a header matches both of them, in schema order
+        self.always_tie = always_tie
+        self.column_collisions = column_collisions
+        self._keys = keys
+
+    def dominates(self, a: Schema, b: Schema) -> bool:
+        """Check if schema `a` dominates schema `b`"""
+        return a in self.dominated_by.get(b, ())
+
+    def can_tie(self, a: Schema, b: Schema) -> bool:
+        """Check if there's any header which schemas `a` and `b` both match with the same number of columns"""
+        a_keys = self._keys[a]
+        b_keys = self._keys[b]
+        required = a_keys.required | b_keys.required
+        # Any header matching both has every required column of both, and then optional columns only one of them has
+        # can add to one count without adding to the other
+        difference = len(b_keys.all & required) - len(a_keys.all & required)
+        a_optional = len(a_keys.all - b_keys.all - required)
+        b_optional = len(b_keys.all - a_keys.all - required)
+        return -b_optional <= difference <= a_optional
+
+    def report(self) -> str:
+        """Describe the inherent ambiguities in the schemas, for reviewing a catalog before deploying it"""
+        lines = []
+        for schema, dominators in self.dominated_by.items():
+            names = ", ".join(sorted(repr(dominator.name) for dominator in dominators))
+            lines.append(
+                f"Schema {schema.name!r} can never be the only best match, because it's dominated by {names}"
+            )
+        for a, b in self.always_tie:
+            lines.append(
+                f"Schemas {a.name!r} and {b.name!r} tie for every header matching both"
+            )
+        for collision in self.column_collisions:
+            names = " and ".join(
+                sorted(repr(column.name) for column in collision.columns)
+            )
+            lines.append(
+                f"Columns {names} of schema {collision.schema.name!r} both match {collision.column_name!r}"
+            )
+        if not lines:
+            return "No inherent ambiguities found"
+        return "\n".join(lines)
+
+
+def _schema_keys(schema: Schema) -> _SchemaKeys:
+    return _SchemaKeys(
+        frozenset(_match_key(column) for column in schema.columns),
+        frozenset(_match_key(column) for column in schema.columns if column.required),
+    )
+
+
+def _always_tie(a: _SchemaKeys, b: _SchemaKeys) -> bool:
+    # A header matching both has every required column of both, so they always tie if neither has an optional column
+    # the other doesn't have, and they have the same number of columns
+    return (
+        len(a.all) == len(b.all)
+        and (a.all - b.all) <= a.required
+        and (b.all - a.all) <= b.required
+    )
+
+
+def _column_collisions(schema: Schema) -> List[ColumnCollision]:
+    collisions = []
+    columns = sorted(schema.columns, key=lambda column: column.name)
+    for i, column in enumerate(columns):
+        for other in columns[i + 1 :]:
+            for column_name in _example_names(column) + _example_names(other):
+                if (
+                    column.matching_column({column_name}) is not None
+                    and other.matching_column({column_name}) is not None
+                ):
+                    collisions.append(
+                        ColumnCollision(schema, frozenset((column, other)), column_name)
+                    )
+                    break
+    return collisions
+
+
+def analyze_schemas(schemas: Iterable[Schema]) -> CatalogAnalysis:
+    """
+    Analyze a set of schemas for domination, ties and column collisions
+
+    This compares every pair of schemas with the same required columns for domination, and every pair of schemas with
+    the same number of columns for ties, so it can take a while for very large catalogs. Run it once when building a
+    catalog, not for every header.
+    """
+    schema_list: Sequence[Schema] = tuple(dict.fromkeys(schemas))
+    keys = {schema: _schema_keys(schema) for schema in schema_list}
+
+    # A dominating schema has exactly the same required column definitions as the schema it dominates, since every
+    # column of the dominated schema is a column of the dominating schema, and the rest are optional
+    by_required: Dict[FrozenSet[ColumnDefinition], List[Schema]] = defaultdict(list)
+    for schema in schema_list:
+        by_required[frozenset(schema._required_columns)].append(schema)
+    dominated_by: Dict[Schema, Set[Schema]] = defaultdict(set)
+    for group in by_required.values():
+        for i, a in enumerate(group):
+            for j, b in enumerate(group):
+                # Schemas with the same columns dominate each other, so only count the first one as dominating
+                if (
+                    i != j
+                    and b.columns <= a.columns
+                    and (b.columns != a.columns or i < j)
+                ):
+                    dominated_by[b].add(a)
+
+    by_size: Dict[int, List[Schema]] = defaultdict(list)
+    for schema in schema_list:
+        by_size[len(keys[schema].all)].append(schema)
+    always_tie = [
+        (a, b)
+        for group in by_size.values()
+        for i, a in enumerate(group)
+        for b in group[i + 1 :]
+        if _always_tie(keys[a], keys[b])
+    ]
+    order = {schema: i for i, schema in enumerate(schema_list)}
+    always_tie.sort(key=lambda pair: (order[pair[0]], order[pair[1]]))
+
+    return CatalogAnalysis(
+        schema_list,
+        {schema: frozenset(dominators) for schema, dominators in dominated_by.items()},
+        always_tie,
+        [
+            collision
+            for schema in schema_list
+            for collision in _column_collisions(schema)
+        ],
+        keys,
+    )
+
+
+class PrunedSchemaSet(SchemaSet):
+    """
+    A SchemaSet which skips dominated schemas when finding the best match
+
+    A dominated schema has a subset of the columns of a schema which dominates it, with the same required columns, so
+    whenever it matches, the dominating schema matches too and its match is the dominating schema's match restricted
+    to its columns. `find_best_matching_schema` only evaluates schemas which aren't dominated, and then works out the
+    matches of the schemas they dominate, which only matter if they tie for the best match. The results are the same
+    as SchemaSet, except that like other schemas which aren't evaluated, ambiguous columns aren't reported for
+    dominated schemas (but any ambiguous column in a dominated schema is in the schema dominating it too).
+
+    The other methods evaluate every schema, the same way as SchemaSet.
+    """
+
+    def __init__(
+        self, schemas: Iterable[Schema], analysis: Optional[CatalogAnalysis] = None
+    ):
+        super().__init__(schemas)
+        self.analysis = (
+            analysis if analysis is not None else analyze_schemas(self.schemas)
+        )
+        self._schema_indexes = {
+            schema: schema_index for schema_index, schema in enumerate(self.schemas)
+        }
+        # Map from each schema we evaluate to the indexes of the dominated schemas we work out from its match
+        # The analysis can cover schemas which aren't in this set, so only count dominators which are
+        dominated_by = {
+            schema: [
+                dominator
+                for dominator in dominators
+                if dominator in self._schema_indexes
+            ]
+            for schema, dominators in self.analysis.dominated_by.items()
+            if schema in self._schema_indexes
+        }
+        self._dominated: Dict[int, List[int]] = defaultdict(list)
+        for schema, dominators in dominated_by.items():
+            if not dominators:
+                continue
+            # Domination is transitive, so some dominating schema isn't dominated itself
+            dominator = next(
+                dominator for dominator in dominators if not dominated_by.get(dominator)
+            )
+            self._dominated[self._schema_indexes[dominator]].append(
+                self._schema_indexes[schema]
+            )
+        self._skipped = {
+            schema_index
+            for dominated in self._dominated.values()
+            for schema_index in dominated
+        }
+
+    def find_best_matching_schema(self, columns: Set[str]) -> Optional[SchemaMatch]:
+        """
+        Find the one schema in this set that best matches the given set of columns, skipping dominated schemas
+
+        See `any_columns.find_best_matching_schema`
+        """
+        candidates, evaluate = self._candidates(columns)
+        best = _branch_and_bound(
+            _by_upper_bound(
+                [
+                    candidate
+                    for candidate in candidates
+                    if candidate[1] not in self._skipped
+                ]
+            ),
+            evaluate,
+        )
+        if not best:
+            return None
+
+        count = len(best[0].matching_columns)
+        ties: List[Tuple[int, SchemaMatch]] = []
+        for match in best:
+            schema_index = self._schema_indexes[match.schema]
+            ties.append((schema_index, match))
+            for dominated_index in self._dominated.get(schema_index, ()):
+                dominated = self.schemas[dominated_index]
+                matching_columns: Dict[str, Any] = {
+                    column_name: column
+                    for column_name, column in match.matching_columns.items()
+                    if column in dominated.columns
+                }
+                if len(matching_columns) == count:
+                    ties.append(
+                        (
+                            dominated_index,
+                            SchemaMatch(dominated, frozendict(matching_columns)),
+                        )
+                    )
+        ties.sort(key=lambda tie: tie[0])
+        return _best_match([match for _, match in ties])
@@ -0,0 +1,106 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from .matching import SchemaMatch
+from .schema import Schema
+from .schema_set import SchemaSet
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """The result of matching one set of column names in a batch: either a match (or None), or the error raised"""
+
+    columns: FrozenSet[str]
+    match: Optional[SchemaMatch] = None
+    error: Optional[Exception] = None
+
+
+_ChunkResult = List[Tuple[Optional[SchemaMatch], Optional[Exception]]]
+
+# The schema set for each process in a process pool, so it's only sent to each process once instead of with every chunk
+_worker_schema_set: Optional[SchemaSet] = None
+
+
+def _init_worker(schema_set: SchemaSet) -> None:
+    global _worker_schema_set
+    _worker_schema_set = schema_set
+
+
+def _match_chunk_in_worker(chunk: List[FrozenSet[str]]) -> _ChunkResult:
+    assert _worker_schema_set is not None
+    return _match_chunk(_worker_schema_set, chunk)
+
+
+def _match_chunk(schema_set: SchemaSet, chunk: List[FrozenSet[str]]) -> _ChunkResult:
+    results: _ChunkResult = []
+    for columns in chunk:
+        try:
+            results.append((schema_set.find_best_matching_schema(set(columns)), None))
+        except Exception as e:
+            results.append((None, e))
+    return results
+
+
+def match_headers_batch(
+    schemas: Union[Set[Schema], SchemaSet],
+    headers: Iterable[Set[str]],
+    pool: Optional[Literal["thread", "process"]] = None,
+    max_workers: Optional[int] = None,
+    chunksize: int = 256,
+) -> List[BatchResult]:
+    """
+    Find the best matching schema for each of many sets of column names
+
+    The schemas are compiled into a SchemaSet once (unless they already are one), and each distinct set of column names
+    is only matched once. Set `pool` to "thread" or "process" to spread the distinct sets of column names over a thread
+    or process pool with `max_workers` workers, in chunks of `chunksize`. Threads only help if your schemas have
+    ColumnDefinitions which release the GIL, so "process" is usually what you want for large batches.
+
+    Returns one BatchResult per set of column names, in the same order. Exceptions from
+    `find_best_matching_schema` (like AmbigiousMatch) are captured in `BatchResult.error` instead of stopping the
+    batch. When using a process pool, the matches contain copies of the schemas which compare equal to the originals.
+    """
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be at least 1, got {chunksize}")
+    schema_set = schemas if isinstance(schemas, SchemaSet) else SchemaSet(schemas)
+
+    keys = [frozenset(columns) for columns in headers]
+    unique = list(dict.fromkeys(keys))
+    chunks = [unique[i : i + chunksize] for i in range(0, len(unique), chunksize)]
+
+    chunk_results: Iterable[_ChunkResult]
+    executor: Optional[Executor] = None
+    if pool is None:
+        chunk_results = (_match_chunk(schema_set, chunk) for chunk in chunks)
+    elif pool == "thread":
+        executor = ThreadPoolExecutor(max_workers)
+        chunk_results = executor.map(partial(_match_chunk, schema_set), chunks)
+    elif pool == "process":
+        executor = ProcessPoolExecutor(
+            max_workers, initializer=_init_worker, initargs=(schema_set,)
+        )
+        chunk_results = executor.map(_match_chunk_in_worker, chunks)
+    else:
+        raise ValueError(f'pool must be None, "thread" or "process", got {pool!r}')
+
+    results: Dict[FrozenSet[str], BatchResult] = {}
+    try:
+        for chunk, chunk_result in zip(chunks, chunk_results):
+            for columns, (match, error) in zip(chunk, chunk_result):
+                results[columns] = BatchResult(columns, match, error)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return [results[columns] for columns in keys]
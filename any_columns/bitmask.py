@@ -0,0 +1,264 @@
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import re
+
+from frozendict import frozendict  # type: ignore[attr-defined]
+
+from . import profiling
+from .column import AmbigiousColumn, ColumnDefinition
+from .matching import SchemaMatch
+from .regex_column import RegexColumn
+from .schema import Schema
+from .schema_set import SchemaSet
+from .string_column import StringColumn
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None  # type: ignore[assignment]
+
+
+def _popcount_rows(matrix: Any) -> Any:
+    """Count the bits set in each row of a matrix of uint64s"""
+    if hasattr(numpy, "bitwise_count"):
+        # NumPy 2.0+
+        return numpy.bitwise_count(matrix).sum(axis=1)
+    return numpy.unpackbits(matrix.view(numpy.uint8), axis=1).sum(axis=1)
+
+
+def _bits(value: int) -> Iterable[int]:
+    """Iterate over the indexes of the bits set in an integer"""
+    while value:
+        lowest = value & -value
+        yield lowest.bit_length() - 1
+        value ^= lowest
+
+
+class BitmaskSchemaSet(SchemaSet):
+    """
+    A SchemaSet for very large numbers of schemas which checks every schema at once using bitsets
+
+    Every distinct ColumnDefinition in the schemas gets an integer id, and each schema is stored as a bitset of its
+    required columns and a bitset of all of its columns. Matching evaluates each distinct ColumnDefinition once to get
+    a bitset of the columns present, and then a schema matches if all of its required bits are present, with the number
+    of matching columns being the number of its bits present.
+
+    If NumPy is installed the bitsets are stored as rows of a matrix so every schema is checked in one vectorized
+    operation, otherwise they're checked one at a time using Python integers. Pass `use_numpy=False` to always use
+    Python integers.
+
+    Since the number of matching columns for every schema is known up front, `find_best_matching_schema` and
+    `find_top_k_matching_schemas` only build results for the schemas they return. Schemas with an ambiguous column, or
+    with more than one column matching the same column name, are matched by the schema itself instead, so they raise
+    in the same cases and with the same exceptions as `find_best_matching_schema`. Results are ordered the same way as
+    SchemaSet.
+    """
+
+    def __init__(self, schemas: Iterable[Schema], use_numpy: Optional[bool] = None):
+        super().__init__(schemas)
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        elif use_numpy and numpy is None:
+            raise ImportError("use_numpy=True requires NumPy to be installed")
+
+        # Every distinct column definition and its id
+        self._columns: List[ColumnDefinition] = []
+        self._column_ids: Dict[ColumnDefinition, int] = {}
+        # How to find each column: StringColumns by pattern, RegexColumns by what the scanner finds, and everything
+        # else by calling `matching_column`
+        self._string_column_ids: Dict[str, List[int]] = defaultdict(list)
+        self._regex_column_ids: Dict[re.Pattern, List[int]] = defaultdict(list)
+        self._other_column_ids: List[int] = []
+
+        self._required_masks: List[int] = []
+        self._all_masks: List[int] = []
+        for schema in self.schemas:
+            required_mask = 0
+            all_mask = 0
+            for column in schema.columns:
+                column_id = self._column_ids.get(column)
+                if column_id is None:
+                    column_id = len(self._columns)
+                    self._column_ids[column] = column_id
+                    self._columns.append(column)
+                    if isinstance(column, StringColumn):
+                        self._string_column_ids[column.pattern].append(column_id)
+                    elif self._is_scannable(column):
+                        assert isinstance(column, RegexColumn)
+                        self._regex_column_ids[column.pattern].append(column_id)
+                    else:
+                        self._other_column_ids.append(column_id)
+                bit = 1 << column_id
+                all_mask |= bit
+                if column.required:
+                    required_mask |= bit
+            self._required_masks.append(required_mask)
+            self._all_masks.append(all_mask)
+        self._string_column_ids = dict(self._string_column_ids)
+
+        self._words = len(self._columns) // 64 + 1
+        self._required_matrix: Any = None
+        self._all_matrix: Any = None
+        if use_numpy:
+            self._required_matrix = self._to_matrix(self._required_masks)
+            self._all_matrix = self._to_matrix(self._all_masks)
+
+    def _to_words(self, mask: int) -> Any:
+        return numpy.frombuffer(mask.to_bytes(self._words * 8, "little"), dtype="<u8")
+
+    def _to_matrix(self, masks: List[int]) -> Any:
+        matrix = numpy.zeros((len(masks), self._words), dtype="<u8")
+        for row, mask in enumerate(masks):
+            matrix[row] = self._to_words(mask)
+        return matrix
+
+    def _find_columns(
+        self, columns: Set[str]
+    ) -> Tuple[int, Dict[int, str], Dict[int, AmbigiousColumn]]:
+        """
+        Evaluate every distinct column definition against the given column names
+
+        Returns a bitset of the column definitions present, the column name for each unambiguous column definition
+        present, and the exception for each ambiguous column definition.
+        """
+        column_names: Dict[int, str] = {}
+        ambigious: Dict[int, AmbigiousColumn] = {}
+
+        for column_name in columns:
+            for column_id in self._string_column_ids.get(column_name, ()):
+                column_names[column_id] = column_name
+
+        if self._regex_column_ids:
+            for pattern, found in self._regex_scanner.search_all(columns).items():
+                for column_id in self._regex_column_ids.get(pattern, ()):
+                    if len(found) > 1:
+                        ambigious[column_id] = AmbigiousColumn(
+                            self._columns[column_id], set(found)
+                        )
+                    else:
+                        [column_names[column_id]] = found
+
+        profile = profiling._active
+        for column_id in self._other_column_ids:
+            column = self._columns[column_id]
+            try:
+                if profile is not None:
+                    matching_column = profile._record_column(
+                        lambda definition: definition.matching_column(columns),
+                        column,
+                    )
+                else:
+                    matching_column = column.matching_column(columns)
+            except AmbigiousColumn as e:
+                ambigious[column_id] = e
+                continue
+            if matching_column is not None:
+                column_names[column_id] = matching_column
+
+        present = 0
+        for column_id in column_names:
+            present |= 1 << column_id
+        for column_id in ambigious:
+            present |= 1 << column_id
+        return present, column_names, ambigious
+
+    def _feasible(self, present: int) -> List[Tuple[int, int]]:
+        """Find the (number of matching columns, schema index) for every schema with all of its required columns"""
+        if self._required_matrix is not None:
+            present_words = self._to_words(present)
+            feasible = numpy.flatnonzero(
+                ~(self._required_matrix & ~present_words).any(axis=1)
+            )
+            counts = _popcount_rows(self._all_matrix[feasible] & present_words)
+            return list(zip(counts.tolist(), feasible.tolist()))
+        return [
+            ((all_mask & present).bit_count(), schema_index)
+            for schema_index, (required_mask, all_mask) in enumerate(
+                zip(self._required_masks, self._all_masks)
+            )
+            if required_mask & present == required_mask
+        ]
+
+    def _candidates(
+        self, columns: Set[str]
+    ) -> Tuple[List[Tuple[int, int]], Callable[[int], Optional[SchemaMatch]]]:
+        present, column_names, ambigious = self._find_columns(columns)
+        feasible = self._feasible(present)
+
+        profile = profiling._active
+        if profile is not None:
+            # Feasible schemas are recorded when they're evaluated, since branch and bound might never evaluate them
+            feasible_indexes = {schema_index for _, schema_index in feasible}
+            for schema_index, schema in enumerate(self.schemas):
+                if schema_index not in feasible_indexes:
+                    profile._record_rejected(schema)
+
+        # Column names matched by more than one column definition, and the definitions which matched them
+        shared_column_names: Dict[str, int] = defaultdict(int)
+        for column_id, column_name in column_names.items():
+            shared_column_names[column_name] |= 1 << column_id
+        shared_column_names = {
+            column_name: mask
+            for column_name, mask in shared_column_names.items()
+            if mask & (mask - 1)
+        }
+        ambigious_mask = 0
+        for column_id in ambigious:
+            ambigious_mask |= 1 << column_id
+        shared_mask = 0
+        for mask in shared_column_names.values():
+            shared_mask |= mask
+
+        def can_raise(all_mask: int) -> bool:
+            """Check if matching a schema could raise AmbigiousColumn or AmbigiousColumns"""
+            if all_mask & ambigious_mask:
+                return True
+            return bool(all_mask & shared_mask) and any(
+                (all_mask & mask).bit_count() > 1
+                for mask in shared_column_names.values()
+            )
+
+        # We know exactly how many columns each feasible schema matches, but that's only the upper bound for schemas
+        # which can't raise. Schemas which raise get the same upper bound as `find_best_matching_schema` gives them
+        # (their number of columns), so they're evaluated and raise in the same cases instead of being skipped.
+        candidates = [
+            (
+                (
+                    len(self.schemas[schema_index].columns)
+                    if can_raise(self._all_masks[schema_index])
+                    else count
+                ),
+                schema_index,
+            )
+            for count, schema_index in feasible
+        ]
+
+        def matching_column(column: ColumnDefinition) -> Optional[str]:
+            """Look up the column name we found for a column definition, like `ColumnDefinition.matching_column`"""
+            column_id = self._column_ids[column]
+            if column_id in ambigious:
+                raise ambigious[column_id]
+            return column_names.get(column_id)
+
+        def evaluate(schema_index: int) -> Optional[SchemaMatch]:
+            schema = self.schemas[schema_index]
+            all_mask = self._all_masks[schema_index]
+            if can_raise(all_mask):
+                # Let the schema find the problem so it raises the same exception as it would matching on its own
+                schema_match = schema._match_columns(matching_column)
+                if not schema_match.matches:
+                    return None
+                return SchemaMatch._from_schema_match(schema, schema_match)
+            if profile is not None:
+                profile._record_matched(schema)
+            return SchemaMatch(
+                schema,
+                frozendict(
+                    {
+                        column_names[column_id]: self._columns[column_id]
+                        for column_id in _bits(all_mask & present)
+                    }
+                ),
+            )
+
+        return candidates, evaluate
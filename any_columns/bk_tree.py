@@ -0,0 +1,90 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def edit_distance(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """
+    Find the Levenshtein distance between two strings: the number of insertions, deletions and substitutions needed to
+    turn one into the other
+
+    If `max_distance` is given, this stops as soon as the distance is known to be more than `max_distance` and returns
+    `max_distance + 1`.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+class _Node:
+    __slots__ = ("word", "children")
+
+    def __init__(self, word: str):
+        self.word = word
+        # Child nodes by their distance from this node's word
+        self.children: Dict[int, "_Node"] = {}
+
+
+class BKTree:
+    """
+    A Burkhard-Keller tree for finding the words within an edit distance of a string
+
+    Every word in a node's subtree under the edge labeled `d` is exactly `d` edits away from the node's word, so by the
+    triangle inequality a search within `k` edits of a string `s` only has to follow the edges within `k` of the
+    distance between `s` and the node's word, instead of comparing `s` to every word.
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        self._root: Optional[_Node] = None
+        self._size = 0
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, word: str) -> bool:
+        """Add a word to the tree, returning False if it was already there"""
+        if self._root is None:
+            self._root = _Node(word)
+            self._size += 1
+            return True
+        node = self._root
+        while True:
+            distance = edit_distance(word, node.word)
+            if distance == 0:
+                return False
+            child = node.children.get(distance)
+            if child is None:
+                node.children[distance] = _Node(word)
+                self._size += 1
+                return True
+            node = child
+
+    def search(self, word: str, max_distance: int) -> List[Tuple[str, int]]:
+        """Find the (word, distance) of every word in the tree within `max_distance` edits of `word`"""
+        results = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = edit_distance(word, node.word)
+            if distance <= max_distance:
+                results.append((node.word, distance))
+            for child_distance, child in node.children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        return results
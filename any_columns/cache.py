@@ -0,0 +1,173 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import (
+    Any,
+    Callable,
+    FrozenSet,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from .column import AmbigiousColumn
+from .matching import (
+    AmbigiousMatch,
+    SchemaMatch,
+    find_best_matching_schema,
+    find_best_matching_schemas,
+)
+from .registry import SchemaRegistry
+from .schema import AmbigiousColumns, Schema
+from .schema_set import SchemaSet
+
+# Exceptions which are a deterministic result of matching a set of columns, so they're cached like any other result
+_CACHED_EXCEPTIONS = (AmbigiousColumn, AmbigiousColumns, AmbigiousMatch)
+
+
+@dataclass(frozen=True)
+class CacheInfo:
+    """Statistics about a MatchCache"""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+class MatchCache:
+    """
+    A bounded LRU cache of matching results, for when the same sets of column names are matched over and over
+
+    Results are cached by the set of column names and the set of schemas they were matched against. A SchemaSet is
+    identified by the object itself, so cached results for it are only reused when matching with the same SchemaSet,
+    while a plain set of schemas is identified by its contents. A SchemaRegistry is identified by the object and its
+    version, so results cached before a schema is added or removed aren't reused afterwards. AmbigiousMatch,
+    AmbigiousColumns and AmbigiousColumn are cached too, and are raised again on a cache hit.
+
+    The cache is safe to share between threads.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, got {maxsize}")
+        self.maxsize = maxsize
+        self._entries: OrderedDict[
+            Tuple[str, Hashable, FrozenSet[str]], Tuple[bool, Any]
+        ] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def _schemas_key(schemas: Union[Set[Schema], SchemaSet]) -> Hashable:
+        if isinstance(schemas, SchemaRegistry):
+            # Results for older versions are never looked up again, so they're left for the LRU to evict
+            return schemas, schemas._version
+        if isinstance(schemas, (SchemaSet, frozenset)):
+            return schemas
+        return frozenset(schemas)
+
+    def _get(
+        self,
+        function: Callable[[Any, Set[str]], Any],
+        schemas: Union[Set[Schema], SchemaSet],
+        columns: Set[str],
+    ) -> Any:
+        key = (function.__name__, self._schemas_key(schemas), frozenset(columns))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+            else:
+                self._misses += 1
+
+        if entry is None:
+            try:
+                entry = (False, function(schemas, columns))
+            except _CACHED_EXCEPTIONS as e:
+                entry = (True, e)
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+
+        is_exception, result = entry
+        if is_exception:
+            raise result.with_traceback(None)
+        return result
+
+    def find_best_matching_schemas(
+        self, schemas: Union[Set[Schema], SchemaSet], columns: Set[str]
+    ) -> List[SchemaMatch]:
+        """Cached version of `find_best_matching_schemas`, which also accepts a SchemaSet"""
+        return list(self._get(_find_best_matching_schemas, schemas, columns))
+
+    def find_matching_schemas(
+        self, schemas: Union[Set[Schema], SchemaSet], columns: Set[str]
+    ) -> Set[Schema]:
+        """Cached version of `find_matching_schemas`, which also accepts a SchemaSet"""
+        return {
+            match.schema
+            for match in self._get(_find_best_matching_schemas, schemas, columns)
+        }
+
+    def find_best_matching_schema(
+        self, schemas: Union[Set[Schema], SchemaSet], columns: Set[str]
+    ) -> Optional[SchemaMatch]:
+        """Cached version of `find_best_matching_schema`, which also accepts a SchemaSet"""
+        return self._get(_find_best_matching_schema, schemas, columns)
+
+    def invalidate(self, schemas: Union[Set[Schema], SchemaSet, None] = None) -> None:
+        """Remove the cached results for the given schemas, or every cached result if schemas is None"""
+        with self._lock:
+            if schemas is None:
+                self._entries.clear()
+                return
+            if isinstance(schemas, SchemaRegistry):
+                # Remove the results for every version of the registry
+                stale = [
+                    key
+                    for key in self._entries
+                    if isinstance(key[1], tuple) and key[1][0] is schemas
+                ]
+            else:
+                schemas_key = self._schemas_key(schemas)
+                stale = [key for key in self._entries if key[1] == schemas_key]
+            for key in stale:
+                del self._entries[key]
+
+    def cache_info(self) -> CacheInfo:
+        """Get the hit, miss and eviction counts for this cache and its current size"""
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                len(self._entries),
+                self.maxsize,
+            )
+
+
+def _find_best_matching_schemas(
+    schemas: Union[Set[Schema], SchemaSet], columns: Set[str]
+) -> Tuple[SchemaMatch, ...]:
+    if isinstance(schemas, SchemaSet):
+        return tuple(schemas.find_best_matching_schemas(columns))
+    return tuple(find_best_matching_schemas(schemas, columns))
+
+
+def _find_best_matching_schema(
+    schemas: Union[Set[Schema], SchemaSet], columns: Set[str]
+) -> Optional[SchemaMatch]:
+    if isinstance(schemas, SchemaSet):
+        return schemas.find_best_matching_schema(columns)
+    return find_best_matching_schema(schemas, columns)
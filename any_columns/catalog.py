@@ -0,0 +1,320 @@
+from dataclasses import astuple
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+import marshal
+import mmap
+import os
+import struct
+import sys
+
+from .column import ColumnDefinition
+from .fuzzy_column import FuzzyColumn, FuzzyColumnIndex
+from .normalized_column import Normalization, NormalizedColumn
+from .regex_column import RegexColumn
+from .regex_scanner import RegexScanner
+from .schema import Schema
+from .schema_set import SchemaSet
+from .string_column import StringColumn
+
+_MAGIC = b"ANYCOLS\x00"
+_VERSION = 4
+# The magic bytes and the format version
+_HEADER = struct.Struct("<8sI")
+# The marshal format version and the Python major and minor version, since the marshal format can change between Python
+# versions
+_INTERPRETER = struct.Struct("<IBB")
+
+# Kinds of columns in the column table
+_STRING_COLUMN = 0
+_REGEX_COLUMN = 1
+_NORMALIZED_COLUMN = 2
+_FUZZY_COLUMN = 3
+
+
+def _column_row(column: ColumnDefinition) -> Tuple[int, str, Any, Any, bool]:
+    """
+    Convert a column to a (kind, name, pattern, options, required) row of the column table
+
+    The options are the flags of a RegexColumn's pattern, the fields of a NormalizedColumn's normalization, or the
+    max_distance and the fields of the normalization of a FuzzyColumn.
+    """
+    if type(column) is StringColumn:
+        return (_STRING_COLUMN, column.name, column.pattern, None, column.required)
+    if type(column) is RegexColumn:
+        return (
+            _REGEX_COLUMN,
+            column.name,
+            column._source,
+            column._flags,
+            column.required,
+        )
+    if type(column) is NormalizedColumn:
+        return (
+            _NORMALIZED_COLUMN,
+            column.name,
+            column.pattern,
+            astuple(column.normalization),
+            column.required,
+        )
+    if type(column) is FuzzyColumn:
+        return (
+            _FUZZY_COLUMN,
+            column.name,
+            column.pattern,
+            (column.max_distance, astuple(column.normalization)),
+            column.required,
+        )
+    raise TypeError(
+        "Only StringColumn, RegexColumn, NormalizedColumn and FuzzyColumn can be saved in a catalog, not "
+        + type(column).__name__
+    )
+
+
+def _load_column(row: Tuple[int, str, Any, Any, bool]) -> ColumnDefinition:
+    kind, name, source, flags, required = row
+    if kind == _STRING_COLUMN:
+        return StringColumn(name, source, required)
+    if kind == _NORMALIZED_COLUMN:
+        return NormalizedColumn(name, source, required, Normalization(*flags))
+    if kind == _FUZZY_COLUMN:
+        max_distance, normalization = flags
+        return FuzzyColumn(
+            name, source, max_distance, required, Normalization(*normalization)
+        )
+    if flags is None:
+        # The pattern is a plain string, so there's nothing to compile
+        return RegexColumn(name, source, required)
+    return RegexColumn._from_source(name, source, flags, required)
+
+
+def dumps_catalog(schemas: Union[Iterable[Schema], SchemaSet]) -> bytes:
+    """
+    Compile schemas into a catalog which can be loaded with `loads_catalog`
+
+    The catalog holds the same tables as a SchemaSet of the schemas, plus the source and flags of every regex, so
+    loading it doesn't need to compile anything or hash any schemas. Only StringColumn, RegexColumn, NormalizedColumn
+    and FuzzyColumn can be saved, and TypeError is raised for other kinds of columns. The BK-trees of FuzzyColumn
+    patterns are rebuilt when the catalog is loaded. Catalogs can only be loaded by the same minor version of Python
+    that made them.
+    """
+    schema_set = schemas if isinstance(schemas, SchemaSet) else SchemaSet(schemas)
+
+    column_ids: Dict[ColumnDefinition, int] = {}
+    column_rows: List[Tuple[int, str, Any, Any, bool]] = []
+    schema_rows: List[Tuple[str, Tuple[int, ...]]] = []
+    for schema in schema_set.schemas:
+        schema_column_ids = []
+        for column in schema.columns:
+            column_id = column_ids.get(column)
+            if column_id is None:
+                column_id = len(column_rows)
+                column_ids[column] = column_id
+                column_rows.append(_column_row(column))
+            schema_column_ids.append(column_id)
+        schema_rows.append((schema.name, tuple(schema_column_ids)))
+
+    regex_column_ids = sorted(
+        column_id
+        for column, column_id in column_ids.items()
+        if schema_set._is_scannable(column)
+    )
+    tables = {
+        "columns": column_rows,
+        "schemas": schema_rows,
+        "string_index": {
+            pattern: [
+                (schema_index, column_ids[column]) for schema_index, column in entries
+            ]
+            for pattern, entries in schema_set._string_index.items()
+        },
+        "normalized_index": [
+            (
+                astuple(normalization),
+                {
+                    pattern: [
+                        (schema_index, column_ids[column])
+                        for schema_index, column in entries
+                    ]
+                    for pattern, entries in patterns.items()
+                },
+            )
+            for normalization, patterns in schema_set._normalized_index.items()
+        ],
+        "fuzzy_columns": [
+            (schema_index, column_ids[column])
+            for fuzzy_index in schema_set._fuzzy_index.values()
+            for entries in fuzzy_index.entries.values()
+            for schema_index, column in entries
+        ],
+        "required_index_counts": schema_set._required_index_counts,
+        "unconditional": schema_set._unconditional,
+        "indexed": schema_set._indexed,
+        "regex_columns": regex_column_ids,
+    }
+    return (
+        _HEADER.pack(_MAGIC, _VERSION)
+        + _INTERPRETER.pack(marshal.version, *sys.version_info[:2])
+        + marshal.dumps(tables)
+    )
+
+
+def save_catalog(
+    schemas: Union[Iterable[Schema], SchemaSet], path: Union[str, "os.PathLike[str]"]
+) -> None:
+    """Compile schemas into a catalog file which can be loaded with `load_catalog`. See `dumps_catalog`."""
+    data = dumps_catalog(schemas)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+class _LazySchemas(Sequence[Schema]):
+    """The schemas of a catalog, which are only built the first time they're needed"""
+
+    def __init__(
+        self,
+        columns: List[ColumnDefinition],
+        schema_rows: List[Tuple[str, Tuple[int, ...]]],
+    ):
+        self._columns = columns
+        self._schema_rows = schema_rows
+        self._schemas: List[Optional[Schema]] = [None] * len(schema_rows)
+
+    def _get(self, index: int) -> Schema:
+        schema = self._schemas[index]
+        if schema is None:
+            name, column_ids = self._schema_rows[index]
+            schema = Schema(
+                {self._columns[column_id] for column_id in column_ids}, name
+            )
+            self._schemas[index] = schema
+        return schema
+
+    @overload
+    def __getitem__(self, index: int) -> Schema: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[Schema]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(len(self))[index]]
+        return self._get(range(len(self))[index])
+
+    def __len__(self) -> int:
+        return len(self._schema_rows)
+
+
+class CatalogSchemaSet(SchemaSet):
+    """
+    A SchemaSet loaded from a catalog made by `dumps_catalog` or `save_catalog`
+
+    The tables are loaded as they were saved instead of being rebuilt, Schema objects are only built the first time
+    they're needed, and each regex is only compiled the first time it's used. The results are the same as a SchemaSet
+    of the original schemas.
+    """
+
+    def __init__(self, tables: Dict[str, Any]):
+        # We don't call SchemaSet.__init__ since that would rebuild everything we loaded
+        self._columns = [_load_column(row) for row in tables["columns"]]
+        self.schemas = _LazySchemas(self._columns, tables["schemas"])
+        self._string_index = {
+            pattern: [
+                (schema_index, self._columns[column_id])
+                for schema_index, column_id in entries
+            ]
+            for pattern, entries in tables["string_index"].items()
+        }
+        self._normalized_index = {}
+        for normalization, patterns in tables["normalized_index"]:
+            self._normalized_index[Normalization(*normalization)] = {
+                pattern: [
+                    (schema_index, self._normalized_column(column_id))
+                    for schema_index, column_id in entries
+                ]
+                for pattern, entries in patterns.items()
+            }
+        self._fuzzy_index = {}
+        for schema_index, column_id in tables["fuzzy_columns"]:
+            column = self._columns[column_id]
+            assert isinstance(column, FuzzyColumn)
+            if column.normalization not in self._fuzzy_index:
+                self._fuzzy_index[column.normalization] = FuzzyColumnIndex(
+                    column.normalization
+                )
+            self._fuzzy_index[column.normalization].add(schema_index, column)
+        self._required_index_counts = tables["required_index_counts"]
+        self._unconditional = tables["unconditional"]
+        self._indexed = tables["indexed"]
+        self._regex_columns: List[RegexColumn] = []
+        for column_id in tables["regex_columns"]:
+            column = self._columns[column_id]
+            assert isinstance(column, RegexColumn)
+            self._regex_columns.append(column)
+        self._scanner: Optional[RegexScanner] = None
+
+    def _normalized_column(self, column_id: int) -> NormalizedColumn:
+        column = self._columns[column_id]
+        assert isinstance(column, NormalizedColumn)
+        return column
+
+    @property
+    def _regex_scanner(self) -> RegexScanner:  # type: ignore[override]
+        # Building the scanner compiles every regex, so wait until we need it
+        if self._scanner is None:
+            self._scanner = RegexScanner(
+                [column.pattern for column in self._regex_columns]
+            )
+        return self._scanner
+
+
+def loads_catalog(
+    buffer: Union[bytes, bytearray, memoryview, mmap.mmap],
+) -> CatalogSchemaSet:
+    """
+    Load a catalog made by `dumps_catalog` from a buffer
+
+    Raises ValueError if the buffer isn't a catalog or was made by an incompatible version of this library or of
+    Python.
+    """
+    with memoryview(buffer) as view:
+        if len(view) < _HEADER.size:
+            raise ValueError("Not a schema catalog")
+        magic, version = _HEADER.unpack_from(view)
+        if magic != _MAGIC:
+            raise ValueError("Not a schema catalog")
+        if version != _VERSION:
+            raise ValueError(
+                f"Unsupported schema catalog version {version}, expected {_VERSION}"
+            )
+        if len(view) < _HEADER.size + _INTERPRETER.size:
+            raise ValueError("Truncated schema catalog")
+        marshal_version, major, minor = _INTERPRETER.unpack_from(view, _HEADER.size)
+        if marshal_version != marshal.version or (major, minor) != sys.version_info[:2]:
+            raise ValueError(
+                f"Schema catalog was made by Python {major}.{minor} (marshal version {marshal_version}), and can't be "
+                f"loaded by Python {sys.version_info[0]}.{sys.version_info[1]} (marshal version {marshal.version})"
+            )
+        with view[_HEADER.size + _INTERPRETER.size :] as payload:
+            tables = marshal.loads(payload)
+    return CatalogSchemaSet(tables)
+
+
+def load_catalog(path: Union[str, "os.PathLike[str]"]) -> CatalogSchemaSet:
+    """
+    Load a catalog file made by `save_catalog`
+
+    The file is memory-mapped, so the catalog is parsed straight from the page cache without reading it into a buffer
+    first.
+    """
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return loads_catalog(mapped)
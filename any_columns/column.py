@@ -1,17 +1,38 @@
 from abc import ABC, abstractmethod
-from typing import Any, Optional, Set
+from typing import Any, Callable, Dict, Optional, Set, Union
+
+from . import profiling
+
+# Columns override `__setattr__`, and looking this up once keeps assigning their attributes cheap
+_set_attribute = object.__setattr__
 
 
 class AmbigiousColumn(Exception):
     """Exception raised if a ColumnDefinition matches more than one column header in the input"""
 
     def __init__(self, column: "ColumnDefinition", matching_columns: Set[str]):
+        super().__init__(column, matching_columns)
         self.column = column
         self.matching_columns = matching_columns
 
 
 class ColumnDefinition(ABC):
-    """A single column in a spreadsheet"""
+    """
+    A single column in a spreadsheet
+
+    Columns are hashed every time they're looked up while matching, so the built in columns keep their attributes in
+    slots and only build their `_key()` to hash it once. Assigning any public attribute (like `name` or `pattern`)
+    clears the cached hash, so a column changed after it's hashed still hashes the same as equal columns. Like any
+    object used as a dict key, don't change a column while it's in a set or a schema. Other attributes can still be
+    set on columns, since they have a `__dict__` too.
+    """
+
+    __slots__ = ("name", "required", "_hash", "__dict__")
+
+    name: str
+    required: bool
+    # None until the column is hashed, and again whenever a public attribute changes
+    _hash: Optional[int]
 
     def __init__(self, name: str, required: bool = True):
         self.name = name
@@ -37,3 +58,75 @@ class ColumnDefinition(ABC):
     @abstractmethod
     def __eq__(self, other) -> bool:
         pass
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        _set_attribute(self, name, value)
+        # The key is made of public attributes, so it needs to be hashed again if one of them changes
+        if name[0] != "_":
+            _set_attribute(self, "_hash", None)
+
+    def _cached_hash(self) -> int:
+        """Hash `_key()`, only building the key the first time"""
+        try:
+            cached = self._hash
+        except AttributeError:
+            cached = None
+        if cached is None:
+            cached = hash(self._key())
+            self._hash = cached
+        return cached
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Strings hash differently in every process, so the cached hash can't be sent to other processes
+        state = dict(getattr(self, "__dict__", {}))
+        for cls in type(self).__mro__:
+            for slot in cls.__dict__.get("__slots__", ()):
+                if slot not in ("_hash", "__dict__") and hasattr(self, slot):
+                    state[slot] = getattr(self, slot)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for attribute, value in state.items():
+            object.__setattr__(self, attribute, value)
+
+
+class MemoizedColumnMatcher:
+    """
+    Finds the column matching each ColumnDefinition in one set of column names, evaluating each distinct definition
+    only once
+
+    The same ColumnDefinition is often used in several schemas, so when matching a set of column names against many
+    schemas, this lets every schema reuse the result (or the AmbigiousColumn raised) for a definition another schema
+    already looked up.
+    """
+
+    def __init__(
+        self,
+        columns: Set[str],
+        matching_column: Optional[Callable[[ColumnDefinition], Optional[str]]] = None,
+    ):
+        self.columns = columns
+        self._matching_column = matching_column
+        self._results: Dict[ColumnDefinition, Union[str, None, AmbigiousColumn]] = {}
+
+    def __call__(self, column: ColumnDefinition) -> Optional[str]:
+        try:
+            result = self._results[column]
+        except KeyError:
+            profile = profiling._active
+            try:
+                if profile is not None:
+                    result = profile._record_column(self._evaluate, column)
+                else:
+                    result = self._evaluate(column)
+            except AmbigiousColumn as e:
+                result = e
+            self._results[column] = result
+        if isinstance(result, AmbigiousColumn):
+            raise result.with_traceback(None)
+        return result
+
+    def _evaluate(self, column: ColumnDefinition) -> Optional[str]:
+        if self._matching_column is None:
+            return column.matching_column(self.columns)
+        return self._matching_column(column)
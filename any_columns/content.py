@@ -0,0 +1,231 @@
+from collections import Counter, defaultdict
+from itertools import islice
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+import re
+
+from frozendict import frozendict  # type: ignore[attr-defined]
+
+from .column import AmbigiousColumn, ColumnDefinition
+from .matching import SchemaMatch
+from .schema import AmbigiousColumns, Schema
+
+# A function which checks if a single value looks like the contents of a column
+Detector = Callable[[str], bool]
+
+_EMAIL = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s.]+")
+_NUMBER = re.compile(
+    r"""
+    [-+]?[$€£¥]?
+    (?:\d{1,3}(?:,\d{3})+|\d+)?
+    (?:\.\d+)?
+    (?:[eE][-+]?\d+)?
+    %?
+    """,
+    re.VERBOSE,
+)
+_DATE = re.compile(
+    r"""
+    \d{4}-\d{1,2}-\d{1,2}(?:[T\ ]\d{1,2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[-+]\d{2}:?\d{2})?)?
+    | \d{1,2}[/.-]\d{1,2}[/.-](?:\d{4}|\d{2})
+    | \d{1,2}\ [A-Za-z]{3,9}\.?,?\ \d{4}
+    | [A-Za-z]{3,9}\.?\ \d{1,2},?\ \d{4}
+    """,
+    re.VERBOSE,
+)
+
+# How many rows to read at a time, so we can stop early without checking after every row
+_CHUNK_SIZE = 16
+
+
+def looks_like_email(value: str) -> bool:
+    """Check if a value looks like an email address"""
+    return _EMAIL.fullmatch(value.strip()) is not None
+
+
+def looks_like_number(value: str) -> bool:
+    """Check if a value looks like a number, including thousands separators, currency symbols and percentages"""
+    value = value.strip()
+    return (
+        any(char.isdigit() for char in value) and _NUMBER.fullmatch(value) is not None
+    )
+
+
+def looks_like_date(value: str) -> bool:
+    """Check if a value looks like a date, like "2022-01-31", "1/31/2022", "31 Jan 2022" or "January 31, 2022\" """
+    return _DATE.fullmatch(value.strip()) is not None
+
+
+class _Candidate:
+    """Counts of how many sampled values of a header column a detector accepted"""
+
+    __slots__ = ("hits", "seen", "decided")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.seen = 0
+        # True if accepted, False if rejected, None if we need more values
+        self.decided: Optional[bool] = None
+
+
+def _name_matches(
+    schema: Schema, columns: Set[str]
+) -> Dict[ColumnDefinition, Optional[str]]:
+    """Find the column name matching every column of a schema, even if a required column is missing"""
+    return {column: column.matching_column(columns) for column in schema.columns}
+
+
+def match_content(
+    schema: Schema,
+    header: Sequence[str],
+    rows: Iterable[Sequence[str]],
+    detectors: Mapping[str, Detector],
+    sample_size: int = 100,
+    threshold: float = 0.9,
+) -> Optional[SchemaMatch]:
+    """
+    Match a schema against a file, using the values in the file to find columns which can't be found by name
+
+    Columns are matched by name first. Then for each column of the schema which wasn't found and has a detector in
+    `detectors` (keyed by `ColumnDefinition.name`), the values of every header column which wasn't matched by name are
+    checked with the detector, and the column is assigned to the header column if at least `threshold` of its non-empty
+    values pass. Only header names which appear once in the header can be assigned this way.
+
+    At most `sample_size` rows are read from `rows`, in chunks, and each pair of schema column and header column is
+    decided as soon as the outcome can't change no matter what the rest of the sample holds. Reading stops as soon as
+    every pair is decided, so the cost per file is bounded no matter how many rows it has. If `rows` is an iterator,
+    the sampled rows are consumed.
+
+    Returns the match if every required column was found by name or by content, otherwise None. Raises AmbigiousColumn
+    if more than one header column matches a column by name or passes its detector, and AmbigiousColumns if a header
+    column is matched by more than one of the schema's columns.
+    """
+    if sample_size < 1:
+        raise ValueError(f"sample_size must be at least 1, got {sample_size}")
+    if not 0 < threshold <= 1:
+        raise ValueError(
+            f"threshold must be more than 0 and at most 1, got {threshold}"
+        )
+
+    column_names = _name_matches(schema, set(header))
+    matched_names = set(column_names.values())
+    name_counts = Counter(header)
+    unmatched_positions = [
+        position
+        for position, column_name in enumerate(header)
+        if column_name not in matched_names and name_counts[column_name] == 1
+    ]
+    unmatched_columns = [
+        column
+        for column, column_name in column_names.items()
+        if column_name is None and column.name in detectors
+    ]
+
+    candidates = {
+        (column, position): _Candidate()
+        for column in unmatched_columns
+        for position in unmatched_positions
+    }
+    _sample(candidates, rows, detectors, sample_size, threshold)
+
+    accepted: Dict[ColumnDefinition, Set[str]] = defaultdict(set)
+    for (column, position), candidate in candidates.items():
+        if candidate.decided:
+            accepted[column].add(header[position])
+    for column, found in accepted.items():
+        if len(found) > 1:
+            raise AmbigiousColumn(column, found)
+        [column_names[column]] = found
+
+    if any(
+        column.required and column_name is None
+        for column, column_name in column_names.items()
+    ):
+        return None
+
+    column_name_to_schema_columns: Dict[str, Set[ColumnDefinition]] = defaultdict(set)
+    for column, column_name in column_names.items():
+        if column_name is not None:
+            column_name_to_schema_columns[column_name].add(column)
+    for column_name, schema_columns in column_name_to_schema_columns.items():
+        if len(schema_columns) > 1:
+            raise AmbigiousColumns(schema, column_name, schema_columns)
+    return SchemaMatch(
+        schema,
+        frozendict(
+            {
+                column_name: schema_column
+                for column_name, [
+                    schema_column
+                ] in column_name_to_schema_columns.items()
+            }
+        ),
+    )
+
+
+def _non_empty_values(rows: List[Sequence[str]], position: int) -> List[str]:
+    """Get the non-empty values of one column of some rows, skipping rows which are too short"""
+    values = []
+    for row in rows:
+        if position < len(row):
+            value = row[position].strip()
+            if value:
+                values.append(value)
+    return values
+
+
+def _sample(
+    candidates: Dict[Tuple[ColumnDefinition, int], _Candidate],
+    rows: Iterable[Sequence[str]],
+    detectors: Mapping[str, Detector],
+    sample_size: int,
+    threshold: float,
+) -> None:
+    """Read sampled rows in chunks and run the detectors over them until every candidate is decided"""
+    undecided = dict(candidates)
+    rows_iterator: Iterator[Sequence[str]] = iter(rows)
+    rows_read = 0
+    while undecided and rows_read < sample_size:
+        chunk = list(islice(rows_iterator, min(_CHUNK_SIZE, sample_size - rows_read)))
+        if not chunk:
+            break
+        rows_read += len(chunk)
+        remaining = sample_size - rows_read
+
+        # Run each detector over a whole column of the chunk at once
+        column_values: Dict[int, List[str]] = {}
+        for (column, position), candidate in list(undecided.items()):
+            values = column_values.get(position)
+            if values is None:
+                values = _non_empty_values(chunk, position)
+                column_values[position] = values
+            candidate.seen += len(values)
+            candidate.hits += sum(map(bool, map(detectors[column.name], values)))
+
+            # The fraction of values which pass ends up somewhere between these no matter what the rest of the
+            # sample holds
+            total = candidate.seen + remaining
+            if total == 0:
+                continue
+            if candidate.hits / total >= threshold:
+                candidate.decided = True
+            elif (candidate.hits + remaining) / total < threshold:
+                candidate.decided = False
+            if candidate.decided is not None:
+                del undecided[(column, position)]
+
+    # We ran out of rows, so decide with what we have
+    for candidate in undecided.values():
+        candidate.decided = (
+            candidate.seen > 0 and candidate.hits / candidate.seen >= threshold
+        )
@@ -0,0 +1,72 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+import copy
+
+from .matching import SchemaMatch
+
+if TYPE_CHECKING:
+    import pandas  # type: ignore[import-not-found,import-untyped,unused-ignore]
+    import pyarrow  # type: ignore[import-not-found,import-untyped,unused-ignore]
+    import pyarrow.csv  # type: ignore[import-not-found,import-untyped,unused-ignore]
+
+
+def _column_names(match: SchemaMatch) -> Dict[str, str]:
+    """Map each matching column name in the file to its ColumnDefinition's name"""
+    return {
+        column_name: schema_column.name
+        for column_name, schema_column in match.matching_columns.items()
+    }
+
+
+def read_dataframe(file: Any, match: SchemaMatch, **kwargs: Any) -> "pandas.DataFrame":
+    """
+    Read only the matching columns of a CSV file into a pandas DataFrame, with columns named by `ColumnDefinition.name`
+
+    `file` and `kwargs` are passed to `pandas.read_csv`, with `usecols` set to the matching columns so the other
+    columns are never parsed, so passing `usecols` raises ValueError. Columns are in the order of the file, and are
+    renamed in place so the data isn't copied. Requires pandas to be installed.
+    """
+    import pandas
+
+    if "usecols" in kwargs:
+        raise ValueError(
+            "usecols can't be passed, since only the matching columns are read"
+        )
+    names = _column_names(match)
+    dataframe = pandas.read_csv(file, usecols=list(names), **kwargs)
+    dataframe.columns = [names[column_name] for column_name in dataframe.columns]
+    return dataframe
+
+
+def read_arrow_table(
+    file: Any,
+    match: SchemaMatch,
+    read_options: Optional["pyarrow.csv.ReadOptions"] = None,
+    parse_options: Optional["pyarrow.csv.ParseOptions"] = None,
+    convert_options: Optional["pyarrow.csv.ConvertOptions"] = None,
+) -> "pyarrow.Table":
+    """
+    Read only the matching columns of a CSV file into an Arrow Table, with columns named by `ColumnDefinition.name`
+
+    The options are passed to `pyarrow.csv.read_csv`, with `include_columns` of (a copy of) `convert_options` set to
+    the matching columns so the other columns are never converted. Columns are in the order of
+    `match.matching_columns` rather than the order of the file. Renaming the columns doesn't copy the data. Requires
+    pyarrow to be installed.
+    """
+    import pyarrow.csv
+
+    names = _column_names(match)
+    # Copy the options so the caller can reuse them for other files without keeping this file's columns
+    convert_options = (
+        pyarrow.csv.ConvertOptions()
+        if convert_options is None
+        else copy.copy(convert_options)
+    )
+    convert_options.include_columns = list(names)
+    table = pyarrow.csv.read_csv(
+        file,
+        read_options=read_options,
+        parse_options=parse_options,
+        convert_options=convert_options,
+    )
+    renamed: List[str] = [names[column_name] for column_name in table.column_names]
+    return table.rename_columns(renamed)
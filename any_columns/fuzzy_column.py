@@ -0,0 +1,141 @@
+from typing import Any, Dict, Optional, Set, Tuple
+
+from .bk_tree import BKTree, edit_distance
+from .column import AmbigiousColumn, ColumnDefinition
+from .normalized_column import Normalization
+
+
+class FuzzyColumn(ColumnDefinition):
+    """
+    A single column in a spreadsheet identified by a string, allowing for typos
+
+    A column name matches if it's within `max_distance` insertions, deletions or substitutions of the pattern, after
+    normalizing them both with `normalization`, so with the defaults "Emial Address" matches "email address" (swapping
+    two letters counts as two edits). Like a RegexColumn, this raises AmbigiousColumn if more than one column name is
+    close enough, even if one of them is closer than the others.
+
+    A SchemaSet finds the matches for every FuzzyColumn using a BK-tree of their patterns, instead of comparing every
+    column name to every pattern.
+    """
+
+    __slots__ = ("pattern", "max_distance", "normalization", "normalized_pattern")
+
+    def __init__(
+        self,
+        name: str,
+        pattern: str,
+        max_distance: int = 1,
+        required: bool = True,
+        normalization: Normalization = Normalization(),
+    ):
+        if max_distance < 0:
+            raise ValueError(f"max_distance must not be negative, got {max_distance}")
+        super().__init__(name, required)
+        self.pattern = pattern
+        self.max_distance = max_distance
+        self.normalization = normalization
+        self.normalized_pattern = normalization.normalize(pattern)
+
+    def _key(self) -> Any:
+        return (
+            self.name,
+            self.normalized_pattern,
+            self.max_distance,
+            self.normalization,
+            self.required,
+        )
+
+    def __hash__(self) -> int:
+        return self._cached_hash()
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, FuzzyColumn):
+            return self._key() == other._key()
+        return NotImplemented
+
+    def matching_column(self, others: Set[str]) -> Optional[str]:
+        """
+        Finds the column matching this definition in a set of column names if one exists
+
+        Raises `AmbigiousColumn` if more than one column name is within `max_distance` of the pattern
+        """
+        matching_columns = {
+            column
+            for column in others
+            if edit_distance(
+                self.normalization.normalize(column),
+                self.normalized_pattern,
+                self.max_distance,
+            )
+            <= self.max_distance
+        }
+        if len(matching_columns) > 1:
+            raise AmbigiousColumn(self, matching_columns)
+
+        # Return the one item in the set
+        for column in matching_columns:
+            return column
+        return None
+
+
+class FuzzyColumnIndex:
+    """
+    The FuzzyColumns of a set of schemas which use the same normalization, indexed by their normalized patterns
+
+    Columns can be removed, but their patterns stay in the BK-tree until more than half of the patterns in it are
+    unused, at which point it's rebuilt.
+    """
+
+    def __init__(self, normalization: Normalization):
+        self.normalization = normalization
+        # Map from normalized pattern to the (schema index, column) pairs using that pattern
+        self.entries: Dict[str, Dict[Tuple[int, FuzzyColumn], None]] = {}
+        self._tree = BKTree()
+        # The largest max_distance of any column, which is how far we need to search the tree
+        self._max_distance = 0
+
+    def add(self, schema_index: int, column: FuzzyColumn) -> None:
+        self.entries.setdefault(column.normalized_pattern, {})[
+            (schema_index, column)
+        ] = None
+        self._tree.add(column.normalized_pattern)
+        self._max_distance = max(self._max_distance, column.max_distance)
+
+    def remove(self, schema_index: int, column: FuzzyColumn) -> None:
+        entries = self.entries[column.normalized_pattern]
+        del entries[(schema_index, column)]
+        if not entries:
+            del self.entries[column.normalized_pattern]
+            if len(self._tree) > 2 * len(self.entries):
+                self._tree = BKTree(self.entries)
+                self._max_distance = max(
+                    (
+                        pattern_column.max_distance
+                        for pattern_entries in self.entries.values()
+                        for _, pattern_column in pattern_entries
+                    ),
+                    default=0,
+                )
+
+    def search(self, columns: Set[str]) -> Dict[str, Dict[str, int]]:
+        """Find the column names close enough to each pattern to match at least one column, and their distances"""
+        found: Dict[str, Dict[str, int]] = {}
+        for column_name in columns:
+            normalized = self.normalization.normalize(column_name)
+            for pattern, distance in self._tree.search(normalized, self._max_distance):
+                if pattern in self.entries:
+                    found.setdefault(pattern, {})[column_name] = distance
+        return found
+
+    @staticmethod
+    def matching_columns(
+        found: Dict[str, Dict[str, int]], column: FuzzyColumn
+    ) -> Set[str]:
+        """Get the column names matching a column from the results of `search`"""
+        return {
+            column_name
+            for column_name, distance in found.get(
+                column.normalized_pattern, {}
+            ).items()
+            if distance <= column.max_distance
+        }
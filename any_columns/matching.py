@@ -1,16 +1,91 @@
-from dataclasses import dataclass
-from typing import List, Optional, Set
+from dataclasses import dataclass, field
+from heapq import heappush, heapreplace
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 from frozendict import frozendict  # type: ignore[attr-defined]
 
-from .column import ColumnDefinition
-from .schema import Schema
+from .column import ColumnDefinition, MemoizedColumnMatcher
+from .schema import Schema, _CompactMatch
+from .schema import SchemaMatch as _SchemaResult
 
+if TYPE_CHECKING:
+    from .projection import Output, RowProjector
+
+
+@dataclass(frozen=True, init=False, repr=False, eq=False)
+class SchemaMatch(_CompactMatch):
+    """
+    A schema which matches a set of column names, and the column definition matching each column name
+
+    Matches found by matching a Schema keep its matching columns as indexes into the schema's columns, so
+    `matching_columns` is only built if it's used.
+    """
+
+    __slots__ = ("schema",)
 
-@dataclass(frozen=True)
-class SchemaMatch:
     schema: Schema
-    matching_columns: frozendict[str, ColumnDefinition]
+    # Built by `_CompactMatch.matching_columns` the first time it's used
+    matching_columns: frozendict[str, ColumnDefinition] = field()
+
+    def __init__(
+        self, schema: Schema, matching_columns: frozendict[str, ColumnDefinition]
+    ):
+        object.__setattr__(self, "schema", schema)
+        self._init_matching_columns(matching_columns)
+
+    @classmethod
+    def _from_schema_match(
+        cls, schema: Schema, schema_match: _SchemaResult
+    ) -> "SchemaMatch":
+        """Create a match sharing the matching columns of the result of `Schema._match_columns`"""
+        match = cls.__new__(cls)
+        object.__setattr__(match, "schema", schema)
+        if schema_match._column_indexes is None:
+            match._init_matching_columns(schema_match.matching_columns)
+        else:
+            match._init_column_indexes(
+                schema_match._columns, schema_match._column_indexes
+            )
+        return match
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not SchemaMatch:
+            return NotImplemented
+        return self.schema == other.schema and self._same_matching_columns(other)
+
+    def __hash__(self) -> int:
+        return hash((self.schema, self.matching_columns))
+
+    def __repr__(self) -> str:
+        return f"SchemaMatch(schema={self.schema!r}, matching_columns={self.matching_columns!r})"
+
+    def __reduce__(self) -> Any:
+        return (SchemaMatch, (self.schema, self.matching_columns))
+
+    def projector(
+        self, header: Sequence[str], output: "Output" = "dict", restval: Any = None
+    ) -> "RowProjector":
+        """
+        Get a RowProjector which extracts this match's columns from rows in the order given by `header`
+
+        Rows can be any sequence of values in header order, like the lists returned by `csv.reader`, and are projected
+        to tuples, namedtuples or dicts keyed by `ColumnDefinition.name` depending on `output`. Rows shorter than the
+        header are padded with `restval`.
+        """
+        # Imported here since the projection module needs SchemaMatch
+        from .projection import RowProjector
+
+        return RowProjector(self, header, output, restval)
 
 
 def find_best_matching_schemas(
@@ -22,12 +97,14 @@ def find_best_matching_schemas(
 
     Schemas that don't match at all (are missing required columns) will not be returned.
     """
+    # Column definitions are often shared between schemas, so only evaluate each one once
+    matching_column = MemoizedColumnMatcher(columns)
     matches = []
     for schema in schemas:
-        schema_match = schema.match_columns(columns)
+        schema_match = schema._match_columns(matching_column)
         if schema_match.matches:
-            matches.append(SchemaMatch(schema, schema_match.matching_columns))
-    matches.sort(key=lambda match: len(match.matching_columns), reverse=True)
+            matches.append(SchemaMatch._from_schema_match(schema, schema_match))
+    matches.sort(key=lambda match: match._count, reverse=True)
     return matches
 
 
@@ -43,6 +120,7 @@ class AmbigiousMatch(Exception):
     """Exception thrown when the best schema match for a set of columns is ambigious"""
 
     def __init__(self, matches: List[SchemaMatch]):
+        super().__init__(matches)
         self.matches = frozenset(matches)
 
 
@@ -53,17 +131,132 @@ def find_best_matching_schema(
     Find the one best matching schema for the given set of columns
 
     Will throw AmbigiousMatch if there is more than one schema with the same number of matching columns.
+
+    Schemas are checked in order of how many columns they have, and we stop once no remaining schema has enough columns
+    to match as many columns as the best match so far, so ambiguous columns in schemas that couldn't be the best match
+    aren't reported.
+    """
+    schema_list = list(schemas)
+    matching_column = MemoizedColumnMatcher(columns)
+    return _best_match(
+        _branch_and_bound(
+            _by_upper_bound(schema_list),
+            lambda order: _match_schema(schema_list[order], matching_column),
+        )
+    )
+
+
+def find_top_k_matching_schemas(
+    schemas: Set[Schema], columns: Set[str], k: int
+) -> List[SchemaMatch]:
+    """
+    Find the k best matching schemas for the given set of columns, ordered by best match
+
+    This returns the same matches as `find_best_matching_schemas(schemas, columns)[:k]`, but stops checking schemas once
+    no remaining schema could be one of the k best matches, so ambiguous columns in those schemas aren't reported.
+    """
+    if k < 0:
+        raise ValueError(f"k must not be negative, got {k}")
+    schema_list = list(schemas)
+    matching_column = MemoizedColumnMatcher(columns)
+    return _branch_and_bound(
+        _by_upper_bound(schema_list),
+        lambda order: _match_schema(schema_list[order], matching_column),
+        k,
+    )
+
+
+def _match_schema(
+    schema: Schema, matching_column: Callable[[ColumnDefinition], Optional[str]]
+) -> Optional[SchemaMatch]:
+    schema_match = schema._match_columns(matching_column)
+    if not schema_match.matches:
+        return None
+    return SchemaMatch._from_schema_match(schema, schema_match)
+
+
+def _by_upper_bound(schemas: List[Schema]) -> List[Tuple[int, int]]:
+    """
+    Get the (upper bound, index) for each schema, ordered by descending upper bound
+
+    A schema can't match more columns than it has, so its number of columns is an upper bound on the number of columns
+    it can match. Schemas with the same upper bound stay in the order they were given in.
+    """
+    return sorted(
+        ((len(schema.columns), order) for order, schema in enumerate(schemas)),
+        key=lambda candidate: candidate[0],
+        reverse=True,
+    )
+
+
+def _branch_and_bound(
+    candidates: Iterable[Tuple[int, int]],
+    evaluate: Callable[[int], Optional[SchemaMatch]],
+    k: Optional[int] = None,
+) -> List[SchemaMatch]:
+    """
+    Find the best matches without evaluating candidates which can't be one of them
+
+    `candidates` are (upper bound on number of matching columns, order) pairs sorted by descending upper bound, where
+    the order is used to break ties the same way `find_best_matching_schemas` would, and `evaluate` gets the match (if
+    any) for the candidate with the given order.
+
+    If k is None, this returns every match tied for the most matching columns, otherwise it returns the best k
+    matches. Matches are sorted by number of matching columns and then by order.
+    """
+    if k is None:
+        best_count = -1
+        best: List[Tuple[int, SchemaMatch]] = []
+        for upper_bound, order in candidates:
+            if upper_bound < best_count:
+                # The candidates are sorted by upper bound so none of the rest can tie either
+                break
+            match = evaluate(order)
+            if match is None:
+                continue
+            count = match._count
+            if count > best_count:
+                best_count = count
+                best = [(order, match)]
+            elif count == best_count:
+                best.append((order, match))
+        best.sort(key=lambda item: item[0])
+        return [match for _, match in best]
+
+    if k == 0:
+        return []
+    # A min heap of the best k matches so far, with the worst match (fewest columns, then latest order) on top
+    heap: List[Tuple[int, int, SchemaMatch]] = []
+    for upper_bound, order in candidates:
+        if len(heap) == k and upper_bound < heap[0][0]:
+            break
+        match = evaluate(order)
+        if match is None:
+            continue
+        item = (match._count, -order, match)
+        if len(heap) < k:
+            heappush(heap, item)
+        elif item[:2] > heap[0][:2]:
+            heapreplace(heap, item)
+    heap.sort(key=lambda item: item[:2], reverse=True)
+    return [match for _, _, match in heap]
+
+
+def _best_match(best_matches: List[SchemaMatch]) -> Optional[SchemaMatch]:
+    """
+    Pick the one best match out of a list of matches sorted by number of matching columns
+
+    Will throw AmbigiousMatch if more than one match has the highest number of matching columns.
     """
-    best_matches = find_best_matching_schemas(schemas, columns)
     if len(best_matches) == 0:
         return None
 
     matches = [best_matches[0]]
-    best_number_of_columns = len(best_matches[0].matching_columns)
+    best_number_of_columns = best_matches[0]._count
     for match in best_matches[1:]:
         # The best matches are already sorted by number of matching columns
-        assert len(match.matching_columns) <= best_number_of_columns
-        if len(match.matching_columns) == best_number_of_columns:
+        assert match._count <= best_number_of_columns
+        if match._count == best_number_of_columns:
             matches.append(match)
         else:
             # The list is sorted by number of matching columns so we can stop searching once we find one with fewer
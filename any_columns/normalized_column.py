@@ -0,0 +1,101 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Optional, Set
+import unicodedata
+
+from .column import AmbigiousColumn, ColumnDefinition
+
+
+@dataclass(frozen=True)
+class Normalization:
+    """
+    How NormalizedColumn normalizes column names before comparing them
+
+    With the defaults, "Start-Date", " start  date " and "START_DATE" all normalize to "start date".
+    """
+
+    # Apply Unicode NFKC normalization, so for example full-width and ligature characters match their plain versions
+    nfkc: bool = True
+    # Ignore case, including for non-ASCII characters
+    casefold: bool = True
+    # Replace punctuation (including "_") with spaces
+    strip_punctuation: bool = True
+    # Replace runs of whitespace with a single space and remove leading and trailing whitespace
+    collapse_whitespace: bool = True
+
+    def normalize(self, text: str) -> str:
+        """Normalize a column name. Results are cached, since the same column names are normalized over and over."""
+        return _normalize(self, text)
+
+
+@lru_cache(maxsize=65536)
+def _normalize(normalization: Normalization, text: str) -> str:
+    if normalization.nfkc:
+        text = unicodedata.normalize("NFKC", text)
+    if normalization.casefold:
+        text = text.casefold()
+        if normalization.nfkc:
+            # Casefolding can produce characters which aren't NFKC normalized
+            text = unicodedata.normalize("NFKC", text)
+    if normalization.strip_punctuation:
+        text = "".join(
+            " " if unicodedata.category(char).startswith("P") else char for char in text
+        )
+    if normalization.collapse_whitespace:
+        text = " ".join(text.split())
+    return text
+
+
+class NormalizedColumn(ColumnDefinition):
+    """
+    A single column in a spreadsheet identified by a string, ignoring differences in case, whitespace and punctuation
+
+    The column name and pattern are compared after normalizing them both with `normalization`. This is much more
+    efficient than a RegexColumn which ignores case, since a SchemaSet can look them up in an index the same way as a
+    StringColumn.
+    """
+
+    __slots__ = ("pattern", "normalization", "normalized_pattern")
+
+    def __init__(
+        self,
+        name: str,
+        pattern: str,
+        required: bool = True,
+        normalization: Normalization = Normalization(),
+    ):
+        super().__init__(name, required)
+        self.pattern = pattern
+        self.normalization = normalization
+        self.normalized_pattern = normalization.normalize(pattern)
+
+    def _key(self) -> Any:
+        # Patterns which normalize to the same thing match the same columns
+        return (self.name, self.normalized_pattern, self.normalization, self.required)
+
+    def __hash__(self) -> int:
+        return self._cached_hash()
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, NormalizedColumn):
+            return self._key() == other._key()
+        return NotImplemented
+
+    def matching_column(self, others: Set[str]) -> Optional[str]:
+        """
+        Finds the column matching this definition in a set of column names if one exists
+
+        Raises `AmbigiousColumn` if more than one column name normalizes to the same thing as the pattern
+        """
+        matching_columns = {
+            column
+            for column in others
+            if self.normalization.normalize(column) == self.normalized_pattern
+        }
+        if len(matching_columns) > 1:
+            raise AmbigiousColumn(self, matching_columns)
+
+        # Return the one item in the set
+        for column in matching_columns:
+            return column
+        return None
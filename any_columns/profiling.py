@@ -0,0 +1,226 @@
+from contextlib import contextmanager
+from time import perf_counter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+)
+import re
+
+if TYPE_CHECKING:
+    from .column import ColumnDefinition
+    from .schema import Schema, SchemaMatch
+
+
+class SchemaStats:
+    """Counters for the work done matching one schema"""
+
+    __slots__ = ("evaluations", "rejected_early", "matches", "seconds")
+
+    def __init__(self) -> None:
+        # Times we looked at this schema, including being rejected by an index without looking at its columns
+        self.evaluations = 0
+        # Times we stopped looking at this schema as soon as we found a missing required column
+        self.rejected_early = 0
+        # Times this schema matched
+        self.matches = 0
+        # Total time spent checking the columns of this schema, including evaluating its column definitions
+        self.seconds = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "evaluations": self.evaluations,
+            "rejected_early": self.rejected_early,
+            "matches": self.matches,
+            "seconds": self.seconds,
+        }
+
+
+class ColumnStats:
+    """Counters for the work done evaluating one column definition"""
+
+    __slots__ = ("evaluations", "regex_searches", "seconds")
+
+    def __init__(self) -> None:
+        # Times we looked for this column definition in a set of column names. Definitions shared between schemas
+        # are only evaluated once per set of column names.
+        self.evaluations = 0
+        # Times this definition's regex was searched for in a column name on its own, rather than by a RegexScanner
+        self.regex_searches = 0
+        # Total time spent evaluating this column definition
+        self.seconds = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "evaluations": self.evaluations,
+            "regex_searches": self.regex_searches,
+            "seconds": self.seconds,
+        }
+
+
+def _describe_pattern(column: "ColumnDefinition") -> Any:
+    """Get a column definition's pattern in a form which can be serialized as JSON"""
+    pattern = getattr(column, "pattern", None)
+    if isinstance(pattern, re.Pattern):
+        pattern = pattern.pattern
+    if pattern is None or isinstance(pattern, str):
+        return pattern
+    return repr(pattern)
+
+
+class MatchProfile:
+    """Counters for the work done while matching schemas"""
+
+    def __init__(self) -> None:
+        # Schemas we looked at the columns of
+        self.schemas_evaluated = 0
+        # Schemas we stopped looking at as soon as we found a missing required column
+        self.schemas_rejected_early = 0
+        # Schemas which matched
+        self.schemas_matched = 0
+        # Calls to `re.Pattern.search` made by RegexColumns, one per column name searched
+        self.regex_searches = 0
+        # Column names scanned by a RegexScanner for all of a SchemaSet's regexes at once, and the time it took
+        self.regex_scans = 0
+        self.regex_scan_seconds = 0.0
+        # Counters for each schema and column definition we did any work for
+        self.schema_stats: Dict["Schema", SchemaStats] = {}
+        self.column_stats: Dict["ColumnDefinition", ColumnStats] = {}
+
+    def _schema(self, schema: "Schema") -> SchemaStats:
+        stats = self.schema_stats.get(schema)
+        if stats is None:
+            stats = self.schema_stats[schema] = SchemaStats()
+        return stats
+
+    def _column(self, column: "ColumnDefinition") -> ColumnStats:
+        stats = self.column_stats.get(column)
+        if stats is None:
+            stats = self.column_stats[column] = ColumnStats()
+        return stats
+
+    def _record_schema(
+        self, schema: "Schema", match: Callable[[], "SchemaMatch"]
+    ) -> "SchemaMatch":
+        """Call `match` to match a schema, recording how long it took and whether the schema matched"""
+        stats = self._schema(schema)
+        stats.evaluations += 1
+        self.schemas_evaluated += 1
+        start = perf_counter()
+        try:
+            schema_match = match()
+        finally:
+            stats.seconds += perf_counter() - start
+        if schema_match.matches:
+            stats.matches += 1
+            self.schemas_matched += 1
+        else:
+            stats.rejected_early += 1
+            self.schemas_rejected_early += 1
+        return schema_match
+
+    def _record_rejected(self, schema: "Schema") -> None:
+        """Record a schema rejected by an index without looking at its columns"""
+        stats = self._schema(schema)
+        stats.evaluations += 1
+        stats.rejected_early += 1
+        self.schemas_evaluated += 1
+        self.schemas_rejected_early += 1
+
+    def _record_matched(self, schema: "Schema") -> None:
+        """Record a schema matched by an index without looking at its columns"""
+        stats = self._schema(schema)
+        stats.evaluations += 1
+        stats.matches += 1
+        self.schemas_evaluated += 1
+        self.schemas_matched += 1
+
+    def _record_column(
+        self,
+        matching_column: Callable[["ColumnDefinition"], Optional[str]],
+        column: "ColumnDefinition",
+    ) -> Optional[str]:
+        """Call `matching_column` to evaluate a column definition, recording how long it took"""
+        stats = self._column(column)
+        stats.evaluations += 1
+        start = perf_counter()
+        try:
+            return matching_column(column)
+        finally:
+            stats.seconds += perf_counter() - start
+
+    def _record_regex_searches(self, column: "ColumnDefinition", count: int) -> None:
+        self._column(column).regex_searches += count
+        self.regex_searches += count
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Get the counters as a dict which can be serialized as JSON
+
+        Schemas and column definitions are listed from the most to the least time spent on them, identified by name
+        (and by the type and pattern of column definitions), since the same name can be used more than once.
+        """
+        schemas: List[Dict[str, Any]] = [
+            {"name": schema.name, **stats.as_dict()}
+            for schema, stats in self.schema_stats.items()
+        ]
+        columns: List[Dict[str, Any]] = [
+            {
+                "name": column.name,
+                "type": type(column).__name__,
+                "pattern": _describe_pattern(column),
+                **stats.as_dict(),
+            }
+            for column, stats in self.column_stats.items()
+        ]
+        schemas.sort(key=lambda stats: stats["seconds"], reverse=True)
+        columns.sort(key=lambda stats: stats["seconds"], reverse=True)
+        return {
+            "schemas_evaluated": self.schemas_evaluated,
+            "schemas_rejected_early": self.schemas_rejected_early,
+            "schemas_matched": self.schemas_matched,
+            "regex_searches": self.regex_searches,
+            "regex_scans": self.regex_scans,
+            "regex_scan_seconds": self.regex_scan_seconds,
+            "schemas": schemas,
+            "columns": columns,
+        }
+
+
+# The profile being recorded, if any. Matching code checks this directly so there's almost no overhead when profiling
+# is turned off.
+_active: Optional[MatchProfile] = None
+
+
+@contextmanager
+def profile_matching(
+    callback: Optional[Callable[[MatchProfile], None]] = None,
+) -> Iterator[MatchProfile]:
+    """
+    Record counters for all matching done while in this context
+
+    Note that this records matching done by every thread, not just the current thread. If `callback` is given, it's
+    called with the profile when the context exits (even if it exits with an exception), which is useful for sending
+    the counters to a metrics system.
+
+    ```python
+    with profile_matching() as profile:
+        find_best_matching_schema(schemas, columns)
+    print(profile.schemas_rejected_early)
+    print(json.dumps(profile.as_dict()))
+    ```
+    """
+    global _active
+    previous = _active
+    profile = MatchProfile()
+    _active = profile
+    try:
+        yield profile
+    finally:
+        _active = previous
+        if callback is not None:
+            callback(profile)
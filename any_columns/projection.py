@@ -0,0 +1,167 @@
+from collections import namedtuple
+from operator import itemgetter
+import csv
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+from .matching import SchemaMatch, find_best_matching_schema
+from .schema import Schema
+from .schema_set import SchemaSet
+
+Output = Literal["tuple", "namedtuple", "dict"]
+
+
+class RowProjector:
+    """
+    Extracts the matching columns from rows given as sequences of values in header order, like rows from `csv.reader`
+
+    The values are picked out by index using `operator.itemgetter`, so projecting a row doesn't build any intermediate
+    dicts. Values are returned in the order their columns appear in the header, as a tuple, a namedtuple or a dict,
+    keyed by `ColumnDefinition.name` for the latter two. Names which aren't valid identifiers are replaced with
+    positional names (like `_0`) in namedtuples. Rows shorter than the header are padded with `restval`, the same as
+    `csv.DictReader`.
+    """
+
+    def __init__(
+        self,
+        match: SchemaMatch,
+        header: Sequence[str],
+        output: Output = "dict",
+        restval: Any = None,
+    ):
+        positions: Dict[str, int] = {}
+        for position, column_name in enumerate(header):
+            if column_name in match.matching_columns and column_name in positions:
+                raise ValueError(
+                    f"Matching column {column_name!r} appears more than once in the header"
+                )
+            positions[column_name] = position
+        try:
+            columns = sorted(
+                (positions[column_name], schema_column.name)
+                for column_name, schema_column in match.matching_columns.items()
+            )
+        except KeyError as e:
+            raise ValueError(f"Matching column {e.args[0]!r} isn't in the header")
+
+        self.indexes: Tuple[int, ...] = tuple(position for position, _ in columns)
+        self.names: Tuple[str, ...] = tuple(name for _, name in columns)
+        self.output = output
+        # The namedtuple type for rows if output is "namedtuple"
+        self.row_type: Any = None
+
+        get_values = self._values_getter(self.indexes, restval)
+        self.project: Callable[[Sequence[str]], Any]
+        if output == "tuple":
+            self.project = get_values
+        elif output == "namedtuple":
+            self.row_type = namedtuple("Row", self.names, rename=True)  # type: ignore
+            make = self.row_type._make
+            self.project = lambda row: make(get_values(row))
+        elif output == "dict":
+            names = self.names
+            self.project = lambda row: dict(zip(names, get_values(row)))
+        else:
+            raise ValueError(
+                f'output must be "tuple", "namedtuple" or "dict", got {output!r}'
+            )
+
+    @staticmethod
+    def _values_getter(
+        indexes: Tuple[int, ...], restval: Any
+    ) -> Callable[[Sequence[str]], Tuple]:
+        # itemgetter returns a single value instead of a tuple when given one index, and needs at least one index
+        if len(indexes) == 0:
+            return lambda row: ()
+        get: Callable[[Sequence[str]], Tuple]
+        if len(indexes) == 1:
+            [index] = indexes
+            get = lambda row: (row[index],)
+        else:
+            get = itemgetter(*indexes)
+        last_index = max(indexes)
+
+        def get_values(row: Sequence[str]) -> Tuple:
+            if len(row) > last_index:
+                return get(row)
+            return tuple(
+                row[index] if index < len(row) else restval for index in indexes
+            )
+
+        return get_values
+
+    def __call__(self, row: Sequence[str]) -> Any:
+        return self.project(row)
+
+
+class MatchedRows:
+    """
+    The rows of a CSV file projected to the columns of the file's best matching schema
+
+    `match` is the best matching schema for the file's header, or None if no schema matched, in which case iterating
+    over this yields nothing.
+    """
+
+    def __init__(
+        self,
+        reader: Iterator[List[str]],
+        header: List[str],
+        match: Optional[SchemaMatch],
+        output: Output,
+        restval: Any = None,
+    ):
+        self.header = header
+        self.match = match
+        self._reader = reader
+        self.projector = (
+            RowProjector(match, header, output, restval) if match is not None else None
+        )
+
+    def __iter__(self) -> Iterator[Any]:
+        if self.projector is None:
+            return iter(())
+        # Skip blank lines, which `csv.reader` returns as empty rows, the same as `csv.DictReader`
+        return map(self.projector.project, filter(None, self._reader))
+
+
+def read_rows(
+    file: TextIO,
+    schemas: Union[Set[Schema], SchemaSet],
+    output: Output = "dict",
+    restval: Any = None,
+    **fmtparams: Any,
+) -> MatchedRows:
+    """
+    Read the header of a CSV file, find the best matching schema, and stream the file's rows projected to its columns
+
+    `fmtparams` are passed to `csv.reader`. Like `csv.DictReader`, blank lines are skipped and rows with fewer values
+    than the header are padded with `restval`. Raises AmbigiousMatch if the best match is ambiguous.
+
+    ```python
+    with path.open(newline="") as f:
+        rows = read_rows(f, schemas)
+        if rows.match is None:
+            print(f"Skipping file {path} because it doesn't match any of our schemas")
+        for row in rows:
+            ...
+    ```
+    """
+    reader = csv.reader(file, **fmtparams)
+    header = next(reader, [])
+    if isinstance(schemas, SchemaSet):
+        match = schemas.find_best_matching_schema(set(header))
+    else:
+        match = find_best_matching_schema(schemas, set(header))
+    return MatchedRows(reader, header, match, output, restval)
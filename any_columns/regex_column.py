@@ -1,6 +1,7 @@
-from typing import Any, Optional, Set
+from typing import Any, Optional, Set, Union
 import re
 
+from . import profiling
 from .column import AmbigiousColumn, ColumnDefinition
 
 
@@ -9,20 +10,61 @@ class RegexColumn(ColumnDefinition):
     A single column in a spreadsheet identified by a regex
 
     A regex will match if it is found anywhere in the column name. Use ^ and $ if you want to require that the regex
-    matches the entire column name.
+    matches the entire column name. A plain string pattern only matches a column name equal to it, the same as a
+    StringColumn.
 
     Note that StringColumn should be preferred where possible because it's much more efficient.
     """
 
-    def __init__(self, name: str, pattern: re.Pattern, required: bool = True):
+    __slots__ = ("_pattern", "_source", "_flags")
+
+    # The pattern, or None until a lazy pattern is compiled. Plain string patterns are kept as they are.
+    _pattern: Any
+    # The source and flags of the pattern, or the string and None if the pattern is a plain string
+    _source: Any
+    _flags: Optional[int]
+
+    def __init__(
+        self, name: str, pattern: Union[str, re.Pattern], required: bool = True
+    ):
         super().__init__(name, required)
         self.pattern = pattern
 
+    @classmethod
+    def _from_source(
+        cls, name: str, source: Any, flags: int, required: bool = True
+    ) -> "RegexColumn":
+        """Create a RegexColumn which only compiles its pattern the first time it's used"""
+        column = cls.__new__(cls)
+        ColumnDefinition.__init__(column, name, required)
+        column._pattern = None
+        column._source = source
+        column._flags = flags
+        return column
+
+    @property
+    def pattern(self) -> re.Pattern:
+        if self._pattern is None:
+            self._pattern = re.compile(self._source, self._flags or 0)
+        return self._pattern
+
+    @pattern.setter
+    def pattern(self, pattern: Union[str, re.Pattern]) -> None:
+        self._pattern = pattern
+        # Compiled patterns are equal if their source and flags are, so we can compare columns by those without
+        # compiling lazy patterns
+        if isinstance(pattern, str):
+            self._source = pattern
+            self._flags = None
+        else:
+            self._source = pattern.pattern
+            self._flags = pattern.flags
+
     def _key(self) -> Any:
-        return (self.name, self.pattern, self.required)
+        return (self.name, self._source, self._flags, self.required)
 
     def __hash__(self) -> int:
-        return hash(self._key())
+        return self._cached_hash()
 
     def __eq__(self, other) -> bool:
         if isinstance(other, RegexColumn):
@@ -41,6 +83,10 @@ class RegexColumn(ColumnDefinition):
             else:
                 return None
 
+        profile = profiling._active
+        if profile is not None:
+            profile._record_regex_searches(self, len(others))
+
         matching_columns = {
             column for column in others if self.pattern.search(column)
         }
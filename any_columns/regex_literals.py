@@ -0,0 +1,109 @@
+from typing import Any, FrozenSet, List, Optional
+import re
+
+try:
+    # Python 3.11+
+    import re._parser as sre_parse  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover
+    import sre_parse  # type: ignore[no-redef]
+
+_REPEATS = tuple(
+    getattr(sre_parse, name)
+    for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+    if hasattr(sre_parse, name)
+)
+_ATOMIC_GROUP = getattr(sre_parse, "ATOMIC_GROUP", None)
+# Zero width items which don't stop the literals on either side of them from being next to each other in a match
+_ZERO_WIDTH = (sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT)
+
+# Literals shorter than this match too many strings to be worth filtering on
+MIN_LITERAL_LENGTH = 2
+
+
+def required_literals(pattern: re.Pattern) -> Optional[FrozenSet[str]]:
+    """
+    Find a set of literal strings where at least one of them must appear in any string the pattern is found in
+
+    For example, any string that `(start date|started)` is found in must contain "start date" or "started". If the
+    pattern is case insensitive the literals are lower case, and will only be found in strings that have been lower
+    cased. Note that this is only guaranteed for ASCII strings, since some non-ASCII characters match ASCII characters
+    when ignoring case.
+
+    Returns None if there's no set of literals which is required, or if the literals are too short to be useful.
+    """
+    if not isinstance(pattern.pattern, str):
+        return None
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except (re.error, RecursionError):
+        return None
+    ignorecase = bool(parsed.state.flags & re.IGNORECASE)
+    literals = _sequence_literals(parsed.data, ignorecase)
+    if literals is None or min(map(len, literals)) < MIN_LITERAL_LENGTH:
+        return None
+    return literals
+
+
+def _sequence_literals(items: List[Any], ignorecase: bool) -> Optional[FrozenSet[str]]:
+    """Find the best set of required literals for a sequence of parsed regex items"""
+    candidates: List[FrozenSet[str]] = []
+    run: List[str] = []
+
+    def end_run() -> None:
+        if run:
+            candidates.append(frozenset(("".join(run),)))
+            run.clear()
+
+    for op, value in items:
+        if op is sre_parse.LITERAL:
+            char = chr(value)
+            if ignorecase:
+                if not char.isascii():
+                    end_run()
+                    continue
+                char = char.lower()
+            run.append(char)
+        elif op in _ZERO_WIDTH:
+            pass
+        elif op is sre_parse.SUBPATTERN:
+            end_run()
+            _group, add_flags, del_flags, subpattern = value
+            if (add_flags | del_flags) & re.IGNORECASE:
+                # Case sensitivity changes inside this group, so its literals can't be mixed with ours
+                continue
+            literals = _sequence_literals(subpattern.data, ignorecase)
+            if literals is not None:
+                candidates.append(literals)
+        elif op is _ATOMIC_GROUP:
+            end_run()
+            literals = _sequence_literals(value.data, ignorecase)
+            if literals is not None:
+                candidates.append(literals)
+        elif op is sre_parse.BRANCH:
+            end_run()
+            _, branches = value
+            branch_literals: FrozenSet[str] = frozenset()
+            for branch in branches:
+                literals = _sequence_literals(branch.data, ignorecase)
+                if literals is None:
+                    # If any branch doesn't need a literal then the branch as a whole doesn't either
+                    break
+                branch_literals |= literals
+            else:
+                candidates.append(branch_literals)
+        elif op in _REPEATS:
+            end_run()
+            min_repeat, _max_repeat, subpattern = value
+            if min_repeat > 0:
+                literals = _sequence_literals(subpattern.data, ignorecase)
+                if literals is not None:
+                    candidates.append(literals)
+        else:
+            end_run()
+    end_run()
+
+    if not candidates:
+        return None
+    # The best set of literals is the one where the shortest literal is longest, since short literals are found in more
+    # strings
+    return max(candidates, key=lambda literals: min(map(len, literals)))
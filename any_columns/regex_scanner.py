@@ -0,0 +1,180 @@
+from collections import defaultdict
+from time import perf_counter
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+import re
+
+from . import profiling
+from .aho_corasick import AhoCorasick
+from .regex_literals import required_literals
+
+# Flags which can be applied to part of a pattern with (?flags:...), so patterns using different combinations of them
+# can still share a scanner
+_SCOPED_FLAGS = (
+    (re.IGNORECASE, "i"),
+    (re.MULTILINE, "m"),
+    (re.DOTALL, "s"),
+    (re.VERBOSE, "x"),
+)
+_SCOPED_FLAGS_MASK = re.IGNORECASE | re.MULTILINE | re.DOTALL | re.VERBOSE
+
+# Backreferences and conditionals refer to groups by number or name, which would change once the pattern is embedded
+# in a combined pattern
+_GROUP_REFERENCE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+
+def _embed(pattern: re.Pattern) -> str:
+    """
+    Wrap a pattern so it can be embedded in a combined pattern and will capture if the pattern is found anywhere
+
+    Matching `(?=.*?(pattern))` at the start of a string is equivalent to `pattern.search()`, but since it's a lookahead
+    it doesn't consume anything, so any number of these can be chained and each one captures independently.
+    """
+    flags = "".join(
+        letter for flag, letter in _SCOPED_FLAGS if pattern.flags & flag
+    )
+    source = pattern.pattern
+    if pattern.flags & re.VERBOSE:
+        # Make sure a trailing comment in a verbose pattern doesn't swallow our closing parenthesis
+        source += "\n"
+    return f"(?:(?=(?s:.*?)((?{flags}:{source})))|)"
+
+
+def _can_combine(pattern: re.Pattern) -> bool:
+    """Check if a pattern can be safely embedded in a combined pattern"""
+    if not isinstance(pattern.pattern, str):
+        return False
+    if pattern.groupindex or _GROUP_REFERENCE.search(pattern.pattern):
+        return False
+    try:
+        re.compile(_embed(pattern), pattern.flags & ~_SCOPED_FLAGS_MASK)
+    except re.error:
+        # For example, patterns with inline global flags like "(?i)abc"
+        return False
+    return True
+
+
+class _CombinedPattern:
+    """Several patterns with the same global flags merged into one"""
+
+    def __init__(self, patterns: List[re.Pattern], flags: int):
+        self.patterns = patterns
+        self.combined = re.compile(
+            "".join(_embed(pattern) for pattern in patterns), flags
+        )
+        # Our capturing group for each pattern is followed by the pattern's own groups, so find the index of our
+        # group in `Match.groups()` for each pattern
+        self.group_indexes: List[int] = []
+        group_index = 0
+        for pattern in patterns:
+            self.group_indexes.append(group_index)
+            group_index += 1 + pattern.groups
+
+    def scan(self, string: str) -> List[re.Pattern]:
+        match = self.combined.match(string)
+        # The pattern always matches since every lookahead is optional
+        assert match is not None
+        groups = match.groups()
+        return [
+            pattern
+            for pattern, group_index in zip(self.patterns, self.group_indexes)
+            if groups[group_index] is not None
+        ]
+
+
+class _LiteralFilter:
+    """Finds which patterns could possibly be found in a string based on the literals they require"""
+
+    def __init__(self, pattern_literals: Dict[re.Pattern, FrozenSet[str]]):
+        self._case_sensitive: Dict[str, List[re.Pattern]] = defaultdict(list)
+        self._ignorecase: Dict[str, List[re.Pattern]] = defaultdict(list)
+        for pattern, literals in pattern_literals.items():
+            index = (
+                self._ignorecase
+                if pattern.flags & re.IGNORECASE
+                else self._case_sensitive
+            )
+            for literal in literals:
+                index[literal].append(pattern)
+        self._case_sensitive_automaton = AhoCorasick(self._case_sensitive)
+        self._ignorecase_automaton = AhoCorasick(self._ignorecase)
+        self._ignorecase_patterns = {
+            pattern for patterns in self._ignorecase.values() for pattern in patterns
+        }
+
+    def candidates(self, string: str) -> Set[re.Pattern]:
+        """Find the patterns which need to be searched for in the given string"""
+        candidates = set()
+        for literal in self._case_sensitive_automaton.search(string):
+            candidates.update(self._case_sensitive[literal])
+        if string.isascii():
+            for literal in self._ignorecase_automaton.search(string.lower()):
+                candidates.update(self._ignorecase[literal])
+        else:
+            # Some non-ASCII characters match ASCII characters when ignoring case (like the Kelvin sign and "k"), so
+            # lower casing the string isn't enough to check for literals
+            candidates.update(self._ignorecase_patterns)
+        return candidates
+
+
+class RegexScanner:
+    """
+    Searches strings for many regex patterns at once
+
+    Patterns which require some literal text to match are indexed by that text in an Aho-Corasick automaton, so they're
+    only searched for in strings which contain that text. The remaining patterns are merged into one combined pattern
+    per set of global flags (ASCII vs. Unicode matching), so each string is scanned with a single regex call instead of
+    one `pattern.search` per pattern. Patterns that can't be merged (because they use backreferences, named groups or
+    inline global flags) are searched for individually.
+    """
+
+    def __init__(self, patterns: Iterable[re.Pattern]):
+        self.patterns: Tuple[re.Pattern, ...] = tuple(dict.fromkeys(patterns))
+
+        grouped: Dict[int, List[re.Pattern]] = defaultdict(list)
+        pattern_literals: Dict[re.Pattern, FrozenSet[str]] = {}
+        self._individual: List[re.Pattern] = []
+        for pattern in self.patterns:
+            literals = required_literals(pattern)
+            if literals is not None:
+                pattern_literals[pattern] = literals
+            elif _can_combine(pattern):
+                grouped[pattern.flags & ~_SCOPED_FLAGS_MASK].append(pattern)
+            else:
+                self._individual.append(pattern)
+        self._combined = [
+            _CombinedPattern(patterns, flags) for flags, patterns in grouped.items()
+        ]
+        self._filter = _LiteralFilter(pattern_literals) if pattern_literals else None
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def scan(self, string: str) -> List[re.Pattern]:
+        """Find every pattern which is found anywhere in the given string, like `pattern.search` would"""
+        found = []
+        for combined in self._combined:
+            found.extend(combined.scan(string))
+        for pattern in self._individual:
+            if pattern.search(string):
+                found.append(pattern)
+        if self._filter is not None:
+            for pattern in self._filter.candidates(string):
+                if pattern.search(string):
+                    found.append(pattern)
+        return found
+
+    def search_all(self, strings: Iterable[str]) -> Dict[re.Pattern, Set[str]]:
+        """Find the set of strings each pattern is found in, leaving out patterns that weren't found at all"""
+        profile = profiling._active
+        if profile is not None:
+            start = perf_counter()
+        found: Dict[re.Pattern, Set[str]] = defaultdict(set)
+        scanned = 0
+        for string in strings:
+            scanned += 1
+            for pattern in self.scan(string):
+                found[pattern].add(string)
+        if profile is not None:
+            profile.regex_scans += scanned
+            profile.regex_scan_seconds += perf_counter() - start
+        return found
@@ -0,0 +1,265 @@
+from functools import partial
+from threading import RLock
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
+import re
+
+from .matching import SchemaMatch
+from .fuzzy_column import FuzzyColumn, FuzzyColumnIndex
+from .normalized_column import Normalization, NormalizedColumn
+from .regex_column import RegexColumn
+from .regex_scanner import RegexScanner
+from .schema import Schema
+from .schema_set import SchemaSet
+from .string_column import StringColumn
+
+T = TypeVar("T")
+
+
+class _Slots(Sequence[Schema]):
+    """
+    The schemas in a SchemaRegistry, indexed by slot
+
+    Removed schemas leave an empty slot behind so the other schemas keep their slots, and those are skipped when
+    iterating.
+    """
+
+    def __init__(self, slots: List[Optional[Schema]], live: Dict[Schema, int]):
+        self._slots = slots
+        self._live = live
+
+    @overload
+    def __getitem__(self, index: int) -> Schema: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[Schema]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [schema for schema in self._slots[index] if schema is not None]
+        schema = self._slots[index]
+        if schema is None:
+            raise IndexError(f"Slot {index} is empty")
+        return schema
+
+    def __iter__(self) -> Iterator[Schema]:
+        return (schema for schema in self._slots if schema is not None)
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def __contains__(self, schema: object) -> bool:
+        return schema in self._live
+
+
+class SchemaRegistry(SchemaSet):
+    """
+    A SchemaSet which schemas can be added to and removed from while it's in use
+
+    Adding or removing a schema updates the index in place, in time proportional to the number of columns in that
+    schema. Each schema gets a slot when it's added and removed schemas leave an empty slot behind, so once more than
+    half of the slots are empty they're compacted by rebuilding the index. The RegexScanner is rebuilt the next time
+    it's needed after a schema adds or removes a regex no other schema uses.
+
+    Matching is safe from any number of threads while another thread adds or removes schemas. Writers take a lock and
+    increment a version number before and after each change, and readers don't take the lock unless the version number
+    changed while they were matching, in which case they match again while holding the lock. Every result is the same
+    as matching against a SchemaSet of the schemas in the registry at some point during the call.
+
+    Ties are ordered by when schemas were added, the same way as a SchemaSet of the schemas in the order they were
+    added. A MatchCache keys its results by the registry's version, so it won't return results from before a change.
+    """
+
+    def __init__(self, schemas: Iterable[Schema] = ()):
+        self._lock = RLock()
+        # Odd while a change is being made
+        self._version = 0
+        self._reset()
+        for schema in schemas:
+            self._add(schema)
+
+    def _reset(self) -> None:
+        self._slots: List[Optional[Schema]] = []
+        self._schema_slots: Dict[Schema, int] = {}
+        self.schemas = _Slots(self._slots, self._schema_slots)
+        # These are the same as in SchemaSet, except we use dicts as ordered sets so entries can be removed in place
+        self._string_entries: Dict[str, Dict[Tuple[int, StringColumn], None]] = {}
+        self._string_index = self._string_entries  # type: ignore[assignment]
+        self._normalized_entries: Dict[
+            Normalization, Dict[str, Dict[Tuple[int, NormalizedColumn], None]]
+        ] = {}
+        self._normalized_index = self._normalized_entries  # type: ignore[assignment]
+        self._fuzzy_index = {}
+        self._required_index_counts = []
+        self._unconditional_slots: Dict[int, None] = {}
+        self._unconditional = self._unconditional_slots.keys()
+        self._indexed = []
+        # How many columns use each regex, so we know when the set of regexes changes
+        self._regex_counts: Dict[re.Pattern, int] = {}
+        self._scanner: Optional[RegexScanner] = RegexScanner([])
+
+    def _add(self, schema: Schema) -> bool:
+        if schema in self._schema_slots:
+            return False
+        slot = len(self._slots)
+        self._slots.append(schema)
+        self._schema_slots[schema] = slot
+
+        required_count = 0
+        for column in schema.columns:
+            if isinstance(column, StringColumn):
+                self._string_entries.setdefault(column.pattern, {})[
+                    (slot, column)
+                ] = None
+                if column.required:
+                    required_count += 1
+            elif isinstance(column, NormalizedColumn):
+                self._normalized_entries.setdefault(
+                    column.normalization, {}
+                ).setdefault(column.normalized_pattern, {})[(slot, column)] = None
+                if column.required:
+                    required_count += 1
+            elif isinstance(column, FuzzyColumn):
+                if column.normalization not in self._fuzzy_index:
+                    self._fuzzy_index[column.normalization] = FuzzyColumnIndex(
+                        column.normalization
+                    )
+                self._fuzzy_index[column.normalization].add(slot, column)
+                if column.required:
+                    required_count += 1
+            elif self._is_scannable(column):
+                assert isinstance(column, RegexColumn)
+                count = self._regex_counts.get(column.pattern, 0)
+                if count == 0:
+                    self._scanner = None
+                self._regex_counts[column.pattern] = count + 1
+        self._required_index_counts.append(required_count)
+        if required_count == 0:
+            self._unconditional_slots[slot] = None
+        self._indexed.append(self._is_indexable(schema))
+        return True
+
+    def _remove(self, schema: Schema) -> None:
+        slot = self._schema_slots.pop(schema)
+        for column in schema.columns:
+            if isinstance(column, StringColumn):
+                entries = self._string_entries[column.pattern]
+                del entries[(slot, column)]
+                if not entries:
+                    del self._string_entries[column.pattern]
+            elif isinstance(column, NormalizedColumn):
+                patterns = self._normalized_entries[column.normalization]
+                normalized_entries = patterns[column.normalized_pattern]
+                del normalized_entries[(slot, column)]
+                if not normalized_entries:
+                    del patterns[column.normalized_pattern]
+                    if not patterns:
+                        del self._normalized_entries[column.normalization]
+            elif isinstance(column, FuzzyColumn):
+                fuzzy_index = self._fuzzy_index[column.normalization]
+                fuzzy_index.remove(slot, column)
+                if not fuzzy_index.entries:
+                    del self._fuzzy_index[column.normalization]
+            elif self._is_scannable(column):
+                assert isinstance(column, RegexColumn)
+                count = self._regex_counts[column.pattern] - 1
+                if count == 0:
+                    del self._regex_counts[column.pattern]
+                    self._scanner = None
+                else:
+                    self._regex_counts[column.pattern] = count
+        self._slots[slot] = None
+        self._unconditional_slots.pop(slot, None)
+        self._indexed[slot] = False
+
+        if len(self._slots) > 2 * len(self._schema_slots) + 16:
+            schemas = list(self.schemas)
+            self._reset()
+            for schema in schemas:
+                self._add(schema)
+
+    def _write(self, change: Callable[[], T]) -> T:
+        with self._lock:
+            self._version += 1
+            try:
+                return change()
+            finally:
+                self._version += 1
+
+    def _read(self, read: Callable[[], T]) -> T:
+        """Call `read`, calling it again while holding the lock if a writer changed anything in the meantime"""
+        version = self._version
+        if version % 2 == 0:
+            try:
+                result = read()
+            except Exception:
+                # Reading a half-made change can fail in ways that have nothing to do with the columns we're matching
+                if self._version == version:
+                    raise
+            else:
+                if self._version == version:
+                    return result
+        with self._lock:
+            return read()
+
+    def add(self, schema: Schema) -> bool:
+        """Add a schema to the registry, returning False if it was already there"""
+        return self._write(partial(self._add, schema))
+
+    def remove(self, schema: Schema) -> None:
+        """Remove a schema from the registry, raising KeyError if it isn't there"""
+        self._write(partial(self._remove, schema))
+
+    def discard(self, schema: Schema) -> bool:
+        """Remove a schema from the registry if it's there, returning whether it was"""
+        with self._lock:
+            if schema not in self._schema_slots:
+                return False
+            self.remove(schema)
+            return True
+
+    @property
+    def _regex_scanner(self) -> RegexScanner:  # type: ignore[override]
+        scanner = self._scanner
+        if scanner is None:
+            # Build the scanner while holding the lock so a writer can't change the regexes while we're building it
+            with self._lock:
+                if self._scanner is None:
+                    self._scanner = RegexScanner(list(self._regex_counts))
+                scanner = self._scanner
+        return scanner
+
+    def __len__(self) -> int:
+        return len(self._schema_slots)
+
+    def __iter__(self) -> Iterator[Schema]:
+        return iter(self._read(lambda: list(self.schemas)))
+
+    def __contains__(self, schema: object) -> bool:
+        return schema in self._schema_slots
+
+    def find_best_matching_schemas(self, columns: Set[str]) -> List[SchemaMatch]:
+        return self._read(partial(SchemaSet.find_best_matching_schemas, self, columns))
+
+    def find_best_matching_schema(self, columns: Set[str]) -> Optional[SchemaMatch]:
+        return self._read(partial(SchemaSet.find_best_matching_schema, self, columns))
+
+    def find_top_k_matching_schemas(
+        self, columns: Set[str], k: int
+    ) -> List[SchemaMatch]:
+        return self._read(
+            partial(SchemaSet.find_top_k_matching_schemas, self, columns, k)
+        )
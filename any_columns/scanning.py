@@ -0,0 +1,210 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import codecs
+import csv
+import os
+from typing import Iterable, List, Literal, Optional, Set, Tuple, Union
+
+from .column import AmbigiousColumn
+from .matching import AmbigiousMatch, SchemaMatch
+from .schema import AmbigiousColumns, Schema
+from .schema_set import SchemaSet
+from .xlsx import read_xlsx_header
+
+FilePath = Union[str, "os.PathLike[str]"]
+# Suffixes of files read with `read_xlsx_header` instead of as CSV
+XLSX_SUFFIXES = (".xlsx", ".xlsm")
+
+Status = Literal["matched", "no match", "ambiguous", "error"]
+
+# Longest BOMs first, since the UTF-32 LE BOM starts with the UTF-16 LE BOM
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+_SNIFF_DELIMITERS = ",;\t|"
+
+_AMBIGUOUS_EXCEPTIONS = (AmbigiousColumn, AmbigiousColumns, AmbigiousMatch)
+
+
+def _decode(data: bytes, encoding: Optional[str]) -> str:
+    """
+    Decode the start of a file, which may end in the middle of a character
+
+    If no encoding is given, a BOM picks the encoding, otherwise UTF-8 is tried with a fallback to Latin-1.
+    """
+    if encoding is None:
+        for bom, bom_encoding in _BOMS:
+            if data.startswith(bom):
+                data = data[len(bom) :]
+                encoding = bom_encoding
+                break
+    if encoding is not None:
+        return codecs.getincrementaldecoder(encoding)().decode(data)
+    try:
+        return codecs.getincrementaldecoder("utf-8")().decode(data)
+    except UnicodeDecodeError:
+        return data.decode("latin-1")
+
+
+def _first_record(text: str, complete: bool) -> Optional[str]:
+    """
+    Get the text of the first CSV record, which may span several lines if it has quoted newlines
+
+    Returns None if the text ends before the record does and the text isn't the whole file.
+    """
+    quoted = False
+    for i, char in enumerate(text):
+        if char == '"':
+            quoted = not quoted
+        elif char in "\r\n" and not quoted:
+            return text[:i]
+    if not complete:
+        return None
+    return text
+
+
+def _parse_header(
+    data: bytes, complete: bool, encoding: Optional[str], delimiter: Optional[str]
+) -> Optional[List[str]]:
+    """
+    Parse the column names from the start of a CSV file, which is the whole file if `complete` is True
+
+    Returns None if the data ends before the first row does and isn't the whole file.
+    """
+    text = _first_record(_decode(data, encoding), complete)
+    if text is None:
+        return None
+    if not text:
+        return []
+
+    if delimiter is None:
+        try:
+            delimiter = csv.Sniffer().sniff(text, _SNIFF_DELIMITERS).delimiter
+        except csv.Error:
+            delimiter = ","
+    return next(csv.reader([text], delimiter=delimiter), [])
+
+
+def read_header(
+    path: FilePath,
+    max_bytes: int = 64 * 1024,
+    encoding: Optional[str] = None,
+    delimiter: Optional[str] = None,
+) -> List[str]:
+    """
+    Read the column names from the first row of a CSV file or .xlsx workbook, without reading the rest of the file
+
+    At most `max_bytes` are read, and ValueError is raised if the first row is longer than that. The encoding is
+    detected from the BOM if there is one, otherwise the file is decoded as UTF-8, falling back to Latin-1 if it isn't
+    valid UTF-8. The delimiter is detected with `csv.Sniffer` from "," ";" tab and "|", defaulting to ",". Pass
+    `encoding` or `delimiter` to skip detecting them.
+
+    Files ending in .xlsx or .xlsm are read with `read_xlsx_header` instead, using the first sheet.
+    """
+    if os.fspath(path).lower().endswith(XLSX_SUFFIXES):
+        return read_xlsx_header(path)
+    data, complete = _read_start(path, max_bytes)
+    return _header_from_start(data, complete, encoding, delimiter)
+
+
+def _read_start(path: FilePath, max_bytes: int) -> Tuple[bytes, bool]:
+    """Read up to `max_bytes` from the start of a file, and whether that's the whole file"""
+    if max_bytes < 1:
+        raise ValueError(f"max_bytes must be at least 1, got {max_bytes}")
+    with open(path, "rb") as f:
+        # Read one more byte than we need so we know if we got the whole file
+        data = f.read(max_bytes + 1)
+    return data[:max_bytes], len(data) <= max_bytes
+
+
+def _header_from_start(
+    data: bytes, complete: bool, encoding: Optional[str], delimiter: Optional[str]
+) -> List[str]:
+    """Parse the header from the start of a file read by `_read_start`"""
+    header = _parse_header(data, complete, encoding, delimiter)
+    if header is None:
+        raise ValueError("The header is longer than the number of bytes read")
+    return header
+
+
+@dataclass(frozen=True)
+class FileReport:
+    """
+    The result of scanning one file: the column names in its header and the best matching schema, or the error raised
+
+    `error` is set if the file couldn't be read, or if the best match was ambiguous (AmbigiousMatch, AmbigiousColumns
+    or AmbigiousColumn).
+    """
+
+    path: FilePath
+    header: Optional[Tuple[str, ...]] = None
+    match: Optional[SchemaMatch] = None
+    error: Optional[Exception] = None
+
+    @property
+    def status(self) -> Status:
+        """Whether the file "matched", had "no match", was "ambiguous", or couldn't be read ("error")"""
+        if self.match is not None:
+            return "matched"
+        if isinstance(self.error, _AMBIGUOUS_EXCEPTIONS):
+            return "ambiguous"
+        if self.error is not None:
+            return "error"
+        return "no match"
+
+
+def _scan_file(
+    schema_set: SchemaSet,
+    path: FilePath,
+    max_bytes: int,
+    encoding: Optional[str],
+    delimiter: Optional[str],
+) -> FileReport:
+    try:
+        header = tuple(read_header(path, max_bytes, encoding, delimiter))
+    except (OSError, ValueError, csv.Error) as e:
+        return FileReport(path, error=e)
+    try:
+        match = schema_set.find_best_matching_schema(set(header))
+    except Exception as e:
+        return FileReport(path, header, error=e)
+    return FileReport(path, header, match)
+
+
+def scan_files(
+    schemas: Union[Set[Schema], SchemaSet],
+    paths: Iterable[FilePath],
+    max_workers: Optional[int] = None,
+    max_bytes: int = 64 * 1024,
+    encoding: Optional[str] = None,
+    delimiter: Optional[str] = None,
+) -> List[FileReport]:
+    """
+    Find the best matching schema for each of many CSV files and .xlsx workbooks, reading only their headers
+
+    The headers are read with `read_header` and matched using a thread pool with `max_workers` threads. Reading headers
+    is mostly waiting on the disk, so threads help even though matching itself holds the GIL.
+
+    Returns one FileReport per path, in the same order. Errors reading a file or matching its header are captured in
+    the report instead of stopping the scan.
+
+    ```python
+    for report in scan_files(schemas, Path("./example").glob("*.csv")):
+        print(report.path, report.status)
+    ```
+    """
+    schema_set = schemas if isinstance(schemas, SchemaSet) else SchemaSet(schemas)
+    with ThreadPoolExecutor(max_workers) as executor:
+        return list(
+            executor.map(
+                lambda path: _scan_file(
+                    schema_set, path, max_bytes, encoding, delimiter
+                ),
+                paths,
+            )
+        )
@@ -1,27 +1,134 @@
-from collections import defaultdict
-from dataclasses import dataclass, field, InitVar
-from typing import FrozenSet, Set
+from dataclasses import FrozenInstanceError, dataclass, field, InitVar
+from functools import partial
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
 
 from frozendict import frozendict  # type: ignore[attr-defined]
 
-from .column import ColumnDefinition
+from . import profiling
+from .column import AmbigiousColumn, ColumnDefinition
 
 
-@dataclass(frozen=True)
-class SchemaMatch:
+class _CompactMatch:
+    """
+    Matching columns which are kept as a map from column name to an index into a tuple of columns, and only turned into
+    a frozendict the first time `matching_columns` is used
+
+    Subclasses are frozen dataclasses with a `matching_columns` field, so `dataclasses.replace`, `asdict` and `fields`
+    work on them, but they define their own `__init__`, `__eq__`, `__hash__`, `__repr__` and pickling so the field is
+    only built when it's needed. They're compared, hashed and pickled by their `matching_columns`.
+    """
+
+    __slots__ = ("_columns", "_column_indexes", "_matching_columns", "_count")
+
+    _columns: Tuple[ColumnDefinition, ...]
+    _column_indexes: Optional[Dict[str, int]]
+    _matching_columns: Optional[frozendict[str, ColumnDefinition]]
+    # The number of matching columns, which ranking matches uses without building `matching_columns`
+    _count: int
+
+    def _init_matching_columns(
+        self, matching_columns: frozendict[str, ColumnDefinition]
+    ) -> None:
+        object.__setattr__(self, "_columns", ())
+        object.__setattr__(self, "_column_indexes", None)
+        object.__setattr__(self, "_matching_columns", matching_columns)
+        object.__setattr__(self, "_count", len(matching_columns))
+
+    def _init_column_indexes(
+        self, columns: Tuple[ColumnDefinition, ...], column_indexes: Dict[str, int]
+    ) -> None:
+        object.__setattr__(self, "_columns", columns)
+        object.__setattr__(self, "_column_indexes", column_indexes)
+        object.__setattr__(self, "_matching_columns", None)
+        object.__setattr__(self, "_count", len(column_indexes))
+
+    @property
+    def matching_columns(self) -> frozendict[str, ColumnDefinition]:
+        matching_columns = self._matching_columns
+        if matching_columns is None:
+            assert self._column_indexes is not None
+            columns = self._columns
+            matching_columns = frozendict(
+                {
+                    column_name: columns[index]
+                    for column_name, index in self._column_indexes.items()
+                }
+            )
+            object.__setattr__(self, "_matching_columns", matching_columns)
+        return matching_columns
+
+    def _same_matching_columns(self, other: "_CompactMatch") -> bool:
+        if (
+            self._column_indexes is not None
+            and other._column_indexes is not None
+            and self._columns is other._columns
+        ):
+            # Indexes into the same columns, so we don't need to build either frozendict
+            return self._column_indexes == other._column_indexes
+        return self.matching_columns == other.matching_columns
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+
+@dataclass(frozen=True, init=False, repr=False, eq=False)
+class SchemaMatch(_CompactMatch):
+    """Whether a schema matches a set of column names, and the column definition matching each column name"""
+
+    __slots__ = ("matches",)
+
     matches: bool
-    matching_columns: frozendict[str, ColumnDefinition]
+    # Built by `_CompactMatch.matching_columns` the first time it's used
+    matching_columns: frozendict[str, ColumnDefinition] = field()
+
+    def __init__(
+        self, matches: bool, matching_columns: frozendict[str, ColumnDefinition]
+    ):
+        object.__setattr__(self, "matches", matches)
+        self._init_matching_columns(matching_columns)
+
+    @classmethod
+    def _from_column_indexes(
+        cls, columns: Tuple[ColumnDefinition, ...], column_indexes: Dict[str, int]
+    ) -> "SchemaMatch":
+        """Create a match of the columns with the given indexes in `columns`, without building `matching_columns`"""
+        match = cls.__new__(cls)
+        object.__setattr__(match, "matches", True)
+        match._init_column_indexes(columns, column_indexes)
+        return match
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not SchemaMatch:
+            return NotImplemented
+        return self.matches == other.matches and self._same_matching_columns(other)
+
+    def __hash__(self) -> int:
+        return hash((self.matches, self.matching_columns))
+
+    def __repr__(self) -> str:
+        return f"SchemaMatch(matches={self.matches!r}, matching_columns={self.matching_columns!r})"
+
+    def __reduce__(self) -> Any:
+        return (SchemaMatch, (self.matches, self.matching_columns))
 
 
 class AmbigiousColumns(Exception):
     """Raised if more than one Column definition matches the same column in a Schema"""
 
     def __init__(self, schema: "Schema", column_name: str, column_matches: Set[ColumnDefinition]):
+        super().__init__(schema, column_name, column_matches)
         self.schema = schema
         self.column_name = column_name
         self.column_matches = column_matches
 
 
+# Shared result for schemas that don't match, so rejecting a schema doesn't allocate anything
+_NO_MATCH = SchemaMatch(False, frozendict())
+
+
 @dataclass(frozen=True)
 class Schema:
     """The schema of a spreadsheet, with a set of columns and a name to identify the schema to humans"""
@@ -29,49 +136,124 @@ class Schema:
     columns: FrozenSet[ColumnDefinition] = field(init=False)
     columns_init: InitVar[Set[ColumnDefinition]]
     name: str
+    _required_columns: Tuple[ColumnDefinition, ...] = field(
+        init=False, repr=False, compare=False
+    )
+    _optional_columns: Tuple[ColumnDefinition, ...] = field(
+        init=False, repr=False, compare=False
+    )
+    # The required columns followed by the optional columns, which matches refer to by index
+    _columns: Tuple[ColumnDefinition, ...] = field(
+        init=False, repr=False, compare=False
+    )
 
     def __post_init__(self, columns_init: Set[ColumnDefinition]) -> None:
         # Accept a Set[Column] argument and transparently turn it into a FrozenSet[Column] argument to make this class
         # hashable
         object.__setattr__(self, "columns", frozenset(columns_init))
+        # Split required and optional columns up front so matching can check the required columns first
+        object.__setattr__(
+            self,
+            "_required_columns",
+            tuple(column for column in self.columns if column.required),
+        )
+        object.__setattr__(
+            self,
+            "_optional_columns",
+            tuple(column for column in self.columns if not column.required),
+        )
+        object.__setattr__(
+            self, "_columns", self._required_columns + self._optional_columns
+        )
 
     def match_columns(self, columns: Set[str]) -> SchemaMatch:
         """
         Check if this schema matches the given set of column names and return the list of matching columns
 
+        Required columns are checked first, and if any of them is missing this returns a non-match with no matching
+        columns without looking at the rest of the columns. This means ambiguities are only reported for schemas where
+        every required column is present.
+
         Raises AmbigiousColumns if multiple Schema Column definitions match a single column name.
         """
+        matching_column: Callable[[ColumnDefinition], Optional[str]] = (
+            lambda schema_column: schema_column.matching_column(columns)
+        )
+        profile = profiling._active
+        if profile is not None:
+            matching_column = partial(profile._record_column, matching_column)
+        return self._match_columns(matching_column)
+
+    def _match_columns(
+        self, matching_column: Callable[[ColumnDefinition], Optional[str]]
+    ) -> SchemaMatch:
+        """
+        Like `match_columns`, but using `matching_column` to find the column name matching each column definition
+
+        This lets callers matching many schemas against the same columns find column names in a smarter way than
+        calling `ColumnDefinition.matching_column` on every column of every schema.
+        """
+        profile = profiling._active
+        if profile is not None:
+            return profile._record_schema(
+                self, partial(self._find_matching_columns, matching_column)
+            )
+        return self._find_matching_columns(matching_column)
+
+    def _find_matching_columns(
+        self, matching_column: Callable[[ColumnDefinition], Optional[str]]
+    ) -> SchemaMatch:
+        """The implementation of `_match_columns`, which is wrapped to record a profile when profiling is turned on"""
         # This function combines "does this match" and "what is the match" logic for performance reasons, because
         # we don't want to run our set of regexes multiple times
+        # Map each matching column name to the index of the column definition it matches in `_columns`, starting with
+        # the required columns so we can stop as soon as one of them is missing
+        column_indexes: Dict[str, int] = {}
+        # The (column name, index) of column definitions matching a column name another definition already matched,
+        # which is only allocated if there are any
+        duplicates: Optional[List[Tuple[str, int]]] = None
+        ambigious_column = None
+        for index, schema_column in enumerate(self._required_columns):
+            try:
+                column_name = matching_column(schema_column)
+            except AmbigiousColumn as e:
+                # The column is there, it's just ambiguous, so only report it if the rest of the schema matches
+                if ambigious_column is None:
+                    ambigious_column = e
+                continue
+            if column_name is None:
+                return _NO_MATCH
+            if column_indexes.setdefault(column_name, index) != index:
+                if duplicates is None:
+                    duplicates = []
+                duplicates.append((column_name, index))
+        if ambigious_column is not None:
+            raise ambigious_column
+        for index, schema_column in enumerate(
+            self._optional_columns, len(self._required_columns)
+        ):
+            column_name = matching_column(schema_column)
+            if column_name is None:
+                continue
+            if column_indexes.setdefault(column_name, index) != index:
+                if duplicates is None:
+                    duplicates = []
+                duplicates.append((column_name, index))
 
-        # Get a mapping from schema columns to column names
-        schema_column_to_column_name = {
-            schema_column: schema_column.matching_column(columns)
-            for schema_column in self.columns
-        }
-
-        # Reverse the mapping into a multimap of column names to schema mappings
-        column_name_to_schema_columns = defaultdict(set)
-        for schema_column, column_name in schema_column_to_column_name.items():
-            if column_name is not None:
-                column_name_to_schema_columns[column_name].add(schema_column)
-
-        # Find cases where a single column matches multiple column definitions
-        for column_name, column_matches in column_name_to_schema_columns.items():
-            if len(column_matches) > 1:
-                raise AmbigiousColumns(self, column_name, column_matches)
-
-        # Turn the multimap into a normal map now that we've validated that every
-        # column name only appears once
-        column_name_to_schema_column = {
-            column_name: schema_column
-            for column_name, [schema_column] in column_name_to_schema_columns.items()
-        }
-
-        # The schema matches if every required column found a matching column name
-        matches = all(
-            not schema_column.required
-            or schema_column_to_column_name[schema_column] is not None
-            for schema_column in self.columns
-        )
-        return SchemaMatch(matches, frozendict(column_name_to_schema_column))
+        # Find cases where a single column matches multiple column definitions, reporting the column name which was
+        # matched first
+        if duplicates is not None:
+            column_name = min(
+                (column_name for column_name, _ in duplicates),
+                key=column_indexes.__getitem__,
+            )
+            column_matches = {self._columns[column_indexes[column_name]]}
+            column_matches.update(
+                self._columns[index]
+                for duplicate_name, index in duplicates
+                if duplicate_name == column_name
+            )
+            raise AmbigiousColumns(self, column_name, column_matches)
+
+        # Every required column found a matching column name, so the schema matches
+        return SchemaMatch._from_column_indexes(self._columns, column_indexes)
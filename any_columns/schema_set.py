@@ -0,0 +1,316 @@
+from collections import defaultdict
+from typing import (
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+import re
+
+from frozendict import frozendict  # type: ignore[attr-defined]
+
+from . import profiling
+from .column import AmbigiousColumn, ColumnDefinition, MemoizedColumnMatcher
+from .fuzzy_column import FuzzyColumn, FuzzyColumnIndex
+from .matching import SchemaMatch, _best_match, _branch_and_bound
+from .normalized_column import Normalization, NormalizedColumn
+from .regex_column import RegexColumn
+from .regex_scanner import RegexScanner
+from .schema import Schema
+from .string_column import StringColumn
+
+
+class SchemaSet:
+    """
+    A set of schemas compiled for repeated matching
+
+    Building a SchemaSet indexes every StringColumn pattern to the schemas that use it, so matching a set of column
+    names only has to look at the schemas where every required StringColumn is present instead of every schema.
+    NormalizedColumns are indexed the same way by their normalized pattern, so each column name only has to be
+    normalized once per normalization. The patterns of FuzzyColumns are put in a BK-tree per normalization, so finding
+    the column names close to any of them doesn't need to compare every column name to every pattern. The patterns of
+    every RegexColumn are merged into a `RegexScanner`, so each column name is scanned once for all of them instead of
+    once per RegexColumn per schema. Other kinds of ColumnDefinition are evaluated once per distinct definition, the
+    same way as `find_best_matching_schemas` does.
+
+    The results are the same as the functions in `any_columns.matching` with the same set of schemas.
+    """
+
+    def __init__(self, schemas: Iterable[Schema]):
+        # Keep the iteration order of the schemas we were given so ties are ordered the same as they would be by
+        # `find_best_matching_schemas`
+        self.schemas: Sequence[Schema] = tuple(dict.fromkeys(schemas))
+
+        string_index: Dict[str, List[Tuple[int, StringColumn]]] = defaultdict(list)
+        normalized_index: Dict[
+            Normalization, Dict[str, List[Tuple[int, NormalizedColumn]]]
+        ] = defaultdict(lambda: defaultdict(list))
+        fuzzy_index: Dict[Normalization, FuzzyColumnIndex] = {}
+        # Number of required StringColumns, NormalizedColumns and FuzzyColumns in each schema. A schema can only match
+        # if all of them are found in the indexes.
+        self._required_index_counts: List[int] = []
+        unconditional: List[int] = []
+        # Whether each schema can be matched from the index alone, without calling `Schema._match_columns`
+        self._indexed: List[bool] = []
+
+        regex_patterns = []
+        for schema_index, schema in enumerate(self.schemas):
+            required_count = 0
+            for column in schema.columns:
+                if isinstance(column, StringColumn):
+                    string_index[column.pattern].append((schema_index, column))
+                    if column.required:
+                        required_count += 1
+                elif isinstance(column, NormalizedColumn):
+                    normalized_index[column.normalization][
+                        column.normalized_pattern
+                    ].append((schema_index, column))
+                    if column.required:
+                        required_count += 1
+                elif isinstance(column, FuzzyColumn):
+                    if column.normalization not in fuzzy_index:
+                        fuzzy_index[column.normalization] = FuzzyColumnIndex(
+                            column.normalization
+                        )
+                    fuzzy_index[column.normalization].add(schema_index, column)
+                    if column.required:
+                        required_count += 1
+                elif self._is_scannable(column):
+                    assert isinstance(column, RegexColumn)
+                    regex_patterns.append(column.pattern)
+            self._required_index_counts.append(required_count)
+            if required_count == 0:
+                unconditional.append(schema_index)
+            self._indexed.append(self._is_indexable(schema))
+
+        # Map from StringColumn pattern to the (schema index, column) pairs using that pattern. This is a plain dict so
+        # lookups of unknown column names don't add entries to the index.
+        self._string_index: Dict[str, Collection[Tuple[int, StringColumn]]] = dict(
+            string_index
+        )
+        # Map from normalization to normalized pattern to the (schema index, column) pairs using that pattern
+        self._normalized_index: Dict[
+            Normalization, Dict[str, Collection[Tuple[int, NormalizedColumn]]]
+        ] = {
+            normalization: dict(patterns)
+            for normalization, patterns in normalized_index.items()
+        }
+        self._fuzzy_index = fuzzy_index
+        # Schemas with no required StringColumns, NormalizedColumns or FuzzyColumns, which we need to check for every
+        # set of column names
+        self._unconditional: Collection[int] = unconditional
+        self._regex_scanner = RegexScanner(regex_patterns)
+
+    @staticmethod
+    def _is_indexable(schema: Schema) -> bool:
+        """
+        Check if a schema can be matched using only the string index
+
+        This is the case if every column is a StringColumn and no two columns have the same pattern, since those can
+        never raise AmbigiousColumn or AmbigiousColumns.
+        """
+        patterns = set()
+        for column in schema.columns:
+            if not isinstance(column, StringColumn) or column.pattern in patterns:
+                return False
+            patterns.add(column.pattern)
+        return True
+
+    @staticmethod
+    def _is_scannable(column: ColumnDefinition) -> bool:
+        """Check if a column is a RegexColumn which can be matched using our RegexScanner"""
+        return isinstance(column, RegexColumn) and not isinstance(column.pattern, str)
+
+    def __len__(self) -> int:
+        return len(self.schemas)
+
+    def __iter__(self) -> Iterator[Schema]:
+        return iter(self.schemas)
+
+    def __contains__(self, schema: object) -> bool:
+        return schema in self.schemas
+
+    def _candidates(
+        self, columns: Set[str]
+    ) -> Tuple[List[Tuple[int, int]], Callable[[int], Optional[SchemaMatch]]]:
+        """
+        Find the schemas which could match the given set of columns
+
+        Returns the (upper bound on number of matching columns, schema index) for each candidate schema in schema
+        order, and a function to get the match for a candidate schema index, or None if it doesn't match.
+        """
+        matching_columns: Dict[int, Dict[str, StringColumn]] = defaultdict(dict)
+        required_hits: Dict[int, int] = defaultdict(int)
+        for column_name in columns:
+            for schema_index, schema_column in self._string_index.get(column_name, ()):
+                matching_columns[schema_index][column_name] = schema_column
+                if schema_column.required:
+                    required_hits[schema_index] += 1
+
+        # The column names which normalize to each normalized pattern, for each normalization
+        normalized_columns: Dict[Normalization, Dict[str, Set[str]]] = {}
+        for normalization, normalized_index in self._normalized_index.items():
+            column_names: Dict[str, Set[str]] = defaultdict(set)
+            for column_name in columns:
+                column_names[normalization.normalize(column_name)].add(column_name)
+            normalized_columns[normalization] = column_names
+            for normalized in column_names:
+                for schema_index, normalized_column in normalized_index.get(
+                    normalized, ()
+                ):
+                    if normalized_column.required:
+                        required_hits[schema_index] += 1
+
+        # The column names close enough to each fuzzy pattern to match at least one column, for each normalization
+        fuzzy_columns: Dict[Normalization, Dict[str, Dict[str, int]]] = {}
+        for normalization, fuzzy_index in self._fuzzy_index.items():
+            found = fuzzy_index.search(columns)
+            fuzzy_columns[normalization] = found
+            for pattern in found:
+                for schema_index, fuzzy_column in fuzzy_index.entries[pattern]:
+                    if fuzzy_column.required and fuzzy_index.matching_columns(
+                        found, fuzzy_column
+                    ):
+                        required_hits[schema_index] += 1
+
+        # Schemas missing any of their required StringColumns, NormalizedColumns or FuzzyColumns can't match, so we
+        # don't need to look at them at all
+        candidate_indexes = [
+            schema_index
+            for schema_index, hits in required_hits.items()
+            if hits == self._required_index_counts[schema_index]
+        ]
+        candidate_indexes.extend(self._unconditional)
+        candidate_indexes.sort()
+
+        profile = profiling._active
+        if profile is not None:
+            rejected = (matching_columns.keys() | required_hits.keys()) - set(
+                candidate_indexes
+            )
+            for schema_index in rejected:
+                profile._record_rejected(self.schemas[schema_index])
+
+        # Only scan for regexes if we end up evaluating a schema with a RegexColumn
+        regex_matches: Optional[Dict[re.Pattern, Set[str]]] = None
+
+        def find_matching_column(schema_column: ColumnDefinition) -> Optional[str]:
+            nonlocal regex_matches
+            if isinstance(schema_column, NormalizedColumn):
+                # Same as `NormalizedColumn.matching_column`, but using the column names we already normalized
+                normalized_names = normalized_columns[schema_column.normalization].get(
+                    schema_column.normalized_pattern, set()
+                )
+                if len(normalized_names) > 1:
+                    raise AmbigiousColumn(schema_column, set(normalized_names))
+                for column_name in normalized_names:
+                    return column_name
+                return None
+            if isinstance(schema_column, FuzzyColumn):
+                # Same as `FuzzyColumn.matching_column`, but using the column names we already found in the index
+                fuzzy_names = FuzzyColumnIndex.matching_columns(
+                    fuzzy_columns[schema_column.normalization], schema_column
+                )
+                if len(fuzzy_names) > 1:
+                    raise AmbigiousColumn(schema_column, fuzzy_names)
+                for column_name in fuzzy_names:
+                    return column_name
+                return None
+            if not self._is_scannable(schema_column):
+                return schema_column.matching_column(columns)
+            assert isinstance(schema_column, RegexColumn)
+            if regex_matches is None:
+                regex_matches = self._regex_scanner.search_all(columns)
+            # Same as `RegexColumn.matching_column`, but using the column names we already found with the scanner
+            column_names = regex_matches.get(schema_column.pattern, set())
+            if len(column_names) > 1:
+                raise AmbigiousColumn(schema_column, set(column_names))
+            for column_name in column_names:
+                return column_name
+            return None
+
+        matching_column = MemoizedColumnMatcher(columns, find_matching_column)
+
+        def evaluate(schema_index: int) -> Optional[SchemaMatch]:
+            schema = self.schemas[schema_index]
+            if self._indexed[schema_index]:
+                # Every required column was found in the index, and there's nothing which could be ambiguous
+                if profile is not None:
+                    profile._record_matched(schema)
+                return SchemaMatch(
+                    schema, frozendict(matching_columns.get(schema_index, {}))
+                )
+            schema_match = schema._match_columns(matching_column)
+            if not schema_match.matches:
+                return None
+            return SchemaMatch._from_schema_match(schema, schema_match)
+
+        candidates = [
+            (
+                # We already know exactly how many columns indexed schemas match
+                (
+                    len(matching_columns.get(schema_index, ()))
+                    if self._indexed[schema_index]
+                    else len(self.schemas[schema_index].columns)
+                ),
+                schema_index,
+            )
+            for schema_index in candidate_indexes
+        ]
+        return candidates, evaluate
+
+    def find_best_matching_schemas(self, columns: Set[str]) -> List[SchemaMatch]:
+        """
+        Find all schemas in this set that match the given set of columns and return them ordered by best match
+
+        See `any_columns.find_best_matching_schemas`
+        """
+        candidates, evaluate = self._candidates(columns)
+        matches = []
+        for _, schema_index in candidates:
+            match = evaluate(schema_index)
+            if match is not None:
+                matches.append(match)
+        matches.sort(key=lambda match: match._count, reverse=True)
+        return matches
+
+    def find_matching_schemas(self, columns: Set[str]) -> Set[Schema]:
+        """
+        Find all schemas in this set that match the given set of columns
+
+        See `any_columns.find_matching_schemas`
+        """
+        return {match.schema for match in self.find_best_matching_schemas(columns)}
+
+    def find_best_matching_schema(self, columns: Set[str]) -> Optional[SchemaMatch]:
+        """
+        Find the one schema in this set that best matches the given set of columns
+
+        See `any_columns.find_best_matching_schema`
+        """
+        candidates, evaluate = self._candidates(columns)
+        return _best_match(_branch_and_bound(_by_upper_bound(candidates), evaluate))
+
+    def find_top_k_matching_schemas(
+        self, columns: Set[str], k: int
+    ) -> List[SchemaMatch]:
+        """
+        Find the k schemas in this set that best match the given set of columns, ordered by best match
+
+        See `any_columns.find_top_k_matching_schemas`
+        """
+        if k < 0:
+            raise ValueError(f"k must not be negative, got {k}")
+        candidates, evaluate = self._candidates(columns)
+        return _branch_and_bound(_by_upper_bound(candidates), evaluate, k)
+
+
+def _by_upper_bound(candidates: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Sort candidates in schema order by descending upper bound, keeping schema order for equal upper bounds"""
+    return sorted(candidates, key=lambda candidate: candidate[0], reverse=True)
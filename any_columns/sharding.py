@@ -0,0 +1,305 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+import os
+
+from frozendict import frozendict  # type: ignore[attr-defined]
+
+from .batch import BatchResult
+from .catalog import CatalogSchemaSet, dumps_catalog, loads_catalog
+from .column import ColumnDefinition
+from .matching import SchemaMatch, _best_match
+from .schema import Schema
+from .schema_set import SchemaSet, _by_upper_bound
+
+# The (schema index, matching columns) of each match a shard found, and if matching stopped because a schema raised an
+# exception, the (upper bound, schema index, exception) of that schema
+_ShardBest = Tuple[List[Tuple[int, frozendict]], Optional[Tuple[int, int, Exception]]]
+# The (schema index, matching columns) of every match a shard found, and the (schema index, exception) of the first
+# schema which raised an exception, if any
+_ShardMatches = Tuple[List[Tuple[int, frozendict]], Optional[Tuple[int, Exception]]]
+
+# The shard of the catalog each worker process matches against
+_worker_shard: Optional[CatalogSchemaSet] = None
+
+
+def _init_shard(name: str, start: int, end: int) -> None:
+    global _worker_shard
+    memory = shared_memory.SharedMemory(name)
+    assert memory.buf is not None
+    try:
+        with memory.buf[start:end] as buffer:
+            _worker_shard = loads_catalog(buffer)
+    finally:
+        # Everything we need was copied out of the shared memory while loading, so we don't need to keep it open
+        memory.close()
+
+
+def _shard_ready() -> None:
+    pass
+
+
+def _shard_best(chunk: List[FrozenSet[str]]) -> List[_ShardBest]:
+    """
+    Find the matches tied for the most matching columns in this worker's shard, for each set of column names
+
+    This is the same as `_branch_and_bound`, except an exception from a schema stops matching and is returned along
+    with where it happened, since whether it would have been raised depends on the matches in the other shards.
+    """
+    assert _worker_shard is not None
+    results: List[_ShardBest] = []
+    for columns in chunk:
+        candidates, evaluate = _worker_shard._candidates(set(columns))
+        best_count = -1
+        best: List[Tuple[int, frozendict]] = []
+        error: Optional[Tuple[int, int, Exception]] = None
+        for upper_bound, schema_index in _by_upper_bound(candidates):
+            if upper_bound < best_count:
+                break
+            try:
+                match = evaluate(schema_index)
+            except Exception as e:
+                error = (upper_bound, schema_index, e)
+                break
+            if match is None:
+                continue
+            count = len(match.matching_columns)
+            if count > best_count:
+                best_count = count
+                best = []
+            if count == best_count:
+                best.append((schema_index, match.matching_columns))
+        results.append((best, error))
+    return results
+
+
+def _shard_matches(chunk: List[FrozenSet[str]]) -> List[_ShardMatches]:
+    """Find every match in this worker's shard for each set of column names, stopping at the first exception"""
+    assert _worker_shard is not None
+    results: List[_ShardMatches] = []
+    for columns in chunk:
+        candidates, evaluate = _worker_shard._candidates(set(columns))
+        matches: List[Tuple[int, frozendict]] = []
+        error: Optional[Tuple[int, Exception]] = None
+        for _, schema_index in candidates:
+            try:
+                match = evaluate(schema_index)
+            except Exception as e:
+                error = (schema_index, e)
+                break
+            if match is not None:
+                matches.append((schema_index, match.matching_columns))
+        results.append((matches, error))
+    return results
+
+
+class ShardedMatcher:
+    """
+    Matches column names against schemas split into shards, each matched in its own worker process
+
+    The schemas are split round-robin into `shards` shards, and each shard is compiled into a catalog (see
+    `dumps_catalog`). The catalogs are written once into a block of shared memory, and each worker process loads its
+    shard straight from there when it starts, instead of every worker being sent a pickled copy of the schemas. The
+    shared memory is freed as soon as every worker has loaded its shard.
+
+    Each set of column names is matched by every shard in parallel, and the results are merged so they're the same as
+    a SchemaSet of all of the schemas, including ties, the order of `find_best_matching_schemas`, and which
+    AmbigiousColumn is raised. The matches contain the original schemas, and the original column objects (though an
+    equal column of another schema can stand in for a schema's own). Only StringColumn, RegexColumn,
+    NormalizedColumn and FuzzyColumn can be saved in a catalog, so TypeError is raised for other kinds of columns.
+
+    Matching one set of column names has to wait for every shard, so this is meant for large catalogs and batches of
+    headers (see `match_headers`), where the work in each shard is worth the round trip to the worker processes.
+
+    ```python
+    with ShardedMatcher(schemas, shards=8) as matcher:
+        results = matcher.match_headers(headers)
+    ```
+    """
+
+    def __init__(
+        self, schemas: Union[Set[Schema], SchemaSet], shards: Optional[int] = None
+    ):
+        self.schemas: Sequence[Schema] = (
+            schemas.schemas
+            if isinstance(schemas, SchemaSet)
+            else tuple(dict.fromkeys(schemas))
+        )
+        if shards is None:
+            shards = os.cpu_count() or 1
+        if shards < 1:
+            raise ValueError(f"shards must be at least 1, got {shards}")
+        self.shards = max(1, min(shards, len(self.schemas)))
+        # Matches from the workers contain copies of the columns, so map them back to the original columns
+        self._columns: Dict[ColumnDefinition, ColumnDefinition] = {
+            column: column for schema in self.schemas for column in schema.columns
+        }
+
+        # Shard i has schemas i, i + shards, i + 2 * shards, ..., which keeps the schemas in each shard in order
+        catalogs = [
+            dumps_catalog(self.schemas[shard :: self.shards])
+            for shard in range(self.shards)
+        ]
+        memory = shared_memory.SharedMemory(
+            create=True, size=max(1, sum(len(catalog) for catalog in catalogs))
+        )
+        assert memory.buf is not None
+        self._executors: List[ProcessPoolExecutor] = []
+        try:
+            start = 0
+            for catalog in catalogs:
+                end = start + len(catalog)
+                memory.buf[start:end] = catalog
+                self._executors.append(
+                    ProcessPoolExecutor(
+                        1, initializer=_init_shard, initargs=(memory.name, start, end)
+                    )
+                )
+                start = end
+            # Wait for every worker to load its shard, so we can free the shared memory
+            for future in [
+                executor.submit(_shard_ready) for executor in self._executors
+            ]:
+                future.result()
+        except BaseException:
+            self.close()
+            raise
+        finally:
+            memory.close()
+            memory.unlink()
+
+    def _match(self, schema_index: int, matching_columns: frozendict) -> SchemaMatch:
+        return SchemaMatch(
+            self.schemas[schema_index],
+            frozendict(
+                {
+                    column_name: self._columns[column]
+                    for column_name, column in matching_columns.items()
+                }
+            ),
+        )
+
+    def _submit(self, function: Any, chunk: List[FrozenSet[str]]) -> List[Future]:
+        return [executor.submit(function, chunk) for executor in self._executors]
+
+    def _merge_best(self, shard_results: List[_ShardBest]) -> Optional[SchemaMatch]:
+        ties: List[Tuple[int, int, frozendict]] = []
+        errors: List[Tuple[int, int, Exception]] = []
+        for shard, (shard_ties, error) in enumerate(shard_results):
+            for schema_index, matching_columns in shard_ties:
+                ties.append(
+                    (
+                        len(matching_columns),
+                        schema_index * self.shards + shard,
+                        matching_columns,
+                    )
+                )
+            if error is not None:
+                upper_bound, schema_index, e = error
+                errors.append((upper_bound, schema_index * self.shards + shard, e))
+
+        best_count = max((count for count, _, _ in ties), default=-1)
+        if errors:
+            # The schema which raised the first exception in branch and bound order would only have been evaluated if
+            # no schema before it matched more columns than it could. Any such schema has a higher upper bound, so the
+            # shards would have found it before stopping.
+            upper_bound, _, first_error = min(
+                errors, key=lambda error: (-error[0], error[1])
+            )
+            if best_count <= upper_bound:
+                raise first_error
+        best = sorted(
+            (schema_index, matching_columns)
+            for count, schema_index, matching_columns in ties
+            if count == best_count
+        )
+        return _best_match(
+            [
+                self._match(schema_index, matching_columns)
+                for schema_index, matching_columns in best
+            ]
+        )
+
+    def _merge_matches(self, shard_results: List[_ShardMatches]) -> List[SchemaMatch]:
+        matches: List[Tuple[int, frozendict]] = []
+        errors: List[Tuple[int, Exception]] = []
+        for shard, (shard_matches, error) in enumerate(shard_results):
+            for schema_index, matching_columns in shard_matches:
+                matches.append((schema_index * self.shards + shard, matching_columns))
+            if error is not None:
+                schema_index, e = error
+                errors.append((schema_index * self.shards + shard, e))
+        if errors:
+            # SchemaSet evaluates schemas in order, so it raises the exception from the first one
+            raise min(errors, key=lambda error: error[0])[1]
+        matches.sort(key=lambda match: (-len(match[1]), match[0]))
+        return [
+            self._match(schema_index, matching_columns)
+            for schema_index, matching_columns in matches
+        ]
+
+    def find_best_matching_schema(self, columns: Set[str]) -> Optional[SchemaMatch]:
+        """See `SchemaSet.find_best_matching_schema`"""
+        futures = self._submit(_shard_best, [frozenset(columns)])
+        return self._merge_best([future.result()[0] for future in futures])
+
+    def find_best_matching_schemas(self, columns: Set[str]) -> List[SchemaMatch]:
+        """See `SchemaSet.find_best_matching_schemas`"""
+        futures = self._submit(_shard_matches, [frozenset(columns)])
+        return self._merge_matches([future.result()[0] for future in futures])
+
+    def find_matching_schemas(self, columns: Set[str]) -> Set[Schema]:
+        """See `SchemaSet.find_matching_schemas`"""
+        return {match.schema for match in self.find_best_matching_schemas(columns)}
+
+    def match_headers(
+        self, headers: Iterable[Set[str]], chunksize: int = 256
+    ) -> List[BatchResult]:
+        """
+        Find the best matching schema for each of many sets of column names
+
+        This is the same as `match_headers_batch`, except the schemas are split across the shards instead of the
+        headers being split across workers. Each distinct set of column names is only matched once, and they're sent to
+        the workers in chunks of `chunksize`. Exceptions are captured in `BatchResult.error`.
+        """
+        if chunksize < 1:
+            raise ValueError(f"chunksize must be at least 1, got {chunksize}")
+        keys = [frozenset(columns) for columns in headers]
+        unique = list(dict.fromkeys(keys))
+        chunks = [unique[i : i + chunksize] for i in range(0, len(unique), chunksize)]
+        # Queue every chunk up front so each shard always has work waiting
+        chunk_futures = [self._submit(_shard_best, chunk) for chunk in chunks]
+
+        results: Dict[FrozenSet[str], BatchResult] = {}
+        for chunk, futures in zip(chunks, chunk_futures):
+            shard_results = [future.result() for future in futures]
+            for i, columns in enumerate(chunk):
+                try:
+                    match = self._merge_best([result[i] for result in shard_results])
+                except Exception as e:
+                    results[columns] = BatchResult(columns, error=e)
+                else:
+                    results[columns] = BatchResult(columns, match)
+        return [results[columns] for columns in keys]
+
+    def close(self) -> None:
+        """Shut down the worker processes"""
+        for executor in self._executors:
+            executor.shutdown()
+
+    def __enter__(self) -> "ShardedMatcher":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
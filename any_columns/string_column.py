@@ -8,16 +8,17 @@ class StringColumn(ColumnDefinition):
     A single column in a spreadsheet identified by an exact string
     """
 
+    __slots__ = ("pattern",)
+
     def __init__(self, name: str, pattern: str, required: bool = True):
         super().__init__(name, required)
-        self.name = name
         self.pattern = pattern
 
     def _key(self) -> Any:
         return (self.name, self.pattern, self.required)
 
     def __hash__(self) -> int:
-        return hash(self._key())
+        return self._cached_hash()
 
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, StringColumn):
@@ -0,0 +1,170 @@
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+from xml.etree.ElementTree import Element, iterparse
+import os
+import posixpath
+import re
+import zipfile
+
+_WORKBOOK = "xl/workbook.xml"
+_WORKBOOK_RELS = "xl/_rels/workbook.xml.rels"
+_SHARED_STRINGS = "xl/sharedStrings.xml"
+
+_CELL_REFERENCE = re.compile(r"([A-Z]+)")
+
+
+def _local_name(element: Element) -> str:
+    """Get an element's tag without its namespace, since strict and transitional OOXML use different namespaces"""
+    return element.tag.rpartition("}")[2]
+
+
+def _attribute(element: Element, name: str) -> Optional[str]:
+    """Get an attribute by its local name, ignoring its namespace"""
+    for key, value in element.attrib.items():
+        if key.rpartition("}")[2] == name:
+            return value
+    return None
+
+
+def _iter_elements(archive: zipfile.ZipFile, name: str) -> Iterator[Element]:
+    """
+    Iterate over the elements of an XML part of the workbook as they end
+
+    Elements which have already been yielded are removed from the tree, so memory use doesn't grow with the size of
+    the part. Callers need to read an element's children when it's yielded, and can stop iterating at any time.
+    """
+    with archive.open(name) as f:
+        root: Optional[Element] = None
+        for event, element in iterparse(f, events=("start", "end")):
+            if root is None:
+                root = element
+            if event == "end":
+                yield element
+                if element is not root:
+                    root.clear()
+
+
+def _string_text(element: Element) -> str:
+    """Get the text of a shared string or inline string, leaving out phonetic runs"""
+    parts = []
+    for child in element:
+        name = _local_name(child)
+        if name == "t":
+            parts.append(child.text or "")
+        elif name == "r":
+            parts.extend(t.text or "" for t in child if _local_name(t) == "t")
+    return "".join(parts)
+
+
+def _column_index(reference: str) -> int:
+    """Convert a cell reference like "AB1" to a zero-based column index"""
+    match = _CELL_REFERENCE.match(reference)
+    if match is None:
+        raise ValueError(f"Invalid cell reference {reference!r}")
+    index = 0
+    for letter in match.group(1):
+        index = index * 26 + ord(letter) - ord("A") + 1
+    return index - 1
+
+
+def _sheet_path(archive: zipfile.ZipFile, sheet: Union[int, str]) -> str:
+    """Find the path of a sheet in the archive by its index or name"""
+    sheets: List[Tuple[str, str]] = []
+    for element in _iter_elements(archive, _WORKBOOK):
+        if _local_name(element) == "sheet":
+            sheets.append((element.get("name", ""), _attribute(element, "id") or ""))
+
+    try:
+        if isinstance(sheet, int):
+            relationship_id = sheets[sheet][1]
+        else:
+            relationship_id = dict(sheets)[sheet]
+    except (IndexError, KeyError):
+        raise ValueError(f"Workbook doesn't have sheet {sheet!r}")
+
+    for element in _iter_elements(archive, _WORKBOOK_RELS):
+        if (
+            _local_name(element) == "Relationship"
+            and element.get("Id") == relationship_id
+        ):
+            target = element.get("Target", "")
+            if target.startswith("/"):
+                return target[1:]
+            return posixpath.normpath(posixpath.join("xl", target))
+    raise ValueError(f"Workbook doesn't have a relationship for sheet {sheet!r}")
+
+
+def _first_row(archive: zipfile.ZipFile, path: str) -> List[Tuple[int, str, str]]:
+    """Get the (column index, type, value) of each cell in the first row of a sheet"""
+    for element in _iter_elements(archive, path):
+        if _local_name(element) != "row":
+            continue
+        cells = []
+        for position, cell in enumerate(element):
+            if _local_name(cell) != "c":
+                continue
+            reference = cell.get("r")
+            index = _column_index(reference) if reference is not None else position
+            cell_type = cell.get("t", "n")
+            value = ""
+            for child in cell:
+                name = _local_name(child)
+                if name == "v":
+                    value = child.text or ""
+                elif name == "is":
+                    value = _string_text(child)
+            cells.append((index, cell_type, value))
+        return cells
+    return []
+
+
+def _shared_strings(archive: zipfile.ZipFile, indexes: Set[int]) -> Dict[int, str]:
+    """Look up only the given shared strings, stopping as soon as we've seen all of them"""
+    strings: Dict[int, str] = {}
+    if not indexes or _SHARED_STRINGS not in archive.namelist():
+        return strings
+    last = max(indexes)
+    index = 0
+    for element in _iter_elements(archive, _SHARED_STRINGS):
+        if _local_name(element) != "si":
+            continue
+        if index in indexes:
+            strings[index] = _string_text(element)
+        if index == last:
+            break
+        index += 1
+    return strings
+
+
+def read_xlsx_header(
+    path: Union[str, "os.PathLike[str]"], sheet: Union[int, str] = 0
+) -> List[str]:
+    """
+    Read the column names from the first row of a sheet in an .xlsx workbook, without reading the rest of the sheet
+
+    `sheet` is the index or name of the sheet. The sheet's XML and the workbook's shared strings are parsed
+    incrementally and parsing stops as soon as the first row (and the shared strings it uses) has been read, so memory
+    use doesn't depend on the size of the workbook. Empty cells before the last non-empty cell are returned as "".
+
+    Raises ValueError if the file isn't a valid workbook or doesn't have the sheet.
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            cells = _first_row(archive, _sheet_path(archive, sheet))
+            strings = _shared_strings(
+                archive,
+                {
+                    int(value)
+                    for _, cell_type, value in cells
+                    if cell_type == "s" and value
+                },
+            )
+    except (zipfile.BadZipFile, KeyError, SyntaxError) as e:
+        # KeyError is a missing part and SyntaxError is ElementTree's ParseError
+        raise ValueError(f"Invalid workbook {path}: {e}") from e
+
+    header = [""] * (max((index for index, _, _ in cells), default=-1) + 1)
+    for index, cell_type, value in cells:
+        if cell_type == "s":
+            value = strings.get(int(value), "") if value else ""
+        header[index] = value
+    return header
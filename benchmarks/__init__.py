@@ -0,0 +1,17 @@
+from .generators import CatalogParameters, generate_catalog, generate_headers
+from .timing import (
+    BENCHMARKS,
+    DEFAULT_CURVES,
+    QUICK_CURVES,
+    Curve,
+    Timing,
+    run_curves,
+    time_benchmarks,
+)
+from .baseline import (
+    Comparison,
+    baseline_dict,
+    compare,
+    load_baseline,
+    save_baseline,
+)
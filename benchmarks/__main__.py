@@ -0,0 +1,89 @@
+"""
+Run the benchmarks and compare them to a baseline
+
+```
+python -m benchmarks run --output baseline.json
+# After making changes
+python -m benchmarks run --output current.json
+python -m benchmarks compare baseline.json current.json
+```
+"""
+
+from argparse import ArgumentParser
+from typing import List, Optional
+import sys
+
+from .baseline import compare, load_baseline, save_baseline
+from .timing import BENCHMARKS, DEFAULT_CURVES, QUICK_CURVES, Timing, run_curves
+
+
+def _print_timing(timing: Timing) -> None:
+    params = timing.parameters
+    print(
+        f"{timing.benchmark:<40} schemas={params.schemas:<5} columns={params.columns_per_schema:<3} "
+        f"width={params.header_width:<4} regex={params.regex_ratio:<4} shared={params.shared_ratio:<4} "
+        f"ambiguity={params.ambiguity_rate:<4} {timing.min_seconds * 1e6:10.1f} us"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--output", help="Save the timings as a JSON baseline")
+    run_parser.add_argument(
+        "--quick", action="store_true", help="Run shorter scaling curves"
+    )
+    run_parser.add_argument(
+        "--benchmark",
+        action="append",
+        choices=list(BENCHMARKS),
+        help="Only run this benchmark (can be given more than once)",
+    )
+    run_parser.add_argument("--headers", type=int, default=100)
+    run_parser.add_argument("--repeat", type=int, default=5)
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="Compare two baselines saved with run --output"
+    )
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="How much slower a benchmark can be before it counts as a regression (default 0.1 for 10%%)",
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        timings = run_curves(
+            QUICK_CURVES if args.quick else DEFAULT_CURVES,
+            benchmarks=args.benchmark or BENCHMARKS,
+            headers=args.headers,
+            repeat=args.repeat,
+            progress=_print_timing,
+        )
+        if args.output:
+            save_baseline(timings, args.output)
+        return 0
+
+    comparisons = compare(load_baseline(args.baseline), load_baseline(args.current))
+    regressions = 0
+    for comparison in sorted(comparisons, key=lambda c: c.ratio, reverse=True):
+        regressed = comparison.regressed(args.tolerance)
+        regressions += regressed
+        params = ", ".join(
+            f"{name}={value}" for name, value in comparison.parameters.items()
+        )
+        print(
+            f"{'REGRESSED' if regressed else 'ok':<10} {comparison.ratio:6.2f}x "
+            f"{comparison.benchmark} ({params})"
+        )
+    print(f"{regressions} of {len(comparisons)} benchmarks regressed")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
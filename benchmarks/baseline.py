@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple, Union
+import json
+import platform
+
+from .timing import Timing
+
+_VERSION = 1
+
+
+def baseline_dict(timings: Iterable[Timing]) -> Dict[str, Any]:
+    """Get timings as a baseline which can be saved as JSON, along with the Python version and platform they're from"""
+    return {
+        "version": _VERSION,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timings": [timing.as_dict() for timing in timings],
+    }
+
+
+def save_baseline(timings: Iterable[Timing], path: Union[str, Path]) -> None:
+    """Save timings to a JSON file to compare later runs against"""
+    with open(path, "w") as f:
+        json.dump(baseline_dict(timings), f, indent=2)
+        f.write("\n")
+
+
+def load_baseline(path: Union[str, Path]) -> Dict[str, Any]:
+    """Load a baseline saved with `save_baseline`"""
+    with open(path) as f:
+        baseline = json.load(f)
+    if baseline.get("version") != _VERSION:
+        raise ValueError(
+            f"Unsupported baseline version {baseline.get('version')!r} in {path}"
+        )
+    return baseline
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """How long a benchmark took in a baseline and in a later run with the same parameters"""
+
+    benchmark: str
+    parameters: Dict[str, Any]
+    baseline_seconds: float
+    current_seconds: float
+
+    @property
+    def ratio(self) -> float:
+        """How many times longer the current run took than the baseline, so more than 1 is slower"""
+        if self.baseline_seconds == 0:
+            return float("inf") if self.current_seconds > 0 else 1.0
+        return self.current_seconds / self.baseline_seconds
+
+    def regressed(self, tolerance: float) -> bool:
+        """Check if the current run is more than `tolerance` (like 0.1 for 10%) slower than the baseline"""
+        return self.ratio > 1 + tolerance
+
+
+def _key(timing: Dict[str, Any]) -> Tuple[str, str]:
+    return timing["benchmark"], json.dumps(timing["parameters"], sort_keys=True)
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Comparison]:
+    """
+    Compare the timings of two baselines, matching up the benchmarks run with the same parameters in both
+
+    The fastest repeat of each benchmark is compared, since it's the least affected by noise from other processes.
+    Benchmarks only run in one of the baselines are left out.
+    """
+    baseline_timings = {_key(timing): timing for timing in baseline["timings"]}
+    comparisons = []
+    for timing in current["timings"]:
+        baseline_timing = baseline_timings.get(_key(timing))
+        if baseline_timing is None:
+            continue
+        comparisons.append(
+            Comparison(
+                timing["benchmark"],
+                timing["parameters"],
+                baseline_timing["min_seconds"],
+                timing["min_seconds"],
+            )
+        )
+    return comparisons
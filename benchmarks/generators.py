@@ -0,0 +1,136 @@
+from dataclasses import dataclass
+from random import Random
+from typing import List, Set, Tuple
+import re
+
+from any_columns import ColumnDefinition, RegexColumn, Schema, StringColumn
+
+
+@dataclass(frozen=True)
+class CatalogParameters:
+    """
+    The shape of a synthetic catalog of schemas and the headers matched against it
+
+    The same parameters (including `seed`) always generate the same schemas and headers, so timings can be compared
+    between versions.
+    """
+
+    # Number of schemas in the catalog
+    schemas: int = 100
+    # Number of columns in each schema
+    columns_per_schema: int = 10
+    # Fraction of column definitions which are RegexColumns instead of StringColumns
+    regex_ratio: float = 0.2
+    # Fraction of each schema's columns drawn from a pool of column definitions shared by every schema, like the "name"
+    # and "email" columns that show up everywhere in real catalogs. The rest are unique to the schema.
+    shared_ratio: float = 0.5
+    # Fraction of each schema's columns which are optional
+    optional_ratio: float = 0.2
+    # Number of column names in each header. Headers are padded with column names which don't match anything, or cut
+    # short (so the schema they were made from no longer matches) if the schema has more columns than this.
+    header_width: int = 20
+    # Fraction of headers where one RegexColumn matches two column names, so matching raises AmbigiousColumn
+    ambiguity_rate: float = 0.0
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        for name in [
+            "regex_ratio",
+            "shared_ratio",
+            "optional_ratio",
+            "ambiguity_rate",
+        ]:
+            value = getattr(self, name)
+            if not 0 <= value <= 1:
+                raise ValueError(f"{name} must be between 0 and 1, got {value}")
+        if self.schemas < 1 or self.columns_per_schema < 1:
+            raise ValueError("A catalog needs at least one schema with one column")
+
+
+def _make_column(rng: Random, params: CatalogParameters, id: int) -> ColumnDefinition:
+    required = rng.random() >= params.optional_ratio
+    if rng.random() < params.regex_ratio:
+        # Like the regexes people write for real column names, this has a literal the RegexScanner can prefilter on
+        return RegexColumn(
+            f"column {id}",
+            re.compile(rf"^(the )?regex field {id}( \(\w+\))?$", re.IGNORECASE),
+            required,
+        )
+    return StringColumn(f"column {id}", f"string field {id}", required)
+
+
+def _column_name(rng: Random, column: ColumnDefinition, variant: str = "") -> str:
+    """Make up a column name matching a column definition"""
+    if isinstance(column, StringColumn):
+        return column.pattern
+    assert isinstance(column, RegexColumn)
+    name = column.name.replace("column", "Regex Field")
+    if variant:
+        return f"{name} ({variant})"
+    return rng.choice([name, name.lower(), f"The {name}"])
+
+
+def _column_order(column: ColumnDefinition) -> Tuple[bool, str, str]:
+    """Order columns with required columns first, the same way in every process"""
+    if isinstance(column, RegexColumn):
+        return (not column.required, column.name, column.pattern.pattern)
+    assert isinstance(column, StringColumn)
+    return (not column.required, column.name, column.pattern)
+
+
+def generate_catalog(params: CatalogParameters) -> List[Schema]:
+    """Generate a catalog of schemas with the given shape"""
+    rng = Random(params.seed)
+    shared_columns = [
+        _make_column(rng, params, id)
+        for id in range(max(params.columns_per_schema * 4, 1))
+    ]
+    next_id = len(shared_columns)
+
+    schemas = []
+    for schema_index in range(params.schemas):
+        columns: Set[ColumnDefinition] = set()
+        # Pick from the shared pool without replacement so a schema never has the same column twice
+        shared = [
+            column
+            for column in rng.sample(shared_columns, params.columns_per_schema)
+            if rng.random() < params.shared_ratio
+        ]
+        columns.update(shared)
+        while len(columns) < params.columns_per_schema:
+            columns.add(_make_column(rng, params, next_id))
+            next_id += 1
+        schemas.append(Schema(columns, f"schema {schema_index}"))
+    return schemas
+
+
+def generate_headers(
+    schemas: List[Schema], params: CatalogParameters, count: int
+) -> List[Tuple[Schema, Set[str]]]:
+    """
+    Generate headers made from random schemas in a catalog, with the schema each header was made from
+
+    Each header has the column names of its schema's required columns, then as many of its optional columns as fit,
+    padded with column names which don't match any column.
+    """
+    rng = Random(params.seed + 1)
+    headers = []
+    for header_index in range(count):
+        schema = rng.choice(schemas)
+        # Sort by name too, since the order of the schema's columns depends on PYTHONHASHSEED and would change which
+        # columns are cut off and which column is made ambiguous from one process to the next
+        columns = sorted(schema.columns, key=_column_order)
+        header = [_column_name(rng, column) for column in columns]
+        regex_columns = [
+            column for column in columns if isinstance(column, RegexColumn)
+        ]
+        if regex_columns and rng.random() < params.ambiguity_rate:
+            ambiguous = rng.choice(regex_columns)
+            header.insert(0, _column_name(rng, ambiguous, "a"))
+            header.insert(0, _column_name(rng, ambiguous, "b"))
+        header = header[: params.header_width]
+        while len(header) < params.header_width:
+            header.append(f"unknown field {header_index} {len(header)}")
+        rng.shuffle(header)
+        headers.append((schema, set(header)))
+    return headers
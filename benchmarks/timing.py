@@ -0,0 +1,168 @@
+from dataclasses import asdict, dataclass, replace
+from statistics import median
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Set, Tuple
+
+from any_columns import (
+    AmbigiousColumn,
+    AmbigiousColumns,
+    AmbigiousMatch,
+    Schema,
+    SchemaSet,
+    find_best_matching_schema,
+    find_best_matching_schemas,
+)
+
+from .generators import CatalogParameters, generate_catalog, generate_headers
+
+# Matching generated headers can be ambiguous on purpose, which counts as a result like any other
+_AMBIGUOUS_EXCEPTIONS = (AmbigiousColumn, AmbigiousColumns, AmbigiousMatch)
+
+
+@dataclass(frozen=True)
+class _Catalog:
+    schemas: Set[Schema]
+    schema_set: SchemaSet
+
+
+# A function which matches one header against a catalog, given the schema the header was made from
+Benchmark = Callable[[_Catalog, Schema, Set[str]], Any]
+
+
+def _find_best_matching_schema(
+    catalog: _Catalog, schema: Schema, header: Set[str]
+) -> Any:
+    return find_best_matching_schema(catalog.schemas, header)
+
+
+def _find_best_matching_schemas(
+    catalog: _Catalog, schema: Schema, header: Set[str]
+) -> Any:
+    return find_best_matching_schemas(catalog.schemas, header)
+
+
+def _match_columns(catalog: _Catalog, schema: Schema, header: Set[str]) -> Any:
+    return schema.match_columns(header)
+
+
+def _schema_set_find_best_matching_schema(
+    catalog: _Catalog, schema: Schema, header: Set[str]
+) -> Any:
+    return catalog.schema_set.find_best_matching_schema(header)
+
+
+def _schema_set_find_best_matching_schemas(
+    catalog: _Catalog, schema: Schema, header: Set[str]
+) -> Any:
+    return catalog.schema_set.find_best_matching_schemas(header)
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    "find_best_matching_schema": _find_best_matching_schema,
+    "find_best_matching_schemas": _find_best_matching_schemas,
+    "Schema.match_columns": _match_columns,
+    "SchemaSet.find_best_matching_schema": _schema_set_find_best_matching_schema,
+    "SchemaSet.find_best_matching_schemas": _schema_set_find_best_matching_schemas,
+}
+
+
+@dataclass(frozen=True)
+class Curve:
+    """A scaling curve: the same benchmarks run with one parameter varied over a range of values"""
+
+    parameter: str
+    values: Sequence[Any]
+
+
+DEFAULT_CURVES = [
+    Curve("schemas", [10, 100, 1000]),
+    Curve("columns_per_schema", [5, 20, 50]),
+    Curve("header_width", [10, 50, 200]),
+    Curve("regex_ratio", [0.0, 0.5, 1.0]),
+    Curve("shared_ratio", [0.0, 0.5, 1.0]),
+    Curve("ambiguity_rate", [0.0, 0.5]),
+]
+
+QUICK_CURVES = [
+    Curve("schemas", [10, 100]),
+    Curve("regex_ratio", [0.0, 1.0]),
+]
+
+
+@dataclass(frozen=True)
+class Timing:
+    """How long one benchmark took per header with one set of parameters"""
+
+    benchmark: str
+    parameters: CatalogParameters
+    # The fastest and median of the repeats, in seconds per header
+    min_seconds: float
+    median_seconds: float
+    headers: int
+    repeat: int
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "benchmark": self.benchmark,
+            "parameters": asdict(self.parameters),
+            "min_seconds": self.min_seconds,
+            "median_seconds": self.median_seconds,
+            "headers": self.headers,
+            "repeat": self.repeat,
+        }
+
+
+def _match_all(
+    benchmark: Benchmark, catalog: _Catalog, headers: List[Tuple[Schema, Set[str]]]
+) -> float:
+    start = perf_counter()
+    for schema, header in headers:
+        try:
+            benchmark(catalog, schema, header)
+        except _AMBIGUOUS_EXCEPTIONS:
+            pass
+    return perf_counter() - start
+
+
+def time_benchmarks(
+    params: CatalogParameters,
+    benchmarks: Iterable[str] = BENCHMARKS,
+    headers: int = 100,
+    repeat: int = 5,
+) -> List[Timing]:
+    """Time each benchmark matching the same generated headers against a catalog generated from `params`"""
+    if headers < 1 or repeat < 1:
+        raise ValueError("headers and repeat must be at least 1")
+    schemas = generate_catalog(params)
+    catalog = _Catalog(set(schemas), SchemaSet(schemas))
+    generated = generate_headers(schemas, params, headers)
+    timings = []
+    for name in benchmarks:
+        benchmark = BENCHMARKS[name]
+        # Match one header first so one-time costs like filling caches don't count against the first repeat
+        _match_all(benchmark, catalog, generated[:1])
+        times = [
+            _match_all(benchmark, catalog, generated) / headers for _ in range(repeat)
+        ]
+        timings.append(Timing(name, params, min(times), median(times), headers, repeat))
+    return timings
+
+
+def run_curves(
+    curves: Iterable[Curve] = DEFAULT_CURVES,
+    base: CatalogParameters = CatalogParameters(),
+    benchmarks: Iterable[str] = BENCHMARKS,
+    headers: int = 100,
+    repeat: int = 5,
+    progress: Callable[[Timing], None] = lambda timing: None,
+) -> List[Timing]:
+    """Time the benchmarks along each scaling curve, starting from the `base` parameters"""
+    benchmarks = list(benchmarks)
+    timings = []
+    for curve in curves:
+        for value in curve.values:
+            params = replace(base, **{curve.parameter: value})
+            for timing in time_benchmarks(params, benchmarks, headers, repeat):
+                progress(timing)
+                timings.append(timing)
+    return timings
@@ -4,13 +4,52 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from any_columns import (
+    AmbigiousColumn,
+    AmbigiousColumns,
     AmbigiousMatch,
+    AsyncMatcher,
+    BatchResult,
+    BitmaskSchemaSet,
+    CacheInfo,
+    CatalogAnalysis,
+    CatalogSchemaSet,
+    ColumnCollision,
     ColumnDefinition,
+    FileReport,
+    FuzzyColumn,
+    MatchCache,
+    MatchProfile,
+    Normalization,
+    NormalizedColumn,
+    PrunedSchemaSet,
     RegexColumn,
+    RowProjector,
     StringColumn,
     Schema,
     SchemaMatch,
+    SchemaRegistry,
+    SchemaSet,
+    ShardedMatcher,
+    analyze_schemas,
+    dumps_catalog,
     find_best_matching_schemas,
     find_best_matching_schema,
     find_matching_schemas,
+    find_top_k_matching_schemas,
+    load_catalog,
+    loads_catalog,
+    looks_like_date,
+    looks_like_email,
+    looks_like_number,
+    match_content,
+    match_headers_batch,
+    read_arrow_table,
+    read_dataframe,
+    read_header,
+    read_header_async,
+    read_rows,
+    read_xlsx_header,
+    save_catalog,
+    scan_files,
+    profile_matching,
 )
@@ -0,0 +1,144 @@
+from typing import Any, Callable, List, Sequence, Set
+import random
+import re
+
+from .context import (
+    AmbigiousColumn,
+    AmbigiousMatch,
+    ColumnDefinition,
+    RegexColumn,
+    StringColumn,
+    Schema,
+    SchemaRegistry,
+    SchemaSet,
+    dumps_catalog,
+    find_best_matching_schema,
+    find_best_matching_schemas,
+    loads_catalog,
+)
+
+# Makes a column matching a pattern, given the random generator, the pattern and whether the column is required
+ColumnFactory = Callable[[random.Random, str, bool], ColumnDefinition]
+
+
+def random_schemas(
+    rng: random.Random,
+    count: int,
+    strings: int = 50,
+    regexes: int = 10,
+    min_columns: int = 0,
+    max_columns: int = 6,
+) -> List[Schema]:
+    """
+    Make schemas out of StringColumns matching "column {i}", and optional RegexColumns matching "REGEX {i}"
+
+    There's also a RegexColumn compiled from a string, which searches for "column 1" so it's ambiguous with "column 1"
+    itself and with headers containing "column 10" or the like.
+    """
+    columns: List[ColumnDefinition] = [
+        StringColumn(f"column {i}", f"column {i}", required=rng.random() < 0.7)
+        for i in range(strings)
+    ]
+    columns += [
+        RegexColumn(f"regex {i}", re.compile(f"^regex {i}$", re.I), required=False)
+        for i in range(regexes)
+    ]
+    columns += [RegexColumn("regex any", re.compile("regex"), required=False)]
+    columns += [RegexColumn("string", "column 1", required=False)]
+    return [
+        Schema(
+            set(rng.sample(columns, rng.randint(min_columns, max_columns))),
+            f"schema {i}",
+        )
+        for i in range(count)
+    ]
+
+
+def random_headers(
+    rng: random.Random,
+    count: int,
+    strings: int = 50,
+    regexes: int = 10,
+    max_names: int = 30,
+) -> List[Set[str]]:
+    """Make headers for `random_schemas()`"""
+    names = [f"column {i}" for i in range(strings)]
+    names += [f"REGEX {i}" for i in range(regexes)]
+    return [set(rng.sample(names, rng.randint(0, max_names))) for _ in range(count)]
+
+
+def outcome(function: Callable[[Set[str]], Any], columns: Set[str]) -> Any:
+    """Call `function`, returning the matches of an AmbigiousMatch or the type and arguments of any other exception"""
+    try:
+        return function(columns)
+    except AmbigiousMatch as e:
+        return e.matches
+    except Exception as e:
+        # Exceptions from other processes and catalogs contain copies of the columns and schemas, which compare equal
+        # to the originals
+        return type(e), e.args
+
+
+def results(schema_set, columns: Set[str]):
+    try:
+        matches = schema_set.find_best_matching_schemas(columns)
+    except AmbigiousColumn:
+        # Which schema's ambiguous column gets reported, and whether the best match is found before an ambiguous
+        # schema is looked at, depends on the order schemas are evaluated in
+        return AmbigiousColumn
+    try:
+        return matches, schema_set.find_best_matching_schema(columns)
+    except AmbigiousMatch as e:
+        return matches, e.matches
+
+
+class Functions:
+    def __init__(self, schemas: List[Schema]):
+        self.schemas = schemas
+
+    def find_best_matching_schema(self, columns: Set[str]):
+        return find_best_matching_schema(self.schemas, columns)  # type: ignore[arg-type]
+
+    def find_best_matching_schemas(self, columns: Set[str]):
+        return find_best_matching_schemas(self.schemas, columns)  # type: ignore[arg-type]
+
+
+def assert_same_as_functions(
+    column: ColumnFactory, patterns: Sequence[str], names: Sequence[str]
+) -> None:
+    """
+    Check schemas mixing `column`s and StringColumns match the same way in a SchemaSet, the matching functions, a
+    SchemaRegistry and a catalog
+
+    The columns match `patterns`, and headers are picked from `names`.
+    """
+    rng = random.Random(1234)
+
+    def random_schemas(count: int) -> List[Schema]:
+        return [
+            Schema(
+                {
+                    (
+                        column(rng, pattern, rng.random() < 0.7)
+                        if rng.random() < 0.5
+                        else StringColumn(pattern, pattern, required=rng.random() < 0.7)
+                    )
+                    for pattern in rng.sample(patterns, rng.randint(0, 5))
+                },
+                f"schema {i}",
+            )
+            for i in range(count)
+        ]
+
+    schemas = random_schemas(150)
+    schema_set = SchemaSet(schemas)
+    # Include schemas which were removed from the registry
+    registry = SchemaRegistry(schemas + random_schemas(50))
+    for schema in list(registry)[150:]:
+        registry.remove(schema)
+    others = [Functions(schemas), registry, loads_catalog(dumps_catalog(schema_set))]
+    for _ in range(200):
+        columns = set(rng.sample(names, rng.randint(0, len(names) // 2)))
+        expected = results(schema_set, columns)
+        for other in others:
+            assert results(other, columns) == expected
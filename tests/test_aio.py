@@ -0,0 +1,244 @@
+from typing import Any, AsyncIterator, Coroutine, List, Optional, Set, TypeVar
+import asyncio
+import re
+import threading
+import time
+
+import pytest
+
+from .context import (
+    AmbigiousMatch,
+    AsyncMatcher,
+    ColumnDefinition,
+    RegexColumn,
+    StringColumn,
+    Schema,
+    SchemaSet,
+    read_header_async,
+)
+
+T = TypeVar("T")
+
+COLUMN_A = StringColumn("a", "column a")
+SCHEMAS = {
+    Schema({COLUMN_A}, "a"),
+    Schema({COLUMN_A, StringColumn("b", "column b")}, "ab"),
+    Schema({StringColumn("c", "column c")}, "c 1"),
+    Schema({StringColumn("c", "column c"), RegexColumn("d", re.compile("d"))}, "c 2"),
+}
+HEADERS = [
+    {"column a"},
+    {"column a", "column b"},
+    {"column c"},
+    {"nothing"},
+    {"column c", "d"},
+]
+
+
+def run(coroutine: Coroutine[Any, Any, T]) -> T:
+    return asyncio.run(coroutine)
+
+
+def stream(data: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+def test_read_header_async() -> None:
+    async def read(data: bytes, **kwargs: Any) -> List[str]:
+        return await read_header_async(stream(data), **kwargs)
+
+    assert run(read(b"a,b,c\n1,2,3\n")) == ["a", "b", "c"]
+    assert run(read(b"a;b;c\r\n1;2;3")) == ["a", "b", "c"]
+    assert run(read(b'"a\nb",c\n1,2\n', chunk_size=2)) == ["a\nb", "c"]
+    assert run(read("näme,b".encode("utf-8-sig"))) == ["näme", "b"]
+    assert run(read(b"")) == []
+    # The first row can be exactly max_bytes long, but not any longer
+    assert run(read(b"a,b", max_bytes=3, chunk_size=1)) == ["a", "b"]
+    with pytest.raises(ValueError):
+        run(read(b"a,b,c", max_bytes=3))
+    with pytest.raises(ValueError):
+        run(read(b"a,b", chunk_size=0))
+
+
+def test_read_header_async_stops_after_header() -> None:
+    async def read() -> bytes:
+        reader = stream(b"a,b\n" + b"1,2\n" * 10_000)
+        assert await read_header_async(reader, chunk_size=8) == ["a", "b"]
+        return await reader.read()
+
+    # Only the rest of the last chunk was consumed
+    assert len(run(read())) == 10_000 * 4 - 4
+
+
+@pytest.mark.parametrize("pool", ["thread", "process"])
+def test_same_as_schema_set(pool: str) -> None:
+    schema_set = SchemaSet(SCHEMAS)
+
+    async def check() -> None:
+        async with AsyncMatcher(SCHEMAS, max_workers=2, pool=pool) as matcher:  # type: ignore[arg-type]
+            for header in HEADERS:
+                assert await matcher.find_best_matching_schema(
+                    header
+                ) == schema_set.find_best_matching_schema(header)
+                assert await matcher.find_best_matching_schemas(
+                    header
+                ) == schema_set.find_best_matching_schemas(header)
+            with pytest.raises(AmbigiousMatch):
+                await matcher.find_best_matching_schema({"column a", "column c"})
+
+    run(check())
+
+
+@pytest.mark.parametrize("pool", ["thread", "process"])
+def test_match_headers(pool: str) -> None:
+    schema_set = SchemaSet(SCHEMAS)
+    headers = HEADERS + [{"column a", "column c"}]
+
+    async def source() -> AsyncIterator[Set[str]]:
+        for header in headers:
+            await asyncio.sleep(0)
+            yield header
+
+    async def collect() -> None:
+        async with AsyncMatcher(SCHEMAS, pool=pool, max_pending=2) as matcher:  # type: ignore[arg-type]
+            for results in [
+                [result async for result in matcher.match_headers(source())],
+                [result async for result in matcher.match_headers(headers)],
+            ]:
+                assert [result.columns for result in results] == [
+                    frozenset(header) for header in headers
+                ]
+                for result, header in zip(results[:-1], HEADERS):
+                    assert result.match == schema_set.find_best_matching_schema(header)
+                    assert result.error is None
+                assert isinstance(results[-1].error, AmbigiousMatch)
+
+    run(collect())
+
+
+def test_backpressure() -> None:
+    produced = 0
+
+    async def source() -> AsyncIterator[Set[str]]:
+        nonlocal produced
+        for _ in range(100):
+            produced += 1
+            yield {"column a"}
+
+    async def take_one() -> None:
+        async with AsyncMatcher(SCHEMAS, max_pending=4) as matcher:
+            results = matcher.match_headers(source())
+            await results.__anext__()
+            # The source is only read far enough to fill the pending queue
+            assert produced <= 5
+            await results.aclose()  # type: ignore[attr-defined]
+
+    run(take_one())
+
+
+def test_results_not_held_back_by_slow_source() -> None:
+    arrived: List[float] = []
+
+    async def source() -> AsyncIterator[Set[str]]:
+        for header in HEADERS[:3]:
+            yield header
+            await asyncio.sleep(0.2)
+
+    async def collect() -> None:
+        start = time.monotonic()
+        async with AsyncMatcher(SCHEMAS, max_pending=4) as matcher:
+            async for result in matcher.match_headers(source()):
+                assert result.error is None
+                arrived.append(time.monotonic() - start)
+
+    run(collect())
+    # Each result arrives as soon as it's matched instead of once the source is done (after 0.6s)
+    assert len(arrived) == 3
+    assert arrived[0] < 0.15
+    assert arrived[1] < 0.35
+    assert arrived[2] < 0.55
+
+
+def test_source_errors_raised() -> None:
+    async def source() -> AsyncIterator[Set[str]]:
+        yield {"column a"}
+        raise RuntimeError("broken source")
+
+    async def collect() -> List[Any]:
+        async with AsyncMatcher(SCHEMAS) as matcher:
+            return [result async for result in matcher.match_headers(source())]
+
+    with pytest.raises(RuntimeError, match="broken source"):
+        run(collect())
+
+
+class SlowColumn(ColumnDefinition):
+    """A column which takes a while to match and records how many threads are matching it at once"""
+
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    def matching_column(self, others: Set[str]) -> Optional[str]:
+        with SlowColumn.lock:
+            SlowColumn.running += 1
+            SlowColumn.max_running = max(SlowColumn.max_running, SlowColumn.running)
+        time.sleep(0.05)
+        with SlowColumn.lock:
+            SlowColumn.running -= 1
+        return self.name if self.name in others else None
+
+    def _key(self) -> Any:
+        return self.name
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, SlowColumn) and self._key() == other._key()
+
+
+def test_does_not_block_event_loop() -> None:
+    schemas = {Schema({SlowColumn("slow")}, "slow")}
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.001)
+            ticks += 1
+
+    async def check() -> None:
+        async with AsyncMatcher(schemas, max_workers=4, max_pending=2) as matcher:
+            ticker = asyncio.ensure_future(tick())
+            matches = await asyncio.gather(
+                *[matcher.find_best_matching_schema({"slow"}) for _ in range(6)]
+            )
+            ticker.cancel()
+        assert all(match is not None for match in matches)
+
+    run(check())
+    assert ticks > 0
+    # Only max_pending headers are handed to the pool at once, even though it has more workers
+    assert SlowColumn.max_running == 2
+
+
+def test_match_stream() -> None:
+    async def check() -> None:
+        async with AsyncMatcher(SCHEMAS) as matcher:
+            match = await matcher.match_stream(stream(b"column a,column b\n1,2\n"))
+            assert match is not None
+            assert match.schema.name == "ab"
+            assert await matcher.match_stream(stream(b"nothing\n")) is None
+
+    run(check())
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError):
+        AsyncMatcher(SCHEMAS, max_pending=0)
+    with pytest.raises(ValueError):
+        AsyncMatcher(SCHEMAS, pool="fork")  # type: ignore[arg-type]
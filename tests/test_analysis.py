@@ -0,0 +1,202 @@
+from typing import Any, Set
+import random
+import re
+
+import pytest
+
+from .context import (
+    AmbigiousColumn,
+    AmbigiousColumns,
+    AmbigiousMatch,
+    ColumnCollision,
+    ColumnDefinition,
+    NormalizedColumn,
+    PrunedSchemaSet,
+    RegexColumn,
+    StringColumn,
+    Schema,
+    SchemaSet,
+    analyze_schemas,
+    profile_matching,
+)
+
+NAME = StringColumn("name", "name")
+EMAIL = StringColumn("email", "email")
+EMAIL_OPTIONAL = StringColumn("email", "email", required=False)
+PHONE_OPTIONAL = StringColumn("phone", "phone", required=False)
+START = StringColumn("start", "start date")
+END = StringColumn("end", "end date")
+
+PEOPLE = Schema({NAME, EMAIL}, "people")
+PEOPLE_WITH_PHONE = Schema({NAME, EMAIL, PHONE_OPTIONAL}, "people with phone")
+PEOPLE_COPY = Schema({NAME, EMAIL}, "people copy")
+HIRES = Schema({NAME, START}, "hires")
+TERMS = Schema({NAME, END}, "terms")
+OPTIONAL_EMAIL = Schema({NAME, EMAIL_OPTIONAL}, "optional email")
+
+
+def test_domination() -> None:
+    analysis = analyze_schemas(
+        [PEOPLE, PEOPLE_WITH_PHONE, PEOPLE_COPY, HIRES, OPTIONAL_EMAIL]
+    )
+    assert analysis.dominates(PEOPLE_WITH_PHONE, PEOPLE)
+    assert analysis.dominates(PEOPLE_WITH_PHONE, PEOPLE_COPY)
+    # Schemas with the same columns dominate each other, but only the first one counts
+    assert analysis.dominates(PEOPLE, PEOPLE_COPY)
+    assert not analysis.dominates(PEOPLE_COPY, PEOPLE)
+    assert not analysis.dominates(PEOPLE, PEOPLE_WITH_PHONE)
+    # Different required columns
+    assert not analysis.dominates(PEOPLE, OPTIONAL_EMAIL)
+    assert not analysis.dominates(HIRES, PEOPLE)
+    assert analysis.dominated_by == {
+        PEOPLE: frozenset({PEOPLE_WITH_PHONE}),
+        PEOPLE_COPY: frozenset({PEOPLE, PEOPLE_WITH_PHONE}),
+    }
+
+
+def test_always_tie() -> None:
+    analysis = analyze_schemas(
+        [PEOPLE, PEOPLE_WITH_PHONE, PEOPLE_COPY, HIRES, TERMS, OPTIONAL_EMAIL]
+    )
+    assert analysis.always_tie == [
+        (PEOPLE, PEOPLE_COPY),
+        # Required columns only one of them has don't make a difference, since any header matching both has them all
+        (PEOPLE, HIRES),
+        (PEOPLE, TERMS),
+        # The same columns, but with different required columns
+        (PEOPLE, OPTIONAL_EMAIL),
+        (PEOPLE_COPY, HIRES),
+        (PEOPLE_COPY, TERMS),
+        (PEOPLE_COPY, OPTIONAL_EMAIL),
+        (HIRES, TERMS),
+    ]
+
+
+def test_can_tie() -> None:
+    analysis = analyze_schemas(
+        [PEOPLE, PEOPLE_WITH_PHONE, HIRES, Schema({NAME}, "names")]
+    )
+    assert analysis.can_tie(PEOPLE, HIRES)
+    # When there's no phone column
+    assert analysis.can_tie(PEOPLE, PEOPLE_WITH_PHONE)
+    # Any header matching people has an email column too, so people always wins
+    assert not analysis.can_tie(PEOPLE, analysis.schemas[3])
+    assert not analysis.can_tie(analysis.schemas[3], PEOPLE)
+    # Every pair which always ties can tie
+    for a, b in analysis.always_tie:
+        assert analysis.can_tie(a, b)
+
+
+def test_column_collisions() -> None:
+    email_regex = RegexColumn("email regex", re.compile("mail"))
+    email_normalized = NormalizedColumn("email normalized", "E-Mail")
+    email_normalized_2 = NormalizedColumn("email normalized 2", "e mail")
+    schema = Schema({EMAIL, email_regex, NAME}, "regex")
+    normalized_schema = Schema(
+        {email_normalized, email_normalized_2, NAME}, "normalized"
+    )
+    string_schema = Schema({EMAIL, StringColumn("email 2", "email")}, "strings")
+    analysis = analyze_schemas([schema, normalized_schema, string_schema, PEOPLE])
+    assert set(analysis.column_collisions) == {
+        ColumnCollision(schema, frozenset({EMAIL, email_regex}), "email"),
+        ColumnCollision(
+            normalized_schema,
+            frozenset({email_normalized, email_normalized_2}),
+            "E-Mail",
+        ),
+        ColumnCollision(
+            string_schema,
+            frozenset({EMAIL, StringColumn("email 2", "email")}),
+            "email",
+        ),
+    }
+    with pytest.raises(AmbigiousColumns):
+        schema.match_columns({"email", "name"})
+
+
+def test_report() -> None:
+    assert analyze_schemas([PEOPLE]).report() == "No inherent ambiguities found"
+    report = analyze_schemas([PEOPLE, PEOPLE_WITH_PHONE, PEOPLE_COPY]).report()
+    assert (
+        "Schema 'people' can never be the only best match, because it's dominated by 'people with phone'"
+        in report
+    )
+    assert (
+        "Schemas 'people' and 'people copy' tie for every header matching both"
+        in report
+    )
+
+
+def results(schema_set: SchemaSet, columns: Set[str]) -> Any:
+    try:
+        return schema_set.find_best_matching_schema(columns)
+    except AmbigiousMatch as e:
+        return e.matches
+    except AmbigiousColumn:
+        # Which schema's ambiguous column gets reported depends on the order schemas are evaluated in
+        return AmbigiousColumn
+
+
+def test_pruned_same_as_schema_set() -> None:
+    rng = random.Random(0)
+    names = ["a", "b", "c", "d", "e", "f"]
+    # The regex only matches names none of the StringColumns match, so it doesn't collide with them
+    regex = RegexColumn("regex", re.compile("^[gh]$"), required=False)
+
+    def random_schema(i: int) -> Schema:
+        # Pick whether each column is required separately, so no schema has two definitions of the same column
+        columns: Set[ColumnDefinition] = {
+            StringColumn(name, name, required=rng.random() < 0.5)
+            for name in rng.sample(names, rng.randint(1, 4))
+        }
+        if rng.random() < 0.2:
+            columns.add(regex)
+        return Schema(columns, f"schema {i}")
+
+    schemas = [random_schema(i) for i in range(60)]
+    schema_set = SchemaSet(schemas)
+    pruned = PrunedSchemaSet(schemas)
+    assert pruned._skipped
+    for _ in range(300):
+        header = set(rng.sample(names + ["g", "h"], rng.randint(0, len(names) + 2)))
+        assert results(pruned, header) == results(schema_set, header), header
+
+
+def test_pruned_skips_dominated_schemas() -> None:
+    pruned = PrunedSchemaSet([PEOPLE_WITH_PHONE, PEOPLE, HIRES])
+    with profile_matching() as profile:
+        match = pruned.find_best_matching_schema({"name", "email", "phone"})
+    assert match is not None
+    assert match.schema == PEOPLE_WITH_PHONE
+    assert PEOPLE not in profile.schema_stats
+
+    # Without a phone column they tie, which we know without evaluating the dominated schema
+    with profile_matching() as profile:
+        with pytest.raises(AmbigiousMatch) as exc_info:
+            pruned.find_best_matching_schema({"name", "email"})
+    assert {match.schema for match in exc_info.value.matches} == {
+        PEOPLE,
+        PEOPLE_WITH_PHONE,
+    }
+    assert exc_info.value.matches == set(
+        SchemaSet([PEOPLE_WITH_PHONE, PEOPLE]).find_best_matching_schemas(
+            {"name", "email"}
+        )
+    )
+    assert PEOPLE not in profile.schema_stats
+
+
+def test_pruned_with_analysis() -> None:
+    analysis = analyze_schemas([PEOPLE_WITH_PHONE, PEOPLE, PEOPLE_COPY])
+    pruned = PrunedSchemaSet([PEOPLE, PEOPLE_WITH_PHONE], analysis)
+    assert pruned.analysis is analysis
+    # Schemas in the analysis but not the set are ignored
+    with pytest.raises(AmbigiousMatch) as exc_info:
+        pruned.find_best_matching_schema({"name", "email"})
+    assert len(exc_info.value.matches) == 2
+    # The schema dominating both isn't in the set, so the first one is evaluated instead
+    pruned = PrunedSchemaSet([PEOPLE, PEOPLE_COPY], analysis)
+    assert pruned._skipped == {1}
+    with pytest.raises(AmbigiousMatch) as exc_info:
+        pruned.find_best_matching_schema({"name", "email"})
+    assert len(exc_info.value.matches) == 2
@@ -0,0 +1,80 @@
+import pickle
+import re
+
+import pytest
+
+from .context import (
+    AmbigiousColumn,
+    AmbigiousMatch,
+    RegexColumn,
+    StringColumn,
+    Schema,
+    SchemaSet,
+    find_best_matching_schema,
+    match_headers_batch,
+)
+
+COLUMN_A = StringColumn("a", "column a")
+SCHEMAS = {
+    Schema({COLUMN_A}, "a"),
+    Schema({COLUMN_A, StringColumn("b", "column b")}, "ab"),
+    Schema({StringColumn("c", "column c")}, "c 1"),
+    Schema({StringColumn("c", "column c", required=False)}, "c 3"),
+    Schema({StringColumn("c", "column c"), RegexColumn("d", re.compile("d"))}, "c 2"),
+}
+
+HEADERS = [
+    {"column a"},
+    {"column a", "column b"},
+    {"column c"},
+    {"nothing"},
+    {"column a"},
+]
+
+
+@pytest.mark.parametrize("pool", [None, "thread", "process"])
+def test_same_as_find_best_matching_schema(pool) -> None:
+    results = match_headers_batch(SCHEMAS, HEADERS, pool=pool, chunksize=2)
+    assert [result.columns for result in results] == [
+        frozenset(columns) for columns in HEADERS
+    ]
+    for columns, result in zip(HEADERS, results):
+        if result.error is None:
+            assert result.match == find_best_matching_schema(SCHEMAS, columns)
+    assert isinstance(results[2].error, AmbigiousMatch)
+    # Only the schema with no required columns matches
+    assert results[3].match is not None
+    assert results[3].match.schema.name == "c 3"
+
+
+def test_duplicates_share_results() -> None:
+    results = match_headers_batch(SchemaSet(SCHEMAS), HEADERS)
+    assert results[0] is results[4]
+
+
+@pytest.mark.parametrize("pool", [None, "process"])
+def test_errors_captured(pool) -> None:
+    results = match_headers_batch(
+        SCHEMAS, [{"column c", "d 1", "d 2"}, {"column a"}], pool=pool
+    )
+    assert isinstance(results[0].error, AmbigiousColumn)
+    assert results[0].error.matching_columns == {"d 1", "d 2"}
+    assert results[1].match is not None
+
+
+def test_exceptions_can_be_pickled() -> None:
+    schema = Schema({COLUMN_A}, "a")
+    error = AmbigiousColumn(COLUMN_A, {"column a", "column a 2"})
+    unpickled = pickle.loads(pickle.dumps(error))
+    assert unpickled.column == COLUMN_A
+    assert unpickled.matching_columns == {"column a", "column a 2"}
+    with pytest.raises(AmbigiousMatch) as exc_info:
+        find_best_matching_schema({schema, Schema({COLUMN_A}, "b")}, {"column a"})
+    assert pickle.loads(pickle.dumps(exc_info.value)).matches == exc_info.value.matches
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError):
+        match_headers_batch(SCHEMAS, HEADERS, chunksize=0)
+    with pytest.raises(ValueError):
+        match_headers_batch(SCHEMAS, HEADERS, pool="fibers")  # type: ignore[arg-type]
@@ -0,0 +1,185 @@
+from dataclasses import replace
+from pathlib import Path
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks import (
+    BENCHMARKS,
+    CatalogParameters,
+    Curve,
+    compare,
+    generate_catalog,
+    generate_headers,
+    load_baseline,
+    run_curves,
+    save_baseline,
+    time_benchmarks,
+)
+from benchmarks.__main__ import main
+
+from .context import (
+    AmbigiousColumn,
+    RegexColumn,
+    StringColumn,
+    find_best_matching_schema,
+)
+
+SMALL = CatalogParameters(schemas=20, columns_per_schema=5, header_width=10)
+
+
+def test_generate_catalog() -> None:
+    schemas = generate_catalog(SMALL)
+    assert len(schemas) == 20
+    assert all(len(schema.columns) == 5 for schema in schemas)
+    assert generate_catalog(SMALL) == schemas
+    assert generate_catalog(replace(SMALL, seed=1)) != schemas
+
+
+def test_regex_ratio() -> None:
+    for regex_ratio, column_type in [(0.0, StringColumn), (1.0, RegexColumn)]:
+        schemas = generate_catalog(replace(SMALL, regex_ratio=regex_ratio))
+        assert all(
+            isinstance(column, column_type)
+            for schema in schemas
+            for column in schema.columns
+        )
+
+
+def test_shared_ratio() -> None:
+    def distinct_columns(shared_ratio: float) -> int:
+        schemas = generate_catalog(replace(SMALL, shared_ratio=shared_ratio))
+        return len({column for schema in schemas for column in schema.columns})
+
+    assert distinct_columns(0.0) == 20 * 5
+    # Every column comes from the shared pool of four times the columns per schema
+    assert distinct_columns(1.0) <= 4 * 5
+
+
+def test_generate_headers() -> None:
+    params = replace(SMALL, optional_ratio=0.0)
+    schemas = generate_catalog(params)
+    headers = generate_headers(schemas, params, 50)
+    assert len(headers) == 50
+    assert headers == generate_headers(schemas, params, 50)
+    for schema, header in headers:
+        assert len(header) == 10
+        # Every column of the schema the header was made from is present
+        assert schema.match_columns(header).matches
+        match = find_best_matching_schema(set(schemas), header)
+        assert match is not None
+        assert len(match.matching_columns) == 5
+
+
+# Prints the generated headers, cut short and with ambiguous columns, in a form that doesn't depend on set order
+GENERATE_HEADERS = """
+import json
+from benchmarks import CatalogParameters, generate_catalog, generate_headers
+
+params = CatalogParameters(
+    schemas=20, columns_per_schema=8, header_width=6, regex_ratio=0.5, ambiguity_rate=0.5
+)
+headers = generate_headers(generate_catalog(params), params, 50)
+print(json.dumps([(schema.name, sorted(header)) for schema, header in headers]))
+"""
+
+
+def test_generate_headers_same_in_every_process() -> None:
+    outputs = [
+        subprocess.run(
+            [sys.executable, "-c", GENERATE_HEADERS],
+            cwd=Path(__file__).parent.parent,
+            env={**os.environ, "PYTHONHASHSEED": hash_seed},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        for hash_seed in ["1", "2"]
+    ]
+    assert outputs[0] == outputs[1]
+
+
+def test_ambiguity_rate() -> None:
+    params = replace(SMALL, regex_ratio=1.0, ambiguity_rate=1.0)
+    schemas = generate_catalog(params)
+    for schema, header in generate_headers(schemas, params, 10):
+        with pytest.raises(AmbigiousColumn):
+            schema.match_columns(header)
+
+
+def test_invalid_parameters() -> None:
+    with pytest.raises(ValueError):
+        CatalogParameters(regex_ratio=1.5)
+    with pytest.raises(ValueError):
+        CatalogParameters(schemas=0)
+
+
+def test_time_benchmarks() -> None:
+    timings = time_benchmarks(SMALL, headers=5, repeat=2)
+    assert [timing.benchmark for timing in timings] == list(BENCHMARKS)
+    for timing in timings:
+        assert 0 < timing.min_seconds <= timing.median_seconds
+
+
+def test_run_curves() -> None:
+    timings = run_curves(
+        [Curve("schemas", [5, 10])],
+        base=SMALL,
+        benchmarks=["Schema.match_columns"],
+        headers=2,
+        repeat=1,
+    )
+    assert [timing.parameters.schemas for timing in timings] == [5, 10]
+
+
+def test_baseline_round_trip(tmp_path: Path) -> None:
+    timings = time_benchmarks(SMALL, ["Schema.match_columns"], headers=2, repeat=1)
+    save_baseline(timings, tmp_path / "baseline.json")
+    baseline = load_baseline(tmp_path / "baseline.json")
+    assert baseline["timings"] == [timing.as_dict() for timing in timings]
+
+    [comparison] = compare(baseline, baseline)
+    assert comparison.ratio == 1
+    assert not comparison.regressed(0.1)
+
+
+def test_compare() -> None:
+    def baseline(seconds: float, schemas: int = 10) -> dict:
+        return {
+            "timings": [
+                {
+                    "benchmark": "Schema.match_columns",
+                    "parameters": {"schemas": schemas},
+                    "min_seconds": seconds,
+                }
+            ]
+        }
+
+    [comparison] = compare(baseline(1.0), baseline(1.5))
+    assert comparison.ratio == 1.5
+    assert comparison.regressed(0.1)
+    assert not comparison.regressed(0.5)
+    # Benchmarks run with different parameters aren't compared
+    assert compare(baseline(1.0), baseline(1.0, schemas=20)) == []
+
+
+def test_main(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    output = tmp_path / "baseline.json"
+    args = ["run", "--quick", "--headers", "1", "--repeat", "1"]
+    assert (
+        main(args + ["--benchmark", "Schema.match_columns", "--output", str(output)])
+        == 0
+    )
+    assert json.loads(output.read_text())["timings"]
+    assert main(["compare", str(output), str(output), "--tolerance", "0"]) == 0
+    assert "0 of" in capsys.readouterr().out
+
+    slower = json.loads(output.read_text())
+    for timing in slower["timings"]:
+        timing["min_seconds"] *= 2
+    slower_path = tmp_path / "slower.json"
+    slower_path.write_text(json.dumps(slower))
+    assert main(["compare", str(output), str(slower_path)]) == 1
@@ -0,0 +1,121 @@
+import random
+import re
+from typing import List
+
+import pytest
+
+from .context import (
+    AmbigiousColumn,
+    AmbigiousColumns,
+    BitmaskSchemaSet,
+    ColumnDefinition,
+    RegexColumn,
+    StringColumn,
+    Schema,
+    SchemaSet,
+    find_best_matching_schema,
+)
+from .helpers import outcome, random_headers, random_schemas
+
+
+@pytest.fixture(params=[False, True], ids=["int", "numpy"])
+def use_numpy(request) -> bool:
+    if request.param:
+        pytest.importorskip("numpy")
+    return request.param
+
+
+def test_same_as_schema_set(use_numpy: bool) -> None:
+    rng = random.Random(1234)
+    schemas = random_schemas(rng, 300, strings=100, max_columns=8)
+    schema_set = SchemaSet(schemas)
+    bitmask_schema_set = BitmaskSchemaSet(schemas, use_numpy=use_numpy)
+    for columns in random_headers(rng, 100, strings=100, max_names=60):
+        assert outcome(bitmask_schema_set.find_best_matching_schemas, columns) == (
+            outcome(schema_set.find_best_matching_schemas, columns)
+        )
+        assert outcome(bitmask_schema_set.find_best_matching_schema, columns) == (
+            outcome(schema_set.find_best_matching_schema, columns)
+        )
+
+
+def test_same_as_find_best_matching_schema(use_numpy: bool) -> None:
+    # A matches fewer columns than B, but it has two columns matching "x" so matching it raises AmbigiousColumns
+    a = Schema(
+        {
+            StringColumn("a", "x"),
+            StringColumn("b", "x"),
+            StringColumn("c", "q", required=False),
+        },
+        "A",
+    )
+    b = Schema(
+        {StringColumn("a", "y"), StringColumn("b", "z"), StringColumn("c", "w")}, "B"
+    )
+    bitmask_schema_set = BitmaskSchemaSet({a, b}, use_numpy=use_numpy)
+    with pytest.raises(AmbigiousColumns):
+        find_best_matching_schema({a, b}, {"x", "y", "z", "w"})
+    with pytest.raises(AmbigiousColumns):
+        bitmask_schema_set.find_best_matching_schema({"x", "y", "z", "w"})
+
+    # Schemas with columns sharing patterns, and regexes matching more than one column name
+    rng = random.Random(5678)
+    columns: List[ColumnDefinition] = [
+        StringColumn(f"string {i}", f"name {i % 12}", required=rng.random() < 0.3)
+        for i in range(16)
+    ] + [
+        RegexColumn(f"regex {i}", re.compile(f"^name {i}"), required=False)
+        for i in range(4)
+    ]
+    names = [f"name {i}" for i in range(12)]
+    for _ in range(30):
+        schemas = {
+            Schema(set(rng.sample(columns, rng.randint(1, 5))), f"schema {i}")
+            for i in range(20)
+        }
+        bitmask_schema_set = BitmaskSchemaSet(schemas, use_numpy=use_numpy)
+        for _ in range(10):
+            header = set(rng.sample(names, rng.randint(0, len(names))))
+            assert outcome(bitmask_schema_set.find_best_matching_schema, header) == (
+                outcome(
+                    lambda header: find_best_matching_schema(schemas, header), header
+                )
+            )
+
+
+def test_ambigious_column(use_numpy: bool) -> None:
+    schema = Schema({RegexColumn("a", re.compile("column"))}, "test")
+    bitmask_schema_set = BitmaskSchemaSet({schema}, use_numpy=use_numpy)
+    with pytest.raises(AmbigiousColumn):
+        bitmask_schema_set.find_best_matching_schemas({"column a", "column b"})
+
+
+def test_ambigious_column_ignored_if_schema_does_not_match(use_numpy: bool) -> None:
+    schema = Schema(
+        {StringColumn("a", "a"), RegexColumn("b", re.compile("column"))}, "test"
+    )
+    bitmask_schema_set = BitmaskSchemaSet({schema}, use_numpy=use_numpy)
+    assert bitmask_schema_set.find_best_matching_schemas({"column a", "column b"}) == []
+
+
+def test_ambigious_columns(use_numpy: bool) -> None:
+    schema = Schema(
+        {StringColumn("a", "column"), RegexColumn("b", re.compile("col"))}, "test"
+    )
+    bitmask_schema_set = BitmaskSchemaSet({schema}, use_numpy=use_numpy)
+    with pytest.raises(AmbigiousColumns) as exc_info:
+        bitmask_schema_set.find_best_matching_schemas({"column"})
+    assert exc_info.value.column_name == "column"
+    assert exc_info.value.column_matches == schema.columns
+
+
+def test_many_columns(use_numpy: bool) -> None:
+    # More than 64 distinct columns so the bitsets need more than one word
+    columns = [StringColumn(str(i), str(i)) for i in range(200)]
+    schemas = {Schema(set(columns[i : i + 10]), f"schema {i}") for i in range(190)}
+    bitmask_schema_set = BitmaskSchemaSet(schemas, use_numpy=use_numpy)
+    match = bitmask_schema_set.find_best_matching_schema(
+        {str(i) for i in range(150, 160)}
+    )
+    assert match is not None
+    assert match.schema.name == "schema 150"
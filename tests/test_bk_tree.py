@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from any_columns.bk_tree import BKTree, edit_distance
+
+
+@pytest.mark.parametrize(
+    "a,b,distance",
+    [
+        ("", "", 0),
+        ("abc", "", 3),
+        ("email", "emial", 2),
+        ("start date", "start dte", 1),
+        ("kitten", "sitting", 3),
+    ],
+)
+def test_edit_distance(a: str, b: str, distance: int) -> None:
+    assert edit_distance(a, b) == distance
+    assert edit_distance(b, a) == distance
+    assert edit_distance(a, b, distance) == distance
+    if distance > 0:
+        assert edit_distance(a, b, distance - 1) == distance
+
+
+def test_search() -> None:
+    rng = random.Random(1234)
+    words = ["".join(rng.choices("abcd", k=rng.randint(0, 6))) for _ in range(300)]
+    tree = BKTree(words)
+    assert len(tree) == len(set(words))
+    assert not tree.add(words[0])
+    for _ in range(50):
+        word = "".join(rng.choices("abcd", k=rng.randint(0, 6)))
+        for max_distance in range(3):
+            assert sorted(tree.search(word, max_distance)) == sorted(
+                (other, edit_distance(word, other))
+                for other in set(words)
+                if edit_distance(word, other) <= max_distance
+            )
+
+
+def test_empty() -> None:
+    assert BKTree().search("abc", 2) == []
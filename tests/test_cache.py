@@ -0,0 +1,118 @@
+import pytest
+
+from .context import (
+    AmbigiousMatch,
+    CacheInfo,
+    MatchCache,
+    StringColumn,
+    Schema,
+    SchemaRegistry,
+    SchemaSet,
+    find_best_matching_schema,
+    find_best_matching_schemas,
+)
+
+
+COLUMN_A = StringColumn("a", "column a")
+COLUMN_B = StringColumn("b", "column b")
+SCHEMA_A = Schema({COLUMN_A}, "schema a")
+SCHEMA_AB = Schema({COLUMN_A, COLUMN_B}, "schema ab")
+SCHEMAS = {SCHEMA_A, SCHEMA_AB}
+
+
+def test_hits_and_misses() -> None:
+    cache = MatchCache()
+    columns = {"column a", "column b"}
+    expected = find_best_matching_schema(SCHEMAS, columns)
+    assert cache.find_best_matching_schema(SCHEMAS, columns) == expected
+    assert cache.find_best_matching_schema(SCHEMAS, set(columns)) == expected
+    assert cache.find_best_matching_schema(set(SCHEMAS), columns) == expected
+    assert cache.cache_info() == CacheInfo(
+        hits=2, misses=1, evictions=0, size=1, maxsize=1024
+    )
+
+
+def test_best_matching_schemas() -> None:
+    cache = MatchCache()
+    columns = {"column a"}
+    expected = find_best_matching_schemas(SCHEMAS, columns)
+    assert cache.find_best_matching_schemas(SCHEMAS, columns) == expected
+    # Modifying the result doesn't modify the cache
+    cache.find_best_matching_schemas(SCHEMAS, columns).clear()
+    assert cache.find_best_matching_schemas(SCHEMAS, columns) == expected
+    assert cache.find_matching_schemas(SCHEMAS, columns) == {SCHEMA_A}
+
+
+def test_lru_eviction() -> None:
+    cache = MatchCache(maxsize=2)
+    cache.find_best_matching_schema(SCHEMAS, {"column a"})
+    cache.find_best_matching_schema(SCHEMAS, {"column b"})
+    # Use the first entry so the second one is least recently used
+    cache.find_best_matching_schema(SCHEMAS, {"column a"})
+    cache.find_best_matching_schema(SCHEMAS, {"column a", "column b"})
+    assert cache.cache_info() == CacheInfo(
+        hits=1, misses=3, evictions=1, size=2, maxsize=2
+    )
+    cache.find_best_matching_schema(SCHEMAS, {"column a"})
+    assert cache.cache_info().hits == 2
+    cache.find_best_matching_schema(SCHEMAS, {"column b"})
+    assert cache.cache_info().misses == 4
+
+
+def test_ambigious_match_cached() -> None:
+    cache = MatchCache()
+    schemas = {Schema({COLUMN_A}, "one"), Schema({COLUMN_A}, "two")}
+    for _ in range(2):
+        with pytest.raises(AmbigiousMatch):
+            cache.find_best_matching_schema(schemas, {"column a"})
+    assert cache.cache_info().hits == 1
+    assert cache.cache_info().misses == 1
+
+
+def test_schema_set_identity() -> None:
+    cache = MatchCache()
+    schema_set = SchemaSet(SCHEMAS)
+    other_schema_set = SchemaSet(SCHEMAS)
+    cache.find_best_matching_schema(schema_set, {"column a"})
+    cache.find_best_matching_schema(schema_set, {"column a"})
+    cache.find_best_matching_schema(other_schema_set, {"column a"})
+    assert cache.cache_info().hits == 1
+    assert cache.cache_info().size == 2
+
+
+def test_invalidate() -> None:
+    cache = MatchCache()
+    schema_set = SchemaSet(SCHEMAS)
+    cache.find_best_matching_schema(schema_set, {"column a"})
+    cache.find_best_matching_schema(SCHEMAS, {"column a"})
+    cache.invalidate(schema_set)
+    assert cache.cache_info().size == 1
+    cache.invalidate()
+    assert cache.cache_info().size == 0
+
+
+def test_registry_changes() -> None:
+    cache = MatchCache()
+    registry = SchemaRegistry({SCHEMA_A})
+    columns = {"column a", "column b"}
+    match = cache.find_best_matching_schema(registry, columns)
+    assert match is not None and match.schema == SCHEMA_A
+    assert cache.find_best_matching_schema(registry, columns) == match
+    assert cache.cache_info().hits == 1
+    # Results from before the registry changed aren't reused
+    registry.add(SCHEMA_AB)
+    match = cache.find_best_matching_schema(registry, columns)
+    assert match is not None and match.schema == SCHEMA_AB
+    registry.remove(SCHEMA_AB)
+    match = cache.find_best_matching_schema(registry, columns)
+    assert match is not None and match.schema == SCHEMA_A
+    assert cache.cache_info().hits == 1
+    # Invalidating the registry removes the results for all its versions
+    cache.find_best_matching_schema(SCHEMAS, columns)
+    cache.invalidate(registry)
+    assert cache.cache_info().size == 1
+
+
+def test_invalid_maxsize() -> None:
+    with pytest.raises(ValueError):
+        MatchCache(maxsize=0)
@@ -0,0 +1,105 @@
+import random
+import re
+
+import pytest
+
+from .context import (
+    CatalogSchemaSet,
+    RegexColumn,
+    StringColumn,
+    Schema,
+    SchemaSet,
+    dumps_catalog,
+    load_catalog,
+    loads_catalog,
+    save_catalog,
+)
+from .helpers import outcome, random_headers, random_schemas
+
+
+def test_same_as_schema_set() -> None:
+    rng = random.Random(1234)
+    schema_set = SchemaSet(random_schemas(rng, 200))
+    catalog = loads_catalog(dumps_catalog(schema_set))
+    assert isinstance(catalog, CatalogSchemaSet)
+    assert list(catalog) == list(schema_set)
+    for columns in random_headers(rng, 200):
+        assert outcome(catalog.find_best_matching_schemas, columns) == outcome(
+            schema_set.find_best_matching_schemas, columns
+        )
+        assert outcome(catalog.find_best_matching_schema, columns) == outcome(
+            schema_set.find_best_matching_schema, columns
+        )
+        assert outcome(
+            lambda columns: catalog.find_top_k_matching_schemas(columns, 3), columns
+        ) == outcome(
+            lambda columns: schema_set.find_top_k_matching_schemas(columns, 3), columns
+        )
+
+
+def test_lazy() -> None:
+    regex_column = RegexColumn("start", re.compile("^start", re.I))
+    schemas = [
+        Schema({StringColumn("hired", "hired"), regex_column}, "hires"),
+        Schema({StringColumn("name", "name"), StringColumn("end", "end")}, "terms"),
+    ]
+    catalog = loads_catalog(dumps_catalog(schemas))
+    [loaded_column] = catalog._regex_columns
+    assert loaded_column == regex_column
+    assert hash(loaded_column) == hash(regex_column)
+    # Comparing the columns didn't compile the regex
+    assert loaded_column._pattern is None
+    assert catalog.schemas._schemas == [None, None]  # type: ignore[attr-defined]
+
+    match = catalog.find_best_matching_schema({"name", "end"})
+    assert match is not None and match.schema == schemas[1]
+    assert loaded_column._pattern is None
+    match = catalog.find_best_matching_schema({"hired", "Start Date"})
+    assert match is not None and match.schema == schemas[0]
+    assert loaded_column._pattern == regex_column.pattern
+
+
+def test_file(tmp_path) -> None:
+    schemas = {Schema({StringColumn("name", "name")}, "names")}
+    path = tmp_path / "schemas.catalog"
+    save_catalog(schemas, path)
+    catalog = load_catalog(path)
+    assert set(catalog) == schemas
+    match = catalog.find_best_matching_schema({"name"})
+    assert match is not None and match.schema in schemas
+
+
+def test_empty() -> None:
+    catalog = loads_catalog(dumps_catalog([]))
+    assert len(catalog) == 0
+    assert catalog.find_best_matching_schema({"name"}) is None
+
+
+def test_invalid() -> None:
+    with pytest.raises(ValueError):
+        loads_catalog(b"")
+    with pytest.raises(ValueError):
+        loads_catalog(b"not a catalog at all")
+    data = bytearray(dumps_catalog([]))
+    data[8] += 1
+    with pytest.raises(ValueError):
+        loads_catalog(data)
+    with pytest.raises(ValueError):
+        loads_catalog(dumps_catalog([])[:13])
+
+
+@pytest.mark.parametrize("offset", [12, 16, 17])
+def test_other_python_version(offset: int) -> None:
+    # A catalog made with another marshal format or another version of Python
+    data = bytearray(dumps_catalog([]))
+    data[offset] += 1
+    with pytest.raises(ValueError, match="made by Python"):
+        loads_catalog(data)
+
+
+def test_unsupported_column() -> None:
+    class CustomColumn(StringColumn):
+        pass
+
+    with pytest.raises(TypeError):
+        dumps_catalog([Schema({CustomColumn("name", "name")}, "custom")])
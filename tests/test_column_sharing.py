@@ -0,0 +1,74 @@
+from typing import Any, Optional, Set
+
+import pytest
+
+from .context import (
+    AmbigiousColumn,
+    ColumnDefinition,
+    Schema,
+    SchemaSet,
+    StringColumn,
+    find_best_matching_schemas,
+)
+
+
+class CountingColumn(ColumnDefinition):
+    """A column matching any column name containing a substring, which counts how often it's evaluated"""
+
+    evaluations = 0
+
+    def __init__(self, name: str, substring: str, required: bool = True):
+        super().__init__(name, required)
+        self.substring = substring
+
+    def _key(self) -> Any:
+        return (self.name, self.substring, self.required)
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, CountingColumn):
+            return self._key() == other._key()
+        return NotImplemented
+
+    def matching_column(self, others: Set[str]) -> Optional[str]:
+        CountingColumn.evaluations += 1
+        matching_columns = {column for column in others if self.substring in column}
+        if len(matching_columns) > 1:
+            raise AmbigiousColumn(self, matching_columns)
+        for column in matching_columns:
+            return column
+        return None
+
+
+@pytest.fixture(autouse=True)
+def reset_evaluations() -> None:
+    CountingColumn.evaluations = 0
+
+
+SCHEMAS = {
+    Schema({CountingColumn("name", "name"), StringColumn("start", "start")}, "a"),
+    Schema({CountingColumn("name", "name"), StringColumn("end", "end")}, "b"),
+    # An equal definition in a different object is still only evaluated once
+    Schema({CountingColumn("name", "name")}, "c"),
+}
+
+
+def test_shared_column_evaluated_once() -> None:
+    matches = find_best_matching_schemas(SCHEMAS, {"full name", "start"})
+    assert [match.schema.name for match in matches] == ["a", "c"]
+    assert CountingColumn.evaluations == 1
+
+
+def test_shared_column_evaluated_once_schema_set() -> None:
+    schema_set = SchemaSet(SCHEMAS)
+    matches = schema_set.find_best_matching_schemas({"full name", "start"})
+    assert [match.schema.name for match in matches] == ["a", "c"]
+    assert CountingColumn.evaluations == 1
+
+
+def test_shared_ambigious_column_evaluated_once() -> None:
+    with pytest.raises(AmbigiousColumn):
+        find_best_matching_schemas(SCHEMAS, {"first name", "last name"})
+    assert CountingColumn.evaluations == 1
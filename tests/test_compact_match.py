@@ -0,0 +1,168 @@
+from dataclasses import FrozenInstanceError
+import dataclasses
+import pickle
+import re
+
+from frozendict import frozendict  # type: ignore[attr-defined]
+import pytest
+
+from .context import (
+    AmbigiousColumns,
+    FuzzyColumn,
+    NormalizedColumn,
+    RegexColumn,
+    StringColumn,
+    Schema,
+    SchemaMatch,
+    SchemaSet,
+    find_best_matching_schema,
+)
+
+COLUMN_A = StringColumn("a", "column a")
+COLUMN_B = StringColumn("b", "column b", required=False)
+COLUMN_C = RegexColumn("c", re.compile("c$"), required=False)
+SCHEMA = Schema({COLUMN_A, COLUMN_B, COLUMN_C}, "test")
+EXPECTED = frozendict({"column a": COLUMN_A, "column c": COLUMN_C})
+
+
+def test_matching_columns_built_lazily() -> None:
+    match = find_best_matching_schema({SCHEMA}, {"column a", "column c"})
+    assert match is not None
+    assert match._matching_columns is None
+    assert match.matching_columns == EXPECTED
+    # It's only built once
+    assert match.matching_columns is match.matching_columns
+
+    schema_match = SCHEMA.match_columns({"column a", "column c"})
+    assert schema_match.matches
+    assert schema_match._matching_columns is None
+    assert schema_match.matching_columns == EXPECTED
+
+
+def test_same_as_eager_match() -> None:
+    eager = SchemaMatch(SCHEMA, EXPECTED)
+    compact = find_best_matching_schema({SCHEMA}, {"column a", "column c"})
+    other = SchemaSet({SCHEMA}).find_best_matching_schema({"column a", "column c"})
+    assert compact == eager
+    assert eager == compact
+    assert compact == other
+    assert compact != SchemaMatch(SCHEMA, frozendict({"column a": COLUMN_A}))
+    assert hash(compact) == hash(eager)
+    assert repr(compact) == repr(eager)
+    assert repr(compact).startswith("SchemaMatch(schema=Schema(")
+    assert len({compact, eager, other}) == 1
+
+
+def test_pickle() -> None:
+    match = find_best_matching_schema({SCHEMA}, {"column a", "column c"})
+    assert pickle.loads(pickle.dumps(match)) == match
+    schema_match = SCHEMA.match_columns({"column a"})
+    assert pickle.loads(pickle.dumps(schema_match)) == schema_match
+
+
+def test_dataclass() -> None:
+    match = find_best_matching_schema({SCHEMA}, {"column a", "column c"})
+    assert match is not None
+    assert dataclasses.is_dataclass(match)
+    assert [field.name for field in dataclasses.fields(match)] == [
+        "schema",
+        "matching_columns",
+    ]
+    assert dataclasses.astuple(match) == (dataclasses.astuple(SCHEMA), EXPECTED)
+    other_schema = Schema(set(SCHEMA.columns), "other")
+    replaced = dataclasses.replace(match, schema=other_schema)
+    assert replaced == SchemaMatch(other_schema, EXPECTED)
+    assert dataclasses.replace(match) == match
+
+    schema_match = SCHEMA.match_columns({"column a"})
+    assert dataclasses.is_dataclass(schema_match)
+    assert [field.name for field in dataclasses.fields(schema_match)] == [
+        "matches",
+        "matching_columns",
+    ]
+    assert not dataclasses.replace(schema_match, matches=False).matches
+    assert dataclasses.asdict(schema_match) == {
+        "matches": True,
+        "matching_columns": {"column a": COLUMN_A},
+    }
+
+
+def test_frozen() -> None:
+    match = find_best_matching_schema({SCHEMA}, {"column a"})
+    assert match is not None
+    with pytest.raises(FrozenInstanceError):
+        match.schema = SCHEMA  # type: ignore[misc]
+    with pytest.raises(FrozenInstanceError):
+        match.matching_columns = EXPECTED  # type: ignore[misc]
+
+
+def test_ambigious_columns_reports_every_match() -> None:
+    columns = {
+        StringColumn("a", "a"),
+        RegexColumn("a regex", re.compile("^a"), required=False),
+        NormalizedColumn("a normalized", "A", required=False),
+        StringColumn("b", "b"),
+        RegexColumn("b regex", re.compile("^b"), required=False),
+    }
+    schema = Schema(columns, "ambigious")
+    with pytest.raises(AmbigiousColumns) as exc_info:
+        schema.match_columns({"a", "b"})
+    # Required columns are matched first, in the order they're stored in the schema
+    column_name = next(
+        column.pattern
+        for column in schema._required_columns
+        if isinstance(column, StringColumn)
+    )
+    assert exc_info.value.column_name == column_name
+    assert exc_info.value.column_matches == {
+        column for column in columns if column.name.startswith(column_name)
+    }
+
+
+def test_columns_use_slots() -> None:
+    for column in [
+        COLUMN_A,
+        COLUMN_C,
+        NormalizedColumn("a", "a"),
+        FuzzyColumn("a", "a"),
+    ]:
+        # The attributes are in slots, so the `__dict__` is only there for callers' own attributes
+        assert vars(column) == {}
+        assert hash(column) == hash(column._key())
+        # The cached hash isn't pickled, since strings hash differently in other processes
+        assert "_hash" not in column.__getstate__()
+        assert pickle.loads(pickle.dumps(column)) == column
+
+
+def test_column_hashed_again_when_attributes_change() -> None:
+    column = StringColumn("a", "a")
+    hash(column)
+    column.required = False
+    assert column == StringColumn("a", "a", False)
+    assert hash(column) == hash(StringColumn("a", "a", False))
+    column.name = "b"
+    assert hash(column) == hash(StringColumn("b", "a", False))
+    normalized = NormalizedColumn("a", "a")
+    hash(normalized)
+    normalized.required = False
+    assert hash(normalized) == hash(NormalizedColumn("a", "a", required=False))
+
+
+def test_columns_accept_other_attributes() -> None:
+    column = StringColumn("a", "a")
+    column.note = "x"  # type: ignore[attr-defined]
+    assert column.note == "x"  # type: ignore[attr-defined]
+    # Attributes which aren't part of the key don't change the hash or equality
+    assert column == StringColumn("a", "a")
+    assert hash(column) == hash(StringColumn("a", "a"))
+    copy = pickle.loads(pickle.dumps(column))
+    assert copy == column
+    assert copy.note == "x"  # type: ignore[attr-defined]
+
+
+def test_regex_column_hashed_again_when_pattern_changes() -> None:
+    column = RegexColumn("a", re.compile("a"))
+    before = hash(column)
+    column.pattern = re.compile("b")
+    assert hash(column) == hash(RegexColumn("a", re.compile("b")))
+    assert hash(column) != before
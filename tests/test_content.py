@@ -0,0 +1,179 @@
+from typing import Iterator, List
+
+import pytest
+
+from .context import (
+    AmbigiousColumn,
+    AmbigiousColumns,
+    Schema,
+    StringColumn,
+    looks_like_date,
+    looks_like_email,
+    looks_like_number,
+    match_content,
+)
+
+SCHEMA = Schema(
+    name="people",
+    columns_init={
+        StringColumn("name", "name"),
+        StringColumn("email", "email"),
+        StringColumn("start", "start date"),
+        StringColumn("salary", "salary", required=False),
+    },
+)
+DETECTORS = {
+    "email": looks_like_email,
+    "start": looks_like_date,
+    "salary": looks_like_number,
+}
+
+
+def people(count: int) -> List[List[str]]:
+    return [
+        [f"Person {i}", f"person{i}@example.com", f"2022-01-{i % 28 + 1:02}", "1,000"]
+        for i in range(count)
+    ]
+
+
+def test_detectors() -> None:
+    assert looks_like_email("alice@example.com")
+    assert looks_like_email(" alice.smith+hr@mail.example.co.uk ")
+    assert not looks_like_email("alice")
+    assert not looks_like_email("alice@example")
+    assert not looks_like_email("alice@@example.com")
+
+    for number in ["0", "-12", "+3.5", ".5", "1,234,567.89", "$1,000", "1e-3", "50%"]:
+        assert looks_like_number(number), number
+    for not_number in ["", "-", ".", "1,23", "12 apples", "1.2.3", "$"]:
+        assert not looks_like_number(not_number), not_number
+
+    for date in [
+        "2022-01-31",
+        "2022-01-31T12:30:00Z",
+        "2022-01-31 12:30:00.123+01:00",
+        "1/31/2022",
+        "31.01.22",
+        "31 Jan 2022",
+        "January 31, 2022",
+    ]:
+        assert looks_like_date(date), date
+    for not_date in ["", "2022", "31 January", "1/31", "yesterday"]:
+        assert not looks_like_date(not_date), not_date
+
+
+def test_match_by_content() -> None:
+    header = ["name", "col1", "Unnamed: 2", "col3"]
+    match = match_content(SCHEMA, header, people(50), DETECTORS)
+    assert match is not None
+    assert {
+        column_name: column.name
+        for column_name, column in match.matching_columns.items()
+    } == {"name": "name", "col1": "email", "Unnamed: 2": "start", "col3": "salary"}
+
+
+def test_name_match_takes_priority() -> None:
+    # "email" is found by name, so the other email-like column isn't considered
+    header = ["name", "email", "start date", "backup email"]
+    rows = [["Alice", "a@example.com", "2022-01-01", "b@example.com"]]
+    match = match_content(SCHEMA, header, rows, DETECTORS)
+    assert match is not None
+    assert set(match.matching_columns) == {"name", "email", "start date"}
+
+
+def test_threshold() -> None:
+    header = ["name", "email", "when"]
+    rows = [["Alice", "a@example.com", "2022-01-01"]] * 9 + [
+        ["Bob", "b@example.com", "unknown"]
+    ]
+    assert match_content(SCHEMA, header, rows, DETECTORS, threshold=0.9) is not None
+    assert match_content(SCHEMA, header, rows, DETECTORS, threshold=0.95) is None
+
+
+def test_empty_values_are_ignored() -> None:
+    header = ["name", "email", "when"]
+    rows = [["Alice", "a@example.com", ""], ["Bob", "b@example.com"]] * 5 + [
+        ["Carol", "c@example.com", "2022-01-01"]
+    ]
+    assert match_content(SCHEMA, header, rows, DETECTORS) is not None
+    # A column with no values at all doesn't match anything
+    assert match_content(SCHEMA, header, rows[:10], DETECTORS) is None
+
+
+def test_stops_early() -> None:
+    consumed = 0
+
+    def rows() -> Iterator[List[str]]:
+        nonlocal consumed
+        for row in people(1000):
+            consumed += 1
+            yield row
+
+    # Every value passes, so each column is accepted once most of the sample has passed
+    header = ["name", "col1", "col2", "col3"]
+    assert match_content(SCHEMA, header, rows(), DETECTORS, sample_size=500)
+    assert consumed < 500
+
+    # Nothing passes, so each column is rejected once too much of the sample has failed
+    consumed = 0
+    header = ["name", "email", "start date", "col3"]
+    assert match_content(SCHEMA, header, rows(), {"salary": looks_like_email})
+    assert consumed < 100
+
+
+def test_sample_size_limits_rows_read() -> None:
+    consumed = 0
+
+    def rows() -> Iterator[List[str]]:
+        nonlocal consumed
+        for i in range(1000):
+            consumed += 1
+            # Alternate so the outcome is never certain until the sample runs out
+            yield ["Alice", "a@example.com", "2022-01-01" if i % 2 else "?"]
+
+    header = ["name", "email", "when"]
+    assert match_content(SCHEMA, header, rows(), DETECTORS, 40, 0.5) is not None
+    assert consumed <= 40
+
+
+def test_ambiguous() -> None:
+    header = ["name", "email", "date1", "date2"]
+    rows = [["Alice", "a@example.com", "2022-01-01", "2022-02-01"]]
+    with pytest.raises(AmbigiousColumn):
+        match_content(SCHEMA, header, rows, DETECTORS)
+
+    # Both detectors accept the same column
+    header = ["name", "col1", "start date"]
+    rows = [["Alice", "a@example.com", "2022-01-01"]]
+    with pytest.raises(AmbigiousColumns):
+        match_content(
+            SCHEMA,
+            header,
+            rows,
+            {"email": looks_like_email, "salary": looks_like_email},
+        )
+
+
+def test_duplicate_header_names_are_not_assigned() -> None:
+    header = ["name", "col", "col", "start date"]
+    rows = [["Alice", "a@example.com", "a@example.com", "2022-01-01"]]
+    assert match_content(SCHEMA, header, rows, DETECTORS) is None
+
+
+def test_missing_required_column() -> None:
+    # Nothing looks like a start date
+    header = ["name", "col1", "col2"]
+    rows = [row[:2] + row[3:] for row in people(10)]
+    assert match_content(SCHEMA, header, rows, DETECTORS) is None
+    # Without a detector, a column can only be found by name
+    header = ["name", "col1", "start date"]
+    assert match_content(SCHEMA, header, people(10), {}) is None
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError):
+        match_content(SCHEMA, ["name"], [], DETECTORS, sample_size=0)
+    with pytest.raises(ValueError):
+        match_content(SCHEMA, ["name"], [], DETECTORS, threshold=0)
+    with pytest.raises(ValueError):
+        match_content(SCHEMA, ["name"], [], DETECTORS, threshold=1.5)
@@ -0,0 +1,74 @@
+import datetime
+import io
+
+import pytest
+
+from .context import (
+    StringColumn,
+    Schema,
+    find_best_matching_schema,
+    read_arrow_table,
+    read_dataframe,
+)
+
+CSV = "Started,Notes,Full Name\n2022-01-01,some notes,Alice\n2022-02-01,,Bob\n"
+
+
+def get_match():
+    schema = Schema(
+        {StringColumn("name", "Full Name"), StringColumn("start date", "Started")},
+        "hires",
+    )
+    match = find_best_matching_schema({schema}, {"Started", "Notes", "Full Name"})
+    assert match is not None
+    return match
+
+
+def test_read_dataframe() -> None:
+    pytest.importorskip("pandas")
+    dataframe = read_dataframe(io.StringIO(CSV), get_match(), dtype=str)
+    assert list(dataframe.columns) == ["start date", "name"]
+    assert dataframe.to_dict("records") == [
+        {"start date": "2022-01-01", "name": "Alice"},
+        {"start date": "2022-02-01", "name": "Bob"},
+    ]
+
+
+def test_read_dataframe_usecols() -> None:
+    pytest.importorskip("pandas")
+    with pytest.raises(ValueError):
+        read_dataframe(io.StringIO(CSV), get_match(), usecols=["Notes"])
+
+
+def test_read_arrow_table() -> None:
+    pyarrow_csv = pytest.importorskip("pyarrow.csv")
+    table = read_arrow_table(
+        io.BytesIO(CSV.encode()),
+        get_match(),
+        convert_options=pyarrow_csv.ConvertOptions(strings_can_be_null=True),
+    )
+    assert sorted(table.column_names) == ["name", "start date"]
+    assert table.column("name").to_pylist() == ["Alice", "Bob"]
+    assert table.column("start date").to_pylist() == [
+        datetime.date(2022, 1, 1),
+        datetime.date(2022, 2, 1),
+    ]
+
+
+def test_read_arrow_table_reuses_options() -> None:
+    pyarrow_csv = pytest.importorskip("pyarrow.csv")
+    convert_options = pyarrow_csv.ConvertOptions(strings_can_be_null=True)
+    read_arrow_table(
+        io.BytesIO(CSV.encode()), get_match(), convert_options=convert_options
+    )
+    # The caller's options aren't changed, so they can be used for a file with other columns
+    assert convert_options.include_columns == []
+    assert convert_options.strings_can_be_null
+    other = "Name,Start\nAlice,2022-01-01\n"
+    schema = Schema({StringColumn("name", "Name")}, "names")
+    match = find_best_matching_schema({schema}, {"Name", "Start"})
+    assert match is not None
+    table = read_arrow_table(
+        io.BytesIO(other.encode()), match, convert_options=convert_options
+    )
+    assert table.column_names == ["name"]
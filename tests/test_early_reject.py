@@ -0,0 +1,73 @@
+import re
+
+from frozendict import frozendict  # type: ignore[attr-defined]
+import pytest
+
+from .context import (
+    AmbigiousColumn,
+    RegexColumn,
+    StringColumn,
+    Schema,
+    SchemaSet,
+    find_best_matching_schemas,
+    profile_matching,
+)
+
+
+def test_missing_required_column_returns_no_columns() -> None:
+    schema = Schema(
+        {StringColumn("a", "column a"), StringColumn("b", "column b")}, "test"
+    )
+    schema_match = schema.match_columns({"column a"})
+    assert not schema_match.matches
+    assert schema_match.matching_columns == frozendict()
+
+
+def test_ambigious_column_ignored_when_required_column_missing() -> None:
+    schema = Schema(
+        {
+            StringColumn("a", "column a"),
+            RegexColumn("b", re.compile("column b")),
+            RegexColumn("c", re.compile("other"), required=False),
+        },
+        "test",
+    )
+    columns = {"column b 1", "column b 2", "other 1", "other 2"}
+    assert not schema.match_columns(columns).matches
+    with pytest.raises(AmbigiousColumn):
+        schema.match_columns(columns | {"column a"})
+
+
+SCHEMAS = {
+    Schema({StringColumn("a", "column a")}, "a"),
+    Schema({StringColumn("a", "column a"), StringColumn("b", "column b")}, "ab"),
+    Schema(
+        {StringColumn("c", "column c"), RegexColumn("d", re.compile("column d"))},
+        "cd",
+    ),
+}
+
+
+def test_profile_counts_early_rejects() -> None:
+    with profile_matching() as profile:
+        find_best_matching_schemas(SCHEMAS, {"column a"})
+    assert profile.schemas_evaluated == 3
+    assert profile.schemas_rejected_early == 2
+    assert profile.schemas_matched == 1
+
+
+def test_profile_counts_early_rejects_schema_set() -> None:
+    schema_set = SchemaSet(SCHEMAS)
+    with profile_matching() as profile:
+        schema_set.find_best_matching_schemas({"column a", "column d"})
+    # Schema "cd" is skipped by the index without looking at its RegexColumn
+    assert profile.schemas_evaluated == 2
+    assert profile.schemas_rejected_early == 1
+    assert profile.schemas_matched == 1
+
+
+def test_profile_disabled_outside_context() -> None:
+    with profile_matching() as profile:
+        pass
+    find_best_matching_schemas(SCHEMAS, {"column a"})
+    assert profile.schemas_evaluated == 0
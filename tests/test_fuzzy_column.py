@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from .context import (
+    AmbigiousColumn,
+    FuzzyColumn,
+    Normalization,
+    StringColumn,
+    Schema,
+    SchemaSet,
+)
+from .helpers import assert_same_as_functions
+
+
+def test_matching_column() -> None:
+    column = FuzzyColumn("email", "Email Address", max_distance=2)
+    assert column.matching_column({"name", "Emial Address"}) == "Emial Address"
+    assert column.matching_column({"name", "email_address"}) == "email_address"
+    assert column.matching_column({"name", "Email"}) is None
+    with pytest.raises(AmbigiousColumn):
+        column.matching_column({"email address", "emails address"})
+    with pytest.raises(ValueError):
+        FuzzyColumn("email", "email", max_distance=-1)
+
+
+def test_normalization() -> None:
+    column = FuzzyColumn(
+        "start", "start date", normalization=Normalization(casefold=False)
+    )
+    assert column.matching_column({"start dte"}) == "start dte"
+    assert column.matching_column({"START DATE"}) is None
+
+
+def test_schema_set() -> None:
+    schema = Schema(
+        {
+            StringColumn("name", "name"),
+            FuzzyColumn("start", "start date"),
+            FuzzyColumn("email", "email address", max_distance=2, required=False),
+        },
+        "hires",
+    )
+    schema_set = SchemaSet({schema})
+    match = schema_set.find_best_matching_schema({"name", "Start dte", "Emial Address"})
+    assert match is not None
+    assert match.matching_columns == {
+        "name": StringColumn("name", "name"),
+        "Start dte": FuzzyColumn("start", "start date"),
+        "Emial Address": FuzzyColumn(
+            "email", "email address", max_distance=2, required=False
+        ),
+    }
+    assert schema_set.find_best_matching_schema({"name", "start"}) is None
+    with pytest.raises(AmbigiousColumn):
+        schema_set.find_best_matching_schema({"name", "start date", "start dates"})
+
+
+def fuzzy_column(rng: random.Random, pattern: str, required: bool) -> FuzzyColumn:
+    return FuzzyColumn(
+        pattern, pattern, max_distance=rng.randint(0, 2), required=required
+    )
+
+
+def test_same_as_functions() -> None:
+    patterns = ["start date", "end date", "email address", "full name", "phone"]
+    names = [
+        "start date",
+        "start dte",
+        "end date",
+        "end dates",
+        "email address",
+        "Emial Address",
+        "full name",
+        "fullname",
+        "phone",
+        "phones",
+    ]
+    assert_same_as_functions(fuzzy_column, patterns, names)
@@ -0,0 +1,160 @@
+from pathlib import Path
+import json
+import re
+
+import pytest
+
+from any_columns.__main__ import main
+
+from .context import RegexColumn, StringColumn, Schema, save_catalog
+
+CATALOG = """
+import re
+
+from any_columns import RegexColumn, Schema, StringColumn
+
+NAME = StringColumn("name", "name")
+schemas = {
+    Schema({NAME, StringColumn("start", "start date")}, "hires"),
+    Schema({NAME, StringColumn("end", "termination date")}, "terms"),
+    Schema({NAME, RegexColumn("email", re.compile("mail"))}, "contacts"),
+}
+
+
+def other_schemas():
+    return {Schema({NAME}, "names")}
+"""
+
+
+@pytest.fixture
+def files(tmp_path: Path) -> Path:
+    directory = tmp_path / "files"
+    (directory / "nested").mkdir(parents=True)
+    (directory / "hires.csv").write_text("name,start date\nJohn,2022-01-01\n")
+    (directory / "terms.CSV").write_text("name;termination date\nJohn;2022-01-15\n")
+    (directory / "nothing.csv").write_text("a,b\n1,2\n")
+    (directory / "ambiguous.csv").write_text("name,start date,termination date\n")
+    (directory / "emails.csv").write_text("name,email,e-mail\n")
+    (directory / "notes.txt").write_text("name,start date\n")
+    (directory / "nested" / "nested.csv").write_text("name,start date\n")
+    (directory / "broken.xlsx").write_bytes(b"not a workbook")
+    return directory
+
+
+def run(args: list, tmp_path: Path) -> dict:
+    output = tmp_path / "report.json"
+    assert main(args + ["--output", str(output)]) == 0
+    return json.loads(output.read_text())
+
+
+def test_scan_directory(tmp_path: Path, files: Path) -> None:
+    catalog = tmp_path / "catalog.py"
+    catalog.write_text(CATALOG)
+    report = run([str(catalog), str(files), "--workers", "2"], tmp_path)
+    assert report["summary"] == {
+        "matched": 2,
+        "no match": 1,
+        "ambiguous": 2,
+        "error": 1,
+    }
+    by_name = {Path(file["path"]).name: file for file in report["files"]}
+    # Only files with a CSV or workbook suffix are scanned, and subdirectories are skipped
+    assert set(by_name) == {
+        "hires.csv",
+        "terms.CSV",
+        "nothing.csv",
+        "ambiguous.csv",
+        "emails.csv",
+        "broken.xlsx",
+    }
+    assert by_name["hires.csv"]["schema"] == "hires"
+    assert by_name["hires.csv"]["columns"] == {"name": "name", "start date": "start"}
+    assert by_name["terms.CSV"]["header"] == ["name", "termination date"]
+    assert by_name["nothing.csv"]["status"] == "no match"
+    assert by_name["ambiguous.csv"]["schemas"] == ["hires", "terms"]
+    assert by_name["ambiguous.csv"]["error"] == (
+        "AmbigiousMatch: schemas hires, terms match equally well"
+    )
+    assert by_name["emails.csv"]["error"] == (
+        "AmbigiousColumn: column 'email' matches ['e-mail', 'email']"
+    )
+    assert by_name["broken.xlsx"]["status"] == "error"
+    assert "stats" not in report
+    assert "profile" not in report
+
+
+def test_recursive_and_files(tmp_path: Path, files: Path) -> None:
+    catalog = tmp_path / "catalog.py"
+    catalog.write_text(CATALOG)
+    report = run(
+        [
+            f"{catalog}:other_schemas",
+            str(files),
+            str(files / "notes.txt"),
+            "--recursive",
+        ],
+        tmp_path,
+    )
+    paths = [Path(file["path"]) for file in report["files"]]
+    assert files / "nested" / "nested.csv" in paths
+    # Files named on the command line are scanned whatever their suffix
+    assert paths[-1] == files / "notes.txt"
+    assert report["files"][-1]["schema"] == "names"
+
+
+def test_catalog_file(tmp_path: Path, files: Path) -> None:
+    catalog = tmp_path / "schemas.catalog"
+    start = RegexColumn("start", re.compile("^START DATE$", re.IGNORECASE))
+    save_catalog({Schema({StringColumn("name", "name"), start}, "x")}, catalog)
+    report = run([str(catalog), str(files / "hires.csv")], tmp_path)
+    assert report["files"][0]["schema"] == "x"
+    assert report["files"][0]["columns"] == {"name": "name", "start date": "start"}
+
+
+def test_stats_and_profile(
+    tmp_path: Path, files: Path, capsys: pytest.CaptureFixture
+) -> None:
+    catalog = tmp_path / "catalog.py"
+    catalog.write_text(CATALOG)
+    report = run(
+        [str(catalog), str(files), "--stats", "--profile", "--top", "1"], tmp_path
+    )
+    stats = report["stats"]
+    assert stats["files"] == 6
+    assert stats["distinct_headers"] == 5
+    for stage in ["read_seconds", "parse_seconds", "match_seconds", "total_seconds"]:
+        assert stats[stage] >= 0
+    assert len(report["profile"]["schemas"]) == 1
+    assert len(report["profile"]["columns"]) == 1
+    assert report["profile"]["schemas_evaluated"] > 0
+    err = capsys.readouterr().err
+    assert "Scanned 6 files: 2 matched, 1 no match, 2 ambiguous, 1 error" in err
+    assert "match_seconds" in err
+    assert "Slowest schemas:" in err
+
+
+def test_match_processes(tmp_path: Path, files: Path) -> None:
+    catalog = tmp_path / "catalog.py"
+    catalog.write_text(CATALOG)
+    in_process = run([str(catalog), str(files)], tmp_path)
+    assert run([str(catalog), str(files), "--match-processes", "2"], tmp_path) == (
+        in_process
+    )
+
+
+def test_stdout(tmp_path: Path, files: Path, capsys: pytest.CaptureFixture) -> None:
+    catalog = tmp_path / "catalog.py"
+    catalog.write_text(CATALOG)
+    assert main([str(catalog), str(files / "hires.csv")]) == 0
+    assert json.loads(capsys.readouterr().out)["summary"]["matched"] == 1
+
+
+def test_invalid_arguments(tmp_path: Path, files: Path) -> None:
+    catalog = tmp_path / "catalog.py"
+    catalog.write_text(CATALOG)
+    with pytest.raises(SystemExit):
+        main([f"{catalog}:missing", str(files)])
+    with pytest.raises(SystemExit):
+        main(["any_columns.no_such_module", str(files)])
+    with pytest.raises(SystemExit):
+        main([str(catalog), str(files), "--profile", "--match-processes", "2"])
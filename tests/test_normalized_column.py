@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from .context import (
+    AmbigiousColumn,
+    Normalization,
+    NormalizedColumn,
+    StringColumn,
+    Schema,
+    SchemaSet,
+)
+from .helpers import assert_same_as_functions
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "start date",
+        "Start Date",
+        " START   date ",
+        "start-date",
+        "Start_Date",
+        "ｓｔａｒｔ date",
+    ],
+)
+def test_normalize(text: str) -> None:
+    assert Normalization().normalize(text) == "start date"
+
+
+def test_normalize_options() -> None:
+    assert Normalization(casefold=False).normalize("Start-Date") == "Start Date"
+    assert (
+        Normalization(strip_punctuation=False).normalize(" Start-Date ") == "start-date"
+    )
+    assert (
+        Normalization(collapse_whitespace=False).normalize(" Start-Date ")
+        == " start date "
+    )
+    assert Normalization(nfkc=False).normalize("ｆｉｌｅ") == "ｆｉｌｅ"
+    assert Normalization().normalize("ｆｉｌｅ") == "file"
+    # Casefolding ß gives ss
+    assert Normalization().normalize("STRASSE") == Normalization().normalize("Straße")
+
+
+def test_matching_column() -> None:
+    column = NormalizedColumn("start", "Start Date")
+    assert column.matching_column({"name", "start_date"}) == "start_date"
+    assert column.matching_column({"name", "started"}) is None
+    with pytest.raises(AmbigiousColumn):
+        column.matching_column({"start date", "Start-Date"})
+
+
+def test_equality() -> None:
+    assert NormalizedColumn("start", "Start Date") == NormalizedColumn(
+        "start", "start-date"
+    )
+    assert NormalizedColumn("start", "Start Date") != NormalizedColumn(
+        "start", "Start Date", normalization=Normalization(casefold=False)
+    )
+    assert NormalizedColumn("start", "start date") != StringColumn(
+        "start", "start date"
+    )
+
+
+def normalized_column(
+    rng: random.Random, pattern: str, required: bool
+) -> NormalizedColumn:
+    return NormalizedColumn(pattern, pattern, required=required)
+
+
+def test_same_as_functions() -> None:
+    patterns = [f"Column {i}" for i in range(30)]
+    names = patterns + [f"column_{i}" for i in range(10)]
+    assert_same_as_functions(normalized_column, patterns, names)
+
+
+def test_schema_set() -> None:
+    schema = Schema(
+        {StringColumn("name", "name"), NormalizedColumn("start", "Start Date")},
+        "hires",
+    )
+    schema_set = SchemaSet({schema})
+    match = schema_set.find_best_matching_schema({"name", "START_DATE"})
+    assert match is not None
+    assert match.matching_columns == {
+        "name": StringColumn("name", "name"),
+        "START_DATE": NormalizedColumn("start", "Start Date"),
+    }
+    assert schema_set.find_best_matching_schema({"name", "started"}) is None
+    with pytest.raises(AmbigiousColumn):
+        schema_set.find_best_matching_schema({"name", "start date", "Start-Date"})
@@ -0,0 +1,182 @@
+from typing import List
+import json
+import re
+
+import pytest
+
+from .context import (
+    AmbigiousColumn,
+    BitmaskSchemaSet,
+    MatchProfile,
+    RegexColumn,
+    StringColumn,
+    Schema,
+    SchemaSet,
+    find_best_matching_schemas,
+    profile_matching,
+)
+
+NAME = StringColumn("name", "name")
+EMAIL = RegexColumn("email", re.compile("e-?mail", re.IGNORECASE))
+PHONE = RegexColumn("phone", re.compile("phone"), required=False)
+
+PEOPLE = Schema({NAME, EMAIL, PHONE}, "people")
+NAMES = Schema({NAME}, "names")
+ORDERS = Schema({StringColumn("order", "order id")}, "orders")
+SCHEMAS = {PEOPLE, NAMES, ORDERS}
+COLUMNS = {"name", "Email", "phone number"}
+
+
+def test_schema_stats() -> None:
+    with profile_matching() as profile:
+        find_best_matching_schemas(SCHEMAS, COLUMNS)
+    assert profile.schema_stats[PEOPLE].as_dict() == {
+        "evaluations": 1,
+        "rejected_early": 0,
+        "matches": 1,
+        "seconds": profile.schema_stats[PEOPLE].seconds,
+    }
+    assert profile.schema_stats[PEOPLE].seconds > 0
+    assert profile.schema_stats[NAMES].matches == 1
+    assert profile.schema_stats[ORDERS].rejected_early == 1
+    assert profile.schema_stats[ORDERS].matches == 0
+
+
+def test_column_stats() -> None:
+    with profile_matching() as profile:
+        find_best_matching_schemas(SCHEMAS, COLUMNS)
+    # NAME is shared by two schemas but only evaluated once
+    assert profile.column_stats[NAME].evaluations == 1
+    assert profile.column_stats[NAME].regex_searches == 0
+    assert profile.column_stats[EMAIL].evaluations == 1
+    assert profile.column_stats[EMAIL].regex_searches == len(COLUMNS)
+    assert profile.column_stats[PHONE].regex_searches == len(COLUMNS)
+    assert profile.regex_searches == 2 * len(COLUMNS)
+    assert profile.regex_scans == 0
+
+
+def test_match_columns() -> None:
+    with profile_matching() as profile:
+        PEOPLE.match_columns(COLUMNS)
+        PEOPLE.match_columns({"Email"})
+    assert profile.schema_stats[PEOPLE].evaluations == 2
+    assert profile.schema_stats[PEOPLE].rejected_early == 1
+    # The required columns are checked first, so PHONE is only evaluated if the rest of the schema matches
+    assert profile.column_stats[NAME].evaluations == 2
+    assert profile.column_stats[PHONE].evaluations == 1
+
+
+def test_ambiguous_column_is_counted() -> None:
+    with profile_matching() as profile:
+        with pytest.raises(AmbigiousColumn):
+            PEOPLE.match_columns({"name", "email", "e-mail"})
+    assert profile.schema_stats[PEOPLE].evaluations == 1
+    assert profile.schema_stats[PEOPLE].matches == 0
+    assert profile.schema_stats[PEOPLE].rejected_early == 0
+    assert profile.column_stats[EMAIL].evaluations == 1
+
+
+def test_schema_set() -> None:
+    schema_set = SchemaSet(SCHEMAS)
+    with profile_matching() as profile:
+        schema_set.find_best_matching_schemas(COLUMNS)
+    # NAMES is matched by the index alone, and ORDERS isn't a candidate at all
+    assert profile.schema_stats[NAMES].matches == 1
+    assert profile.schema_stats[PEOPLE].matches == 1
+    assert ORDERS not in profile.schema_stats
+    # The regexes are scanned for once per column name by the RegexScanner instead of being searched for one by one
+    assert profile.regex_scans == len(COLUMNS)
+    assert profile.regex_searches == 0
+    assert profile.column_stats[EMAIL].evaluations == 1
+
+
+def test_index_rejects() -> None:
+    schema_set = SchemaSet([Schema({NAME, StringColumn("age", "age")}, "ages"), NAMES])
+    with profile_matching() as profile:
+        schema_set.find_best_matching_schemas({"name"})
+    assert profile.schema_stats[NAMES].matches == 1
+    assert profile.schema_stats[schema_set.schemas[0]].rejected_early == 1
+    assert profile.schemas_evaluated == 2
+    assert profile.schemas_rejected_early == 1
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_bitmask(use_numpy: bool) -> None:
+    if use_numpy:
+        pytest.importorskip("numpy")
+    schema_set = BitmaskSchemaSet(SCHEMAS, use_numpy=use_numpy)
+    with profile_matching() as profile:
+        schema_set.find_best_matching_schemas(COLUMNS)
+    assert profile.schema_stats[PEOPLE].matches == 1
+    assert profile.schema_stats[NAMES].matches == 1
+    assert profile.schema_stats[ORDERS].rejected_early == 1
+    assert profile.schemas_evaluated == 3
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_bitmask_only_records_evaluated_schemas(use_numpy: bool) -> None:
+    if use_numpy:
+        pytest.importorskip("numpy")
+    schema_set = BitmaskSchemaSet(SCHEMAS, use_numpy=use_numpy)
+    with profile_matching() as profile:
+        schema_set.find_best_matching_schema(COLUMNS)
+    # PEOPLE matches more columns than NAMES, so NAMES is never evaluated
+    assert profile.schema_stats[PEOPLE].matches == 1
+    assert NAMES not in profile.schema_stats
+    assert profile.schemas_matched == 1
+
+    with profile_matching() as profile:
+        with pytest.raises(AmbigiousColumn):
+            schema_set.find_best_matching_schema({"name", "email", "e-mail"})
+    # PEOPLE raised, so it didn't match
+    assert profile.schema_stats[PEOPLE].evaluations == 1
+    assert profile.schema_stats[PEOPLE].matches == 0
+    assert profile.schemas_matched == 0
+
+
+def test_as_dict() -> None:
+    with profile_matching() as profile:
+        find_best_matching_schemas(SCHEMAS, COLUMNS)
+    profile_dict = json.loads(json.dumps(profile.as_dict()))
+    assert profile_dict["schemas_evaluated"] == 3
+    assert profile_dict["schemas_rejected_early"] == 1
+    assert profile_dict["schemas_matched"] == 2
+    assert profile_dict["regex_searches"] == 2 * len(COLUMNS)
+    assert {schema["name"] for schema in profile_dict["schemas"]} == {
+        "people",
+        "names",
+        "orders",
+    }
+    seconds = [schema["seconds"] for schema in profile_dict["schemas"]]
+    assert seconds == sorted(seconds, reverse=True)
+    [email] = [
+        column for column in profile_dict["columns"] if column["name"] == "email"
+    ]
+    assert email["type"] == "RegexColumn"
+    assert email["pattern"] == "e-?mail"
+    assert email["evaluations"] == 1
+
+
+def test_callback() -> None:
+    profiles: List[MatchProfile] = []
+    with profile_matching(profiles.append) as profile:
+        find_best_matching_schemas(SCHEMAS, COLUMNS)
+        assert profiles == []
+    assert profiles == [profile]
+
+    with pytest.raises(AmbigiousColumn):
+        with profile_matching(profiles.append) as profile:
+            PEOPLE.match_columns({"name", "email", "e-mail"})
+    assert profiles[-1] is profile
+    assert profile.schemas_evaluated == 1
+
+
+def test_disabled() -> None:
+    with profile_matching() as profile:
+        pass
+    find_best_matching_schemas(SCHEMAS, COLUMNS)
+    SchemaSet(SCHEMAS).find_best_matching_schemas(COLUMNS)
+    assert profile.schema_stats == {}
+    assert profile.column_stats == {}
+    assert profile.regex_searches == 0
+    assert profile.regex_scans == 0
@@ -0,0 +1,122 @@
+import csv
+import io
+
+import pytest
+
+from .context import (
+    RowProjector,
+    StringColumn,
+    Schema,
+    SchemaSet,
+    find_best_matching_schema,
+    read_rows,
+)
+
+NAME = StringColumn("name", "Full Name")
+START = StringColumn("start date", "Started")
+SCHEMA = Schema({NAME, START, StringColumn("end", "Ended", required=False)}, "hires")
+HEADER = ["Started", "Notes", "Full Name"]
+ROW = ["2022-01-01", "some notes", "Alice"]
+
+
+def get_match():
+    match = find_best_matching_schema({SCHEMA}, set(HEADER))
+    assert match is not None
+    return match
+
+
+def test_dict() -> None:
+    projector = get_match().projector(HEADER)
+    assert projector(ROW) == {"start date": "2022-01-01", "name": "Alice"}
+
+
+def test_tuple() -> None:
+    projector = get_match().projector(HEADER, "tuple")
+    assert projector.names == ("start date", "name")
+    assert projector(ROW) == ("2022-01-01", "Alice")
+
+
+def test_namedtuple() -> None:
+    projector = get_match().projector(HEADER, "namedtuple")
+    row = projector(ROW)
+    assert row == ("2022-01-01", "Alice")
+    # "start date" isn't a valid identifier, so it's renamed
+    assert row.name == "Alice"
+    assert row._0 == "2022-01-01"
+
+
+def test_one_column() -> None:
+    schema = Schema({NAME}, "names")
+    match = find_best_matching_schema({schema}, set(HEADER))
+    assert match is not None
+    assert match.projector(HEADER, "tuple")(ROW) == ("Alice",)
+
+
+def test_no_columns() -> None:
+    schema = Schema({StringColumn("end", "Ended", required=False)}, "optional")
+    match = find_best_matching_schema({schema}, set(HEADER))
+    assert match is not None
+    assert match.projector(HEADER, "tuple")(ROW) == ()
+    assert match.projector(HEADER, "dict")(ROW) == {}
+
+
+def test_invalid_header() -> None:
+    with pytest.raises(ValueError):
+        get_match().projector(["Full Name"])
+    with pytest.raises(ValueError):
+        get_match().projector(HEADER + ["Started"])
+
+
+def test_invalid_output() -> None:
+    with pytest.raises(ValueError):
+        RowProjector(get_match(), HEADER, "list")  # type: ignore[arg-type]
+
+
+def test_read_rows() -> None:
+    file = io.StringIO(
+        "Started,Notes,Full Name\n2022-01-01,some notes,Alice\n2022-02-01,,Bob\n"
+    )
+    rows = read_rows(file, SchemaSet({SCHEMA}), "tuple")
+    assert rows.match == get_match()
+    assert rows.header == HEADER
+    assert list(rows) == [("2022-01-01", "Alice"), ("2022-02-01", "Bob")]
+
+
+def test_read_rows_no_match() -> None:
+    file = io.StringIO("a,b\n1,2\n")
+    rows = read_rows(file, {SCHEMA})
+    assert rows.match is None
+    assert list(rows) == []
+
+
+def test_short_rows() -> None:
+    projector = get_match().projector(HEADER)
+    assert projector(["2022-01-01", "some notes"]) == {
+        "start date": "2022-01-01",
+        "name": None,
+    }
+    assert projector([]) == {"start date": None, "name": None}
+    assert get_match().projector(HEADER, "tuple", restval="")(["2022-01-01"]) == (
+        "2022-01-01",
+        "",
+    )
+    one_column = find_best_matching_schema({Schema({NAME}, "names")}, set(HEADER))
+    assert one_column is not None
+    assert one_column.projector(HEADER, "tuple")(["2022-01-01"]) == (None,)
+
+
+def test_read_rows_blank_and_short_rows() -> None:
+    file = io.StringIO(
+        "Started,Notes,Full Name\n\n2022-01-01,some notes,Alice\n\n2022-02-01\n"
+    )
+    rows = read_rows(file, {SCHEMA}, "tuple")
+    assert list(rows) == [("2022-01-01", "Alice"), ("2022-02-01", None)]
+
+    # The same rows as csv.DictReader
+    file.seek(0)
+    expected = [
+        {"start date": row["Started"], "name": row["Full Name"]}
+        for row in csv.DictReader(file, restval="missing")
+    ]
+    file.seek(0)
+    assert list(read_rows(file, {SCHEMA}, restval="missing")) == expected
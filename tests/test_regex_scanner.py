@@ -0,0 +1,106 @@
+import re
+
+import pytest
+
+from any_columns.aho_corasick import AhoCorasick
+from any_columns.regex_literals import required_literals
+from any_columns.regex_scanner import RegexScanner
+
+
+PATTERNS = [
+    re.compile("(full )?name", re.IGNORECASE),
+    re.compile("(start date|started)", re.IGNORECASE),
+    re.compile("^id$"),
+    re.compile(r"\bdate\b"),
+    re.compile("e-?mail # with a comment", re.VERBOSE),
+    re.compile("^second line", re.MULTILINE),
+    re.compile("a.b", re.DOTALL),
+    re.compile("café", re.IGNORECASE | re.ASCII),
+    re.compile("x*"),
+    re.compile("kelvin", re.IGNORECASE),
+    re.compile("(?i:amount) due"),
+    # These can't be combined with other patterns
+    re.compile(r"(\w)\1"),
+    re.compile("(?P<word>total)"),
+    re.compile("(?i)amount"),
+]
+
+STRINGS = [
+    "",
+    "Name",
+    "Full Name",
+    "Start Date",
+    "started",
+    "id",
+    "ids",
+    "end date",
+    "enddate",
+    "email",
+    "E-Mail",
+    "first line\nsecond line",
+    "a\nb",
+    "CAFÉ",
+    "café",
+    "aa",
+    "total",
+    "AMOUNT",
+    "\u212aelvin",
+    "AMOUNT due",
+]
+
+
+@pytest.mark.parametrize("string", STRINGS)
+def test_scan_same_as_search(string: str) -> None:
+    scanner = RegexScanner(PATTERNS)
+    assert set(scanner.scan(string)) == {
+        pattern for pattern in PATTERNS if pattern.search(string)
+    }
+
+
+def test_search_all() -> None:
+    scanner = RegexScanner(PATTERNS)
+    found = scanner.search_all(STRINGS)
+    assert found == {
+        pattern: {string for string in STRINGS if pattern.search(string)}
+        for pattern in PATTERNS
+        if any(pattern.search(string) for string in STRINGS)
+    }
+
+
+def test_duplicate_patterns() -> None:
+    scanner = RegexScanner([re.compile("name"), re.compile("name")])
+    assert len(scanner) == 1
+    assert scanner.scan("name") == [re.compile("name")]
+
+
+def test_empty() -> None:
+    scanner = RegexScanner([])
+    assert not scanner
+    assert scanner.scan("name") == []
+
+
+@pytest.mark.parametrize(
+    "pattern,literals",
+    [
+        (re.compile("(start date|started)", re.IGNORECASE), {"start"}),
+        (re.compile("(begin date|started)", re.IGNORECASE), {"begin date", "started"}),
+        (re.compile("Start (Date|Time)"), {"Start "}),
+        (re.compile("^e-?mail$"), {"mail"}),
+        (re.compile("(full )?name"), {"name"}),
+        (re.compile("(?:total ){2,}amount"), {"total "}),
+        (re.compile("total|x"), None),
+        (re.compile("(a|b)c"), None),
+        (re.compile(r"\d+"), None),
+        (re.compile("(?i:amount) due"), {" due"}),
+    ],
+)
+def test_required_literals(pattern: re.Pattern, literals) -> None:
+    assert required_literals(pattern) == literals
+
+
+def test_aho_corasick() -> None:
+    automaton = AhoCorasick(["he", "she", "his", "hers"])
+    assert automaton.search("ushers") == {"he", "she", "hers"}
+    assert automaton.search("ahishe") == {"his", "she", "he"}
+    assert automaton.search("nothing") == set()
+    assert AhoCorasick([]).search("anything") == set()
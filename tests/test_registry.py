@@ -0,0 +1,120 @@
+import random
+import re
+import threading
+
+from .context import (
+    RegexColumn,
+    StringColumn,
+    Schema,
+    SchemaRegistry,
+    SchemaSet,
+)
+from .helpers import outcome, random_headers, random_schemas
+
+
+def test_same_as_schema_set() -> None:
+    rng = random.Random(1234)
+    schemas = random_schemas(rng, 200)
+    registry = SchemaRegistry(schemas[:100])
+    current = list(schemas[:100])
+    for schema in schemas[100:]:
+        if rng.random() < 0.5:
+            removed = rng.choice(current)
+            registry.remove(removed)
+            current.remove(removed)
+        assert registry.add(schema)
+        current.append(schema)
+
+    schema_set = SchemaSet(current)
+    assert list(registry) == current
+    assert len(registry) == len(current)
+    for columns in random_headers(rng, 100):
+        assert outcome(registry.find_best_matching_schemas, columns) == outcome(
+            schema_set.find_best_matching_schemas, columns
+        )
+        assert outcome(registry.find_best_matching_schema, columns) == outcome(
+            schema_set.find_best_matching_schema, columns
+        )
+        assert outcome(
+            lambda columns: registry.find_top_k_matching_schemas(columns, 3), columns
+        ) == outcome(
+            lambda columns: schema_set.find_top_k_matching_schemas(columns, 3), columns
+        )
+
+
+def test_compact() -> None:
+    schemas = random_schemas(random.Random(1234), 100)
+    registry = SchemaRegistry(schemas)
+    for schema in schemas[:80]:
+        registry.remove(schema)
+    # The empty slots were compacted
+    assert len(registry._slots) < 80
+    assert list(registry) == schemas[80:]
+    columns = {schema.name for schema in schemas} | {"column 1", "column 2"}
+    assert registry.find_best_matching_schemas(columns) == SchemaSet(
+        schemas[80:]
+    ).find_best_matching_schemas(columns)
+
+
+def test_add_remove() -> None:
+    hires = Schema(
+        {StringColumn("name", "name"), RegexColumn("start", re.compile("start"))},
+        "hires",
+    )
+    terms = Schema({StringColumn("name", "name")}, "terms")
+    registry = SchemaRegistry()
+    assert registry.find_best_matching_schema({"name", "start date"}) is None
+
+    assert registry.add(hires)
+    assert not registry.add(hires)
+    assert hires in registry
+    match = registry.find_best_matching_schema({"name", "start date"})
+    assert match is not None and match.schema == hires
+
+    registry.add(terms)
+    registry.remove(hires)
+    assert hires not in registry
+    match = registry.find_best_matching_schema({"name", "start date"})
+    assert match is not None and match.schema == terms
+    assert not registry.discard(hires)
+    assert registry.discard(terms)
+    assert registry.find_best_matching_schema({"name", "start date"}) is None
+    assert registry._regex_counts == {}
+
+
+def test_concurrent_reads() -> None:
+    rng = random.Random(1234)
+    stable = Schema(
+        {StringColumn("stable", "stable"), StringColumn("column 0", "column 0")},
+        "stable",
+    )
+    schemas = random_schemas(rng, 50)
+    registry = SchemaRegistry([stable])
+    headers = [columns | {"stable", "column 0"} for columns in random_headers(rng, 20)]
+    done = threading.Event()
+    errors = []
+
+    def read() -> None:
+        try:
+            while not done.is_set():
+                for columns in headers:
+                    matches = registry.find_best_matching_schemas(columns)
+                    assert stable in {match.schema for match in matches}
+        except Exception as e:  # pragma: no cover
+            errors.append(e)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    try:
+        for _ in range(20):
+            for schema in schemas:
+                registry.add(schema)
+            for schema in schemas:
+                registry.remove(schema)
+    finally:
+        done.set()
+        for reader in readers:
+            reader.join()
+    assert errors == []
+    assert list(registry) == [stable]
@@ -0,0 +1,113 @@
+import codecs
+
+import pytest
+
+from .context import (
+    AmbigiousMatch,
+    FileReport,
+    StringColumn,
+    Schema,
+    read_header,
+    scan_files,
+)
+
+
+def test_read_header(tmp_path) -> None:
+    path = tmp_path / "a.csv"
+    path.write_text('name,"start, date",email\nAlice,2022-01-01,a@example.com\n')
+    assert read_header(path) == ["name", "start, date", "email"]
+
+
+def test_read_header_quoted_newline(tmp_path) -> None:
+    path = tmp_path / "a.csv"
+    path.write_text('name,"start\ndate"\r\nAlice,2022-01-01\r\n')
+    assert read_header(path) == ["name", "start\ndate"]
+
+
+@pytest.mark.parametrize("delimiter", [",", ";", "\t", "|"])
+def test_read_header_delimiter(tmp_path, delimiter) -> None:
+    path = tmp_path / "a.csv"
+    path.write_text(delimiter.join(["name", "start date", "email"]) + "\n1,2,3\n")
+    assert read_header(path) == ["name", "start date", "email"]
+
+
+def test_read_header_single_column(tmp_path) -> None:
+    path = tmp_path / "a.csv"
+    path.write_text("start date\n2022-01-01\n")
+    assert read_header(path) == ["start date"]
+
+
+@pytest.mark.parametrize(
+    "bom,encoding",
+    [
+        (codecs.BOM_UTF8, "utf-8"),
+        (codecs.BOM_UTF16_LE, "utf-16-le"),
+        (codecs.BOM_UTF16_BE, "utf-16-be"),
+        (codecs.BOM_UTF32_LE, "utf-32-le"),
+    ],
+)
+def test_read_header_bom(tmp_path, bom, encoding) -> None:
+    path = tmp_path / "a.csv"
+    path.write_bytes(bom + "prénom,email\nA,b\n".encode(encoding))
+    assert read_header(path) == ["prénom", "email"]
+
+
+def test_read_header_latin_1(tmp_path) -> None:
+    path = tmp_path / "a.csv"
+    path.write_bytes("prénom,email\n".encode("latin-1"))
+    assert read_header(path) == ["prénom", "email"]
+
+
+def test_read_header_bounded(tmp_path) -> None:
+    path = tmp_path / "a.csv"
+    path.write_text("name,email\n" + "x" * 1000)
+    assert read_header(path, max_bytes=16) == ["name", "email"]
+    # The bounded read cuts off a multi-byte character
+    path.write_text("name,é\n" + "x" * 1000, encoding="utf-8")
+    assert read_header(path, max_bytes=8) == ["name", "é"]
+    path.write_text("name,email,start date\n")
+    with pytest.raises(ValueError):
+        read_header(path, max_bytes=8)
+    # The whole file fits, so there's no need for a line ending
+    path.write_text("name,email")
+    assert read_header(path, max_bytes=10) == ["name", "email"]
+
+
+def test_read_header_empty(tmp_path) -> None:
+    path = tmp_path / "a.csv"
+    path.write_text("")
+    assert read_header(path) == []
+
+
+def test_scan_files(tmp_path) -> None:
+    name = StringColumn("name", "name")
+    hires = Schema({name, StringColumn("start", "start date")}, "hires")
+    terms = Schema({name, StringColumn("end", "end date")}, "terms")
+    other = Schema({name, StringColumn("end", "termination date")}, "other terms")
+    schemas = {hires, terms, other}
+
+    (tmp_path / "hires.csv").write_text("name;start date\nAlice;2022-01-01\n")
+    (tmp_path / "terms.csv").write_text("name,end date\nBob,2022-01-01\n")
+    (tmp_path / "both.csv").write_text("name,end date,termination date\n")
+    (tmp_path / "other.csv").write_text("email\n")
+    paths = [
+        tmp_path / name
+        for name in ["hires.csv", "terms.csv", "both.csv", "other.csv", "missing.csv"]
+    ]
+
+    reports = scan_files(schemas, paths, max_workers=2)
+    assert [report.path for report in reports] == paths
+    assert [report.status for report in reports] == [
+        "matched",
+        "matched",
+        "ambiguous",
+        "no match",
+        "error",
+    ]
+    assert reports[0].match is not None and reports[0].match.schema == hires
+    assert reports[0].header == ("name", "start date")
+    assert reports[1].match is not None and reports[1].match.schema == terms
+    assert isinstance(reports[2].error, AmbigiousMatch)
+    assert reports[3] == FileReport(paths[3], ("email",))
+    assert isinstance(reports[4].error, FileNotFoundError)
+    assert reports[4].header is None
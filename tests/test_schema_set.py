@@ -0,0 +1,119 @@
+import re
+
+import pytest
+
+from .context import (
+    AmbigiousColumn,
+    AmbigiousColumns,
+    AmbigiousMatch,
+    RegexColumn,
+    StringColumn,
+    Schema,
+    SchemaSet,
+    find_best_matching_schema,
+    find_best_matching_schemas,
+    find_matching_schemas,
+)
+
+
+SCHEMAS = {
+    Schema(
+        {StringColumn("name", "name"), StringColumn("start", "start date")},
+        "alice hires",
+    ),
+    Schema(
+        {StringColumn("name", "name"), StringColumn("end", "termination date")},
+        "alice terminations",
+    ),
+    Schema(
+        {
+            StringColumn("name", "name"),
+            StringColumn("email", "email", required=False),
+        },
+        "names",
+    ),
+    Schema({StringColumn("notes", "notes", required=False)}, "anything"),
+    Schema(
+        {
+            RegexColumn("name", re.compile("(full )?name", re.IGNORECASE)),
+            RegexColumn("start", re.compile("(start date|started)", re.IGNORECASE)),
+            RegexColumn("end", re.compile("(termination date|termed)", re.IGNORECASE)),
+        },
+        "bob hires and terms",
+    ),
+}
+
+HEADERS = [
+    set(),
+    {"name"},
+    {"name", "start date"},
+    {"name", "termination date", "notes"},
+    {"name", "email", "notes"},
+    {"Full Name", "Started", "Termed"},
+    {"unrelated", "columns"},
+]
+
+
+@pytest.mark.parametrize("columns", HEADERS)
+def test_same_matches_as_functions(columns) -> None:
+    schema_set = SchemaSet(SCHEMAS)
+    assert schema_set.find_matching_schemas(columns) == find_matching_schemas(
+        SCHEMAS, columns
+    )
+    # Ties may be ordered differently, so compare the matches grouped by number of columns
+    assert {
+        (len(match.matching_columns), match)
+        for match in schema_set.find_best_matching_schemas(columns)
+    } == {
+        (len(match.matching_columns), match)
+        for match in find_best_matching_schemas(SCHEMAS, columns)
+    }
+    assert [
+        len(match.matching_columns)
+        for match in schema_set.find_best_matching_schemas(columns)
+    ] == [
+        len(match.matching_columns)
+        for match in find_best_matching_schemas(SCHEMAS, columns)
+    ]
+
+
+def test_best_match() -> None:
+    schema_set = SchemaSet(SCHEMAS)
+    match = schema_set.find_best_matching_schema({"name", "start date"})
+    assert match == find_best_matching_schema(
+        SCHEMAS, {"name", "start date"}
+    )
+    assert match is not None
+    assert match.schema.name == "alice hires"
+
+
+def test_ambigious_match() -> None:
+    column_a = StringColumn("a", "column a")
+    schema_set = SchemaSet(
+        {Schema({column_a}, "schema a"), Schema({column_a}, "schema b")}
+    )
+    with pytest.raises(AmbigiousMatch):
+        schema_set.find_best_matching_schema({"column a"})
+
+
+def test_duplicate_patterns_raise_ambigious_columns() -> None:
+    schema_set = SchemaSet(
+        {Schema({StringColumn("a", "column"), StringColumn("b", "column")}, "test")}
+    )
+    with pytest.raises(AmbigiousColumns):
+        schema_set.find_best_matching_schemas({"column"})
+
+
+def test_regex_raises_ambigious_column() -> None:
+    schema_set = SchemaSet(
+        {Schema({RegexColumn("a", re.compile("column"))}, "test")}
+    )
+    with pytest.raises(AmbigiousColumn):
+        schema_set.find_best_matching_schemas({"column a", "column b"})
+
+
+def test_container() -> None:
+    schema_set = SchemaSet(SCHEMAS)
+    assert len(schema_set) == len(SCHEMAS)
+    assert set(schema_set) == SCHEMAS
+    assert all(schema in schema_set for schema in SCHEMAS)
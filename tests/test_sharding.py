@@ -0,0 +1,119 @@
+from typing import Any, List, Set
+import random
+
+import pytest
+
+from .context import (
+    AmbigiousColumn,
+    AmbigiousColumns,
+    StringColumn,
+    Schema,
+    SchemaSet,
+    ShardedMatcher,
+    match_headers_batch,
+)
+from .helpers import outcome, random_headers, random_schemas
+
+# Few enough columns that headers often match, while headers with "column 1" and "column 10" or "column 11" are
+# ambiguous for schemas with the RegexColumn searching for "column 1"
+STRINGS = 12
+REGEXES = 2
+
+
+def random_header_list(rng: random.Random, count: int) -> List[Set[str]]:
+    return random_headers(rng, count, strings=STRINGS, regexes=REGEXES, max_names=8)
+
+
+@pytest.fixture(scope="module")
+def schemas() -> List[Schema]:
+    return random_schemas(
+        random.Random(0),
+        50,
+        strings=STRINGS,
+        regexes=REGEXES,
+        min_columns=1,
+        max_columns=3,
+    )
+
+
+@pytest.fixture(scope="module")
+def matcher(schemas: List[Schema]) -> Any:
+    with ShardedMatcher(SchemaSet(schemas), shards=3) as matcher:
+        yield matcher
+
+
+def test_same_as_schema_set(schemas: List[Schema], matcher: ShardedMatcher) -> None:
+    schema_set = SchemaSet(schemas)
+    rng = random.Random(1)
+    errors = 0
+    for header in random_header_list(rng, 100):
+        expected = outcome(schema_set.find_best_matching_schema, header)
+        assert outcome(matcher.find_best_matching_schema, header) == expected
+        errors += isinstance(expected, tuple)
+        assert outcome(matcher.find_best_matching_schemas, header) == outcome(
+            schema_set.find_best_matching_schemas, header
+        )
+        assert outcome(matcher.find_matching_schemas, header) == outcome(
+            schema_set.find_matching_schemas, header
+        )
+    # Make sure we're testing how exceptions from different shards are merged
+    assert errors
+
+
+def test_matches_contain_original_schemas(
+    schemas: List[Schema], matcher: ShardedMatcher
+) -> None:
+    for match in matcher.find_best_matching_schemas(
+        {"column 2", "column 3", "column 4"}
+    ):
+        schema = schemas[schemas.index(match.schema)]
+        assert match.schema is schema
+        for column in match.matching_columns.values():
+            assert column in schema.columns
+            # Equal columns of different schemas are the same column as far as matching is concerned
+            assert any(
+                column is original
+                for original_schema in schemas
+                for original in original_schema.columns
+            )
+
+
+def test_match_headers(schemas: List[Schema], matcher: ShardedMatcher) -> None:
+    rng = random.Random(2)
+    headers = random_header_list(rng, 50)
+    headers.append(headers[0])
+    results = matcher.match_headers(headers, chunksize=7)
+    assert results[0] is results[-1]
+    for result, expected in zip(
+        results, match_headers_batch(SchemaSet(schemas), headers)
+    ):
+        assert result.columns == expected.columns
+        assert result.match == expected.match
+        assert type(result.error) is type(expected.error)
+        if isinstance(expected.error, (AmbigiousColumn, AmbigiousColumns)):
+            assert result.error is not None
+            assert result.error.args == expected.error.args
+
+
+def test_small_catalogs() -> None:
+    with ShardedMatcher(set(), shards=2) as matcher:
+        assert matcher.shards == 1
+        assert matcher.find_best_matching_schema({"a"}) is None
+    schema = Schema({StringColumn("a", "a")}, "a")
+    with ShardedMatcher({schema}, shards=4) as matcher:
+        assert matcher.shards == 1
+        match = matcher.find_best_matching_schema({"a"})
+        assert match is not None
+        assert match.schema is schema
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError):
+        ShardedMatcher(set(), shards=0)
+
+    class CustomColumn(StringColumn):
+        pass
+
+    # Only columns which can be saved in a catalog can be sharded
+    with pytest.raises(TypeError):
+        ShardedMatcher({Schema({CustomColumn("a", "a")}, "custom")})
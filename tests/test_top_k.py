@@ -0,0 +1,79 @@
+import random
+from typing import Set
+
+import pytest
+
+from .context import (
+    AmbigiousMatch,
+    BitmaskSchemaSet,
+    StringColumn,
+    Schema,
+    SchemaSet,
+    find_best_matching_schema,
+    find_best_matching_schemas,
+    find_top_k_matching_schemas,
+    profile_matching,
+)
+
+
+def random_schemas(rng: random.Random) -> Set[Schema]:
+    columns = [
+        StringColumn(f"column {i}", f"column {i}", required=rng.random() < 0.5)
+        for i in range(30)
+    ]
+    return {
+        Schema(set(rng.sample(columns, rng.randint(0, 6))), f"schema {i}")
+        for i in range(200)
+    }
+
+
+@pytest.mark.parametrize("k", [0, 1, 2, 5, 50, 1000])
+def test_top_k_same_as_sorted(k: int) -> None:
+    rng = random.Random(k)
+    schemas = random_schemas(rng)
+    schema_set = SchemaSet(schemas)
+    bitmask_schema_set = BitmaskSchemaSet(schemas)
+    for _ in range(20):
+        columns = {f"column {i}" for i in rng.sample(range(30), 15)}
+        expected = find_best_matching_schemas(schemas, columns)[:k]
+        assert find_top_k_matching_schemas(schemas, columns, k) == expected
+        assert schema_set.find_top_k_matching_schemas(columns, k) == expected
+        assert bitmask_schema_set.find_top_k_matching_schemas(columns, k) == expected
+
+
+def test_best_same_as_sorted() -> None:
+    rng = random.Random(0)
+    schemas = random_schemas(rng)
+    for _ in range(50):
+        columns = {f"column {i}" for i in rng.sample(range(30), 15)}
+        best_matches = find_best_matching_schemas(schemas, columns)
+        top = [
+            match
+            for match in best_matches
+            if len(match.matching_columns) == len(best_matches[0].matching_columns)
+        ]
+        if len(top) > 1:
+            with pytest.raises(AmbigiousMatch) as exc_info:
+                find_best_matching_schema(schemas, columns)
+            assert exc_info.value.matches == frozenset(top)
+        else:
+            assert find_best_matching_schema(schemas, columns) == (
+                top[0] if top else None
+            )
+
+
+def test_best_skips_schemas_which_cannot_win() -> None:
+    big = Schema({StringColumn(str(i), str(i)) for i in range(5)}, "big")
+    small = {Schema({StringColumn(str(i), str(i))}, f"small {i}") for i in range(5)}
+    with profile_matching() as profile:
+        match = find_best_matching_schema(small | {big}, {str(i) for i in range(5)})
+    assert match is not None
+    assert match.schema == big
+    assert profile.schemas_evaluated == 1
+
+
+def test_negative_k() -> None:
+    with pytest.raises(ValueError):
+        find_top_k_matching_schemas(set(), set(), -1)
+    with pytest.raises(ValueError):
+        SchemaSet(set()).find_top_k_matching_schemas(set(), -1)
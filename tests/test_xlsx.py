@@ -0,0 +1,116 @@
+import zipfile
+
+import pytest
+
+from .context import read_header, read_xlsx_header
+
+MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+RELATIONSHIPS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+WORKBOOK = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="{MAIN}" xmlns:r="{RELATIONSHIPS}">
+  <sheets>
+    <sheet name="Hires" sheetId="1" r:id="rId1"/>
+    <sheet name="Terminations" sheetId="2" r:id="rId2"/>
+  </sheets>
+</workbook>"""
+
+WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Id="rId1" Type="worksheet" Target="worksheets/sheet1.xml"/>
+  <Relationship Id="rId2" Type="worksheet" Target="/xl/worksheets/sheet2.xml"/>
+</Relationships>"""
+
+SHARED_STRINGS = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<sst xmlns="{MAIN}" count="4" uniqueCount="4">
+  <si><t>name</t></si>
+  <si><r><t>start </t></r><r><rPr><b/></rPr><t>date</t></r><rPh><t>ignored</t></rPh></si>
+  <si><t>Alice</t></si>
+  <si><t>end date</t></si>
+</sst>"""
+
+
+def sheet(rows: str) -> str:
+    return f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<worksheet xmlns="{MAIN}">
+  <dimension ref="A1:E2"/>
+  <sheetData>{rows}</sheetData>
+</worksheet>"""
+
+
+SHEET_1 = sheet("""
+    <row r="1">
+      <c r="A1" t="s"><v>0</v></c>
+      <c r="B1" t="s"><v>1</v></c>
+      <c r="D1" t="inlineStr"><is><t>email</t></is></c>
+      <c r="E1"><v>2022</v></c>
+    </row>
+    <row r="2"><c r="A2" t="s"><v>2</v></c></row>
+    """)
+
+SHEET_2 = sheet("""
+    <row r="2"><c r="B2" t="s"><v>0</v></c><c r="C2" t="s"><v>3</v></c></row>
+    """)
+
+
+def write_workbook(path, shared_strings=True) -> None:
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("xl/workbook.xml", WORKBOOK)
+        archive.writestr("xl/_rels/workbook.xml.rels", WORKBOOK_RELS)
+        if shared_strings:
+            archive.writestr("xl/sharedStrings.xml", SHARED_STRINGS)
+        archive.writestr("xl/worksheets/sheet1.xml", SHEET_1)
+        archive.writestr("xl/worksheets/sheet2.xml", SHEET_2)
+
+
+def test_read_xlsx_header(tmp_path) -> None:
+    path = tmp_path / "a.xlsx"
+    write_workbook(path)
+    assert read_xlsx_header(path) == ["name", "start date", "", "email", "2022"]
+    assert read_xlsx_header(path, "Hires") == read_xlsx_header(path)
+
+
+def test_other_sheet(tmp_path) -> None:
+    path = tmp_path / "a.xlsx"
+    write_workbook(path)
+    # The first row doesn't have to be row 1
+    assert read_xlsx_header(path, 1) == ["", "name", "end date"]
+    assert read_xlsx_header(path, "Terminations") == ["", "name", "end date"]
+
+
+def test_missing_sheet(tmp_path) -> None:
+    path = tmp_path / "a.xlsx"
+    write_workbook(path)
+    with pytest.raises(ValueError):
+        read_xlsx_header(path, 2)
+    with pytest.raises(ValueError):
+        read_xlsx_header(path, "Other")
+
+
+def test_missing_shared_strings(tmp_path) -> None:
+    path = tmp_path / "a.xlsx"
+    write_workbook(path, shared_strings=False)
+    assert read_xlsx_header(path) == ["", "", "", "email", "2022"]
+
+
+def test_invalid_workbook(tmp_path) -> None:
+    path = tmp_path / "a.xlsx"
+    path.write_text("name,email\n")
+    with pytest.raises(ValueError):
+        read_xlsx_header(path)
+
+
+def test_read_header(tmp_path) -> None:
+    path = tmp_path / "a.XLSX"
+    write_workbook(path)
+    assert read_header(path) == ["name", "start date", "", "email", "2022"]
+
+
+def test_openpyxl(tmp_path) -> None:
+    openpyxl = pytest.importorskip("openpyxl")
+    path = tmp_path / "a.xlsx"
+    workbook = openpyxl.Workbook()
+    workbook.active.append(["name", None, "start date", 3])
+    workbook.active.append(["Alice", None, "2022-01-01", 4])
+    workbook.save(path)
+    assert read_xlsx_header(path) == ["name", "", "start date", "3"]